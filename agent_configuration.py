@@ -6,7 +6,7 @@ Allows users to select which agent teams and individual agents to use in workflo
 """
 
 from typing import Dict, List, Set, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 import os
@@ -39,6 +39,7 @@ class TeamInfo:
     description: str
     enabled: bool = True
     order: int = 0  # Order in workflow execution
+    depends_on: List[AgentTeam] = field(default_factory=list)  # Teams whose output this team consumes
 
 class AgentConfiguration:
     """Manages agent selection and configuration"""
@@ -87,6 +88,7 @@ class AgentConfiguration:
             team=AgentTeam.DATA_STRATEGY,
             description="DAMA-DMBOK frameworks and data governance structures",
             order=2,
+            depends_on=[AgentTeam.RESEARCH_ANALYSIS],
             agents=[
                 AgentInfo(
                     name="data_governance_specialist",
@@ -115,6 +117,7 @@ class AgentConfiguration:
             team=AgentTeam.COMPLIANCE_RISK,
             description="Compliance frameworks and risk management",
             order=3,
+            depends_on=[AgentTeam.DATA_STRATEGY],
             agents=[
                 AgentInfo(
                     name="compliance_specialist",
@@ -143,6 +146,7 @@ class AgentConfiguration:
             team=AgentTeam.INFORMATION_MANAGEMENT,
             description="Information governance and metadata management",
             order=4,
+            depends_on=[AgentTeam.COMPLIANCE_RISK],
             agents=[
                 AgentInfo(
                     name="information_governance_specialist",
@@ -171,6 +175,7 @@ class AgentConfiguration:
             team=AgentTeam.TENDER_RESPONSE,
             description="Tender analysis and proposal development",
             order=5,
+            depends_on=[AgentTeam.DATA_STRATEGY, AgentTeam.COMPLIANCE_RISK, AgentTeam.INFORMATION_MANAGEMENT],
             agents=[
                 AgentInfo(
                     name="tender_specialist",
@@ -199,6 +204,7 @@ class AgentConfiguration:
             team=AgentTeam.PROJECT_DELIVERY,
             description="Technical implementation and project management",
             order=6,
+            depends_on=[AgentTeam.DATA_STRATEGY, AgentTeam.INFORMATION_MANAGEMENT],
             agents=[
                 AgentInfo(
                     name="data_engineer",
@@ -239,6 +245,7 @@ class AgentConfiguration:
             team=AgentTeam.TECHNICAL_DOCUMENTATION,
             description="Technical documentation and knowledge management",
             order=7,
+            depends_on=[AgentTeam.PROJECT_DELIVERY],
             agents=[
                 AgentInfo(
                     name="technical_writer",
@@ -333,6 +340,36 @@ class AgentConfiguration:
         enabled_teams = self.get_enabled_teams()
         return sorted(enabled_teams, key=lambda x: x.order)
     
+    def resolve_dependencies(self, teams: List[AgentTeam]) -> Dict[AgentTeam, List[AgentTeam]]:
+        """
+        Map each of the given teams to the given teams whose output it consumes
+        
+        Dependencies on teams that are not part of the run are replaced by that
+        team's own dependencies, so leaving a team out never cuts a downstream
+        team off from the work that came before it.
+        
+        Args:
+            teams: Teams taking part in the run
+        
+        Returns:
+            Dictionary of team -> list of upstream teams within the run
+        """
+        selected = set(teams)
+        
+        def resolve(team_enum: AgentTeam, seen: set) -> List[AgentTeam]:
+            upstream = []
+            for dependency in self.teams[team_enum].depends_on:
+                if dependency in seen:
+                    continue
+                seen.add(dependency)
+                if dependency in selected:
+                    upstream.append(dependency)
+                else:
+                    upstream.extend(resolve(dependency, seen))
+            return list(dict.fromkeys(upstream))
+        
+        return {team_enum: resolve(team_enum, {team_enum}) for team_enum in teams}
+    
     def save_config(self) -> bool:
         """Save configuration to file"""
         try:
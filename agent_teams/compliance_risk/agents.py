@@ -23,7 +23,6 @@ def create_compliance_specialist(llm) -> Agent:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -45,7 +44,6 @@ def create_risk_management_specialist(llm) -> Agent:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -67,7 +65,6 @@ def create_audit_governance_specialist(llm) -> Agent:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
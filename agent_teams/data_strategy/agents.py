@@ -33,7 +33,6 @@ def create_data_strategy_agents(llm, conversation_history: Optional[List[Any]] =
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -50,7 +49,6 @@ def create_data_strategy_agents(llm, conversation_history: Optional[List[Any]] =
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -67,7 +65,6 @@ def create_data_strategy_agents(llm, conversation_history: Optional[List[Any]] =
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -24,7 +24,6 @@ def create_information_governance_specialist(llm) -> Agent:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -46,7 +45,6 @@ def create_metadata_management_specialist(llm) -> Agent:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -69,7 +67,6 @@ def create_data_quality_specialist(llm) -> Agent:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -34,7 +34,6 @@ def create_project_delivery_team(llm, conversation_history: Optional[List[Any]]
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -53,7 +52,6 @@ def create_project_delivery_team(llm, conversation_history: Optional[List[Any]]
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -73,7 +71,6 @@ def create_project_delivery_team(llm, conversation_history: Optional[List[Any]]
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -93,7 +90,6 @@ def create_project_delivery_team(llm, conversation_history: Optional[List[Any]]
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -113,7 +109,6 @@ def create_project_delivery_team(llm, conversation_history: Optional[List[Any]]
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
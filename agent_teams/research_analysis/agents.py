@@ -79,7 +79,6 @@ def create_research_analysis_agents(llm, conversation_history: Optional[List[Any
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False,
         tools=researcher_tools
@@ -121,7 +120,6 @@ def create_research_analysis_agents(llm, conversation_history: Optional[List[Any
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False,
         tools=analyst_tools
@@ -164,7 +162,6 @@ def create_research_analysis_agents(llm, conversation_history: Optional[List[Any
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False,
         tools=writer_tools
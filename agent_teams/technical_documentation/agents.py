@@ -32,7 +32,6 @@ def create_technical_documentation_team(llm) -> tuple:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -50,7 +49,6 @@ def create_technical_documentation_team(llm) -> tuple:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -68,7 +66,6 @@ def create_technical_documentation_team(llm) -> tuple:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -86,7 +83,6 @@ def create_technical_documentation_team(llm) -> tuple:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -104,7 +100,6 @@ def create_technical_documentation_team(llm) -> tuple:
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
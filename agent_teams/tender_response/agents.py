@@ -33,7 +33,6 @@ def create_tender_response_team(llm, conversation_history: Optional[List[Any]] =
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -52,7 +51,6 @@ def create_tender_response_team(llm, conversation_history: Optional[List[Any]] =
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
@@ -71,7 +69,6 @@ def create_tender_response_team(llm, conversation_history: Optional[List[Any]] =
         allow_delegation=False,
         llm=llm,
         max_iter=3,
-        max_rpm=5,
         max_execution_time=300,
         memory=False
     )
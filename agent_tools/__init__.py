@@ -9,6 +9,7 @@ from .search_tool import search_web
 from .analysis_tool import AnalysisTool
 from .pdf_writer import create_pdf_report, AcademicPDFWriter
 from .document_processor import DocumentProcessor
+from .columnar_store import ColumnarTable
 from .data_analysis_tool import DataAnalysisTool
 from .document_access_tool import (
     access_uploaded_documents,
@@ -44,6 +45,7 @@ __all__ = [
     'create_pdf_report',
     'AcademicPDFWriter',
     'DocumentProcessor',
+    'ColumnarTable',
     'DataAnalysisTool',
     'access_uploaded_documents',
     'analyze_document_data',
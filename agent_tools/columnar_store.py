@@ -0,0 +1,304 @@
+"""
+Columnar Store for Digital Twins Management System
+
+This module persists structured uploads (CSV, TSV, Excel sheets) as on-disk
+columnar files and exposes them through a lightweight, picklable handle.
+Rows are only materialised when they are asked for, so large tables do not
+live in session state as millions of Python dicts.
+
+Each file is keyed by its source file's full path and content, and written
+under a temporary name before being renamed into place, so same-named files,
+re-uploads and concurrent writers never overwrite a table another handle reads.
+"""
+
+import os
+import uuid
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Union
+
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default number of rows per batch when iterating a table
+DEFAULT_BATCH_ROWS = 50_000
+
+
+class ColumnarTable:
+    """
+    Handle to a table stored on disk as Parquet (or pickle when pyarrow is unavailable)
+    """
+    
+    def __init__(self, path: str, columns: List[str], shape: tuple, dtypes: Dict[str, str], file_format: str):
+        self.path = path
+        self.columns = columns
+        self.shape = shape
+        self.dtypes = dtypes
+        self.file_format = file_format
+    
+    def __len__(self) -> int:
+        return self.shape[0]
+    
+    def __repr__(self) -> str:
+        return f"ColumnarTable(path={self.path!r}, shape={self.shape})"
+    
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Names of columns with a numeric dtype"""
+        numeric = []
+        for column, dtype in self.dtypes.items():
+            try:
+                if pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype)) and dtype != 'bool':
+                    numeric.append(column)
+            except TypeError:
+                continue
+        return numeric
+    
+    def to_pandas(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load the table (or only the requested columns) as a DataFrame
+        
+        Args:
+            columns: Optional subset of columns to read
+        
+        Returns:
+            DataFrame with the requested columns
+        """
+        if self.file_format == 'parquet':
+            return pd.read_parquet(self.path, columns=columns)
+        
+        df = pd.read_pickle(self.path)
+        return df[columns] if columns is not None else df
+    
+    def iter_batches(self, batch_rows: int = DEFAULT_BATCH_ROWS,
+                     columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the table in DataFrame batches
+        
+        Args:
+            batch_rows: Maximum number of rows per batch
+            columns: Optional subset of columns to read
+        
+        Yields:
+            DataFrame batches in row order
+        """
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            
+            parquet_file = pq.ParquetFile(self.path)
+            for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+                yield batch.to_pandas()
+            return
+        
+        df = self.to_pandas(columns)
+        for start in range(0, len(df), batch_rows):
+            yield df.iloc[start:start + batch_rows]
+    
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Return the first n rows without loading the whole table"""
+        for batch in self.iter_batches(batch_rows=max(1, n)):
+            return batch.head(n)
+        return pd.DataFrame(columns=self.columns)
+    
+    def records(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Materialise a slice of rows as a list of dictionaries
+        
+        Args:
+            start: First row to return
+            stop: Row after the last row to return (defaults to the end of the table)
+        
+        Returns:
+            List of row dictionaries
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        rows = []
+        offset = 0
+        
+        for batch in self.iter_batches():
+            batch_end = offset + len(batch)
+            if batch_end > start and offset < stop:
+                rows.extend(batch.iloc[max(start - offset, 0):stop - offset].to_dict('records'))
+            if batch_end >= stop:
+                break
+            offset = batch_end
+        
+        return rows
+
+
+def source_key(file_path: Union[str, Path]) -> str:
+    """
+    Identify a table by its source file's full path and content
+    
+    Args:
+        file_path: Source file the table is read from
+    
+    Returns:
+        Key that differs for same-named files in other directories and for
+        changed versions of the same file
+    """
+    path = Path(file_path).resolve()
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(block)
+    
+    return f"{path}:{hasher.hexdigest()}"
+
+
+def _table_base_path(store_dir: Union[str, Path], name: str, key: Optional[str]) -> Path:
+    """Path of a table's file without suffix: a readable name plus a digest of its key"""
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)[:80]
+    digest = hashlib.sha256((key or name).encode()).hexdigest()[:16]
+    return store_dir / f"{safe_name}_{digest}"
+
+
+def _temp_path(path: Path) -> Path:
+    """Unique temporary file next to path, renamed into place once complete"""
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def write_table(df: pd.DataFrame, store_dir: Union[str, Path], name: str,
+                key: Optional[str] = None) -> ColumnarTable:
+    """
+    Persist a DataFrame as a columnar file and return a handle to it
+    
+    Args:
+        df: DataFrame to persist
+        store_dir: Directory holding columnar files
+        name: Readable name of the table (e.g. file name plus sheet name)
+        key: Identity of the table's source (see source_key); defaults to the name
+    
+    Returns:
+        ColumnarTable handle for the stored table
+    """
+    base_path = _table_base_path(store_dir, name, key)
+    
+    # Parquet needs string column names
+    df = df.rename(columns=str)
+    dtypes = {column: str(dtype) for column, dtype in df.dtypes.items()}
+    
+    path = base_path.with_suffix('.parquet')
+    temp_path = _temp_path(path)
+    try:
+        df.to_parquet(temp_path, index=False)
+        file_format = 'parquet'
+    except Exception as e:
+        # pyarrow missing or mixed-type object columns Arrow cannot encode
+        logger.warning(f"Falling back to pickle for table '{name}': {e}")
+        temp_path.unlink(missing_ok=True)
+        path = base_path.with_suffix('.pkl')
+        temp_path = _temp_path(path)
+        df.to_pickle(temp_path)
+        file_format = 'pickle'
+    os.replace(temp_path, path)
+    
+    return ColumnarTable(
+        path=str(path),
+        columns=df.columns.tolist(),
+        shape=df.shape,
+        dtypes=dtypes,
+        file_format=file_format
+    )
+
+
+class ColumnarTableWriter:
+    """
+    Incrementally write DataFrame chunks with a stable schema to one columnar file
+    """
+    
+    def __init__(self, store_dir: Union[str, Path], name: str, key: Optional[str] = None):
+        self.base_path = _table_base_path(store_dir, name, key)
+        self.name = name
+        self.row_count = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, str] = {}
+        self._writer = None
+        self._pending: List[pd.DataFrame] = []
+        
+        try:
+            import pyarrow  # noqa: F401
+            self.file_format = 'parquet'
+        except ImportError:
+            logger.warning(f"pyarrow not available, table '{name}' will be pickled when closed")
+            self.file_format = 'pickle'
+        
+        self.path = self.base_path.with_suffix('.parquet' if self.file_format == 'parquet' else '.pkl')
+        self._temp_path = _temp_path(self.path)
+    
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Append a chunk; every chunk must have the same columns and dtypes"""
+        if not self.columns:
+            self.columns = [str(column) for column in chunk.columns]
+            self.dtypes = {str(column): str(dtype) for column, dtype in chunk.dtypes.items()}
+        self.row_count += len(chunk)
+        
+        if self.file_format == 'pickle':
+            self._pending.append(chunk)
+            return
+        
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if self._writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._writer = pq.ParquetWriter(str(self._temp_path), table.schema)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+    
+    def abort(self) -> None:
+        """Discard what has been written so far"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._pending = []
+        if self._temp_path.exists():
+            self._temp_path.unlink()
+    
+    def close(self) -> ColumnarTable:
+        """Finish the file, move it into place and return a handle to it"""
+        if self.file_format == 'pickle':
+            df = pd.concat(self._pending, ignore_index=True) if self._pending else pd.DataFrame(columns=self.columns)
+            df.to_pickle(self._temp_path)
+            self._pending = []
+        else:
+            if self._writer is None:
+                pd.DataFrame(columns=self.columns).to_parquet(self._temp_path, index=False)
+            else:
+                self._writer.close()
+        os.replace(self._temp_path, self.path)
+        
+        return ColumnarTable(
+            path=str(self.path),
+            columns=self.columns,
+            shape=(self.row_count, len(self.columns)),
+            dtypes=self.dtypes,
+            file_format=self.file_format
+        )
+
+
+def load_dataframe(data: Union[ColumnarTable, List[Dict[str, Any]]],
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Build a DataFrame from either a ColumnarTable handle or a list of records
+    
+    Args:
+        data: ColumnarTable handle or list of row dictionaries
+        columns: Optional subset of columns to load
+    
+    Returns:
+        DataFrame with the requested columns
+    """
+    if isinstance(data, ColumnarTable):
+        return data.to_pandas(columns)
+    
+    df = pd.DataFrame(data)
+    return df[columns] if columns is not None else df
@@ -0,0 +1,357 @@
+"""
+Context Budget Manager for Digital Twins Management System
+
+This module fits LLM prompts into the model's context window by token count
+instead of a fixed character limit. Prompt sections are classified (system
+prompt, query and instructions, pre-search results, document context,
+prior-team output), the token budget is shared between them by priority,
+and only the evidence sections that overflow their share are compressed by
+extractive top-k passage selection against the query.
+"""
+
+import os
+import re
+import logging
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Context windows (tokens) for model families; LLM_CONTEXT_WINDOW overrides them
+MODEL_CONTEXT_WINDOWS = {
+    'gpt-oss': 131072,
+    'llama3.1': 131072,
+    'llama3.2': 131072,
+    'llama3': 8192,
+    'mistral': 32768,
+    'mixtral': 32768,
+    'qwen': 32768,
+    'gemma': 8192,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Tokens kept free for formatting overhead and counting error
+SAFETY_MARGIN_TOKENS = 256
+
+# Section kinds, in the order they give up tokens (lowest priority first)
+SECTION_PRESEARCH = 'presearch'
+SECTION_DOCUMENTS = 'documents'
+SECTION_PRIOR_TEAM = 'prior_team'
+SECTION_FIXED = 'fixed'
+
+# Relative share of the remaining budget for each compressible section kind
+SECTION_WEIGHTS = {
+    SECTION_PRIOR_TEAM: 0.4,
+    SECTION_DOCUMENTS: 0.35,
+    SECTION_PRESEARCH: 0.25,
+}
+
+# Heading keywords used by the team task templates for each section kind
+SECTION_KEYWORDS = [
+    (SECTION_PRIOR_TEAM, ['context from', 'previous validation results', 'analysis results', 'metadata record']),
+    (SECTION_DOCUMENTS, ['uploaded documents', 'document context']),
+    (SECTION_PRESEARCH, ['pre-searched data', 'search results', 'research data', 'research context',
+                         'geospatial data to analyze', 'context']),
+]
+
+# Headings of instruction sections, which are always kept verbatim
+FIXED_HEADING_KEYWORDS = [
+    'query', 'task', 'deliverable', 'output', 'objective', 'instruction', 'standard', 'format',
+    'criteria', 'requirement', 'topic', 'components', 'fact-checking sources'
+]
+
+# "**Heading:**" markers in task descriptions, plus the context CrewAI appends from earlier tasks
+SECTION_PATTERN = re.compile(r"(\*\*[^*\n]{1,80}:\*\*|This is the context you're working with:)")
+
+OMISSION_NOTICE = "[... {count} less relevant passages omitted to fit the context window ...]"
+
+
+def get_context_window(model: Optional[str], default: int = DEFAULT_CONTEXT_WINDOW) -> int:
+    """
+    Look up the context window for a model
+    
+    Args:
+        model: Model name (e.g. "ollama/gpt-oss:20b")
+        default: Window used for unknown models
+    
+    Returns:
+        Context window in tokens
+    """
+    override = os.getenv('LLM_CONTEXT_WINDOW')
+    if override:
+        return int(override)
+    
+    name = (model or '').lower().split('/')[-1]
+    # Longest matching family wins, so "llama3.1" is not read as "llama3"
+    for family in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if name.startswith(family):
+            return MODEL_CONTEXT_WINDOWS[family]
+    return default
+
+
+class TokenCounter:
+    """
+    Count tokens with tiktoken when available, otherwise estimate from characters
+    """
+    
+    def __init__(self, model: Optional[str] = None):
+        self.model = model
+        self._encoding = None
+        
+        try:
+            import tiktoken
+            
+            # gpt-oss uses the o200k vocabulary; cl100k is a close proxy for other open models
+            encoding_name = 'o200k_base' if 'gpt-oss' in (model or '') else 'cl100k_base'
+            self._encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            logger.info(f"tiktoken unavailable, estimating tokens from characters: {e}")
+    
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+
+def _classify_heading(heading: str) -> Optional[str]:
+    """Map a section heading to its section kind (None for headings that are part of the data)"""
+    heading = heading.lower()
+    if heading.startswith("this is the context you're working with"):
+        return SECTION_PRIOR_TEAM
+    
+    if any(keyword in heading for keyword in FIXED_HEADING_KEYWORDS):
+        return SECTION_FIXED
+    for kind, keywords in SECTION_KEYWORDS:
+        if any(keyword in heading for keyword in keywords):
+            return kind
+    return None
+
+
+def split_sections(text: str) -> List[Dict[str, str]]:
+    """
+    Split a task prompt into sections at its headings
+    
+    Args:
+        text: Prompt text
+    
+    Returns:
+        List of {'kind', 'heading', 'body'} in prompt order; text before the
+        first heading is a fixed section with an empty heading. Unrecognised
+        headings (e.g. "**URL:**" inside search results) stay in their section.
+    """
+    parts = SECTION_PATTERN.split(text)
+    sections = [{'kind': SECTION_FIXED, 'heading': '', 'body': parts[0]}]
+    
+    for i in range(1, len(parts), 2):
+        heading = parts[i]
+        kind = _classify_heading(heading)
+        if kind is None:
+            sections[-1]['body'] += heading + parts[i + 1]
+        else:
+            sections.append({'kind': kind, 'heading': heading, 'body': parts[i + 1]})
+    
+    return sections
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in re.findall(r"[a-z0-9]{3,}", text.lower())]
+
+
+def _split_passages(text: str) -> List[str]:
+    """Split text into passages: search sources, then paragraphs, then sentences for oversized paragraphs"""
+    if '## Source ' in text:
+        passages = re.split(r"(?=## Source \d+)", text)
+    else:
+        passages = re.split(r"\n\s*\n", text)
+    
+    result = []
+    for passage in passages:
+        if len(passage) > 2000:
+            result.extend(re.split(r"(?<=[.!?])\s+", passage))
+        elif passage.strip():
+            result.append(passage)
+    return result
+
+
+def compress_text(text: str, budget: int, query: str, counter: TokenCounter) -> str:
+    """
+    Keep the passages most relevant to the query, in their original order, within a token budget
+    
+    Args:
+        text: Section text
+        budget: Token budget for the section
+        query: Text the passages are scored against
+        counter: Token counter
+    
+    Returns:
+        Compressed text (unchanged if it already fits)
+    """
+    if counter.count(text) <= budget:
+        return text
+    
+    passages = _split_passages(text)
+    query_terms = set(_terms(query))
+    document_frequency = Counter(term for passage in passages for term in set(_terms(passage)))
+    
+    def score(index: int) -> float:
+        terms = _terms(passages[index])
+        if not terms:
+            return 0.0
+        overlap = sum(1.0 / document_frequency[term] for term in terms if term in query_terms)
+        # Slight preference for earlier passages (search rank, document order)
+        return overlap / (len(terms) ** 0.5) + 0.01 / (index + 1)
+    
+    notice_tokens = counter.count(OMISSION_NOTICE.format(count=len(passages)))
+    remaining = budget - notice_tokens
+    keep = set()
+    
+    for index in sorted(range(len(passages)), key=score, reverse=True):
+        tokens = counter.count(passages[index])
+        if tokens <= remaining:
+            keep.add(index)
+            remaining -= tokens
+    
+    omitted = len(passages) - len(keep)
+    kept_text = "\n\n".join(passages[i].strip() for i in sorted(keep))
+    return f"{kept_text}\n\n{OMISSION_NOTICE.format(count=omitted)}\n" if omitted else kept_text
+
+
+def allocate_budget(sizes: Dict[int, Tuple[str, int]], available: int) -> Dict[int, int]:
+    """
+    Share a token budget between sections by weight, giving unused share to the others
+    
+    Args:
+        sizes: Section index -> (kind, tokens)
+        available: Tokens available to these sections
+    
+    Returns:
+        Section index -> allocated tokens
+    """
+    allocation = {}
+    pending = dict(sizes)
+    
+    while pending:
+        total_weight = sum(SECTION_WEIGHTS[kind] for kind, _ in pending.values())
+        shares = {index: available * SECTION_WEIGHTS[kind] / total_weight for index, (kind, _) in pending.items()}
+        fitting = [index for index, (_, tokens) in pending.items() if tokens <= shares[index]]
+        
+        if not fitting:
+            for index in pending:
+                allocation[index] = max(0, int(shares[index]))
+            break
+        
+        for index in fitting:
+            allocation[index] = pending[index][1]
+            available -= pending[index][1]
+            del pending[index]
+    
+    return allocation
+
+
+class ContextBudgetManager:
+    """
+    Fit chat messages into a model's context window
+    """
+    
+    def __init__(self, model: Optional[str] = None, context_window: Optional[int] = None,
+                 reserved_output_tokens: int = 0):
+        self.model = model
+        self.context_window = context_window or get_context_window(model)
+        # Never let the output reservation eat more than a quarter of the window
+        self.reserved_output_tokens = min(reserved_output_tokens or 0, self.context_window // 4)
+        self.counter = TokenCounter(model)
+    
+    @property
+    def prompt_budget(self) -> int:
+        """Tokens available for the prompt"""
+        return self.context_window - self.reserved_output_tokens - SAFETY_MARGIN_TOKENS
+    
+    def fit_messages(self, messages, scale: float = 1.0):
+        """
+        Compress the lowest-priority prompt sections until the messages fit the budget
+        
+        Args:
+            messages: Prompt as a string or list of {'role', 'content'} messages
+            scale: Fraction of the prompt budget to use (lowered after context-length errors)
+        
+        Returns:
+            Tuple of (messages, report) where report describes the budget and any compression
+        """
+        budget = int(self.prompt_budget * scale)
+        as_string = isinstance(messages, str)
+        message_list = [{'role': 'user', 'content': messages}] if as_string else list(messages)
+        
+        report = {'budget_tokens': budget, 'context_window': self.context_window, 'compressed_sections': []}
+        
+        # Sections of user messages are candidates for compression; everything else is fixed
+        sections_by_message = {}
+        fixed_tokens = 0
+        compressible = {}
+        query = ''
+        flat = []
+        
+        for message_index, message in enumerate(message_list):
+            content = message.get('content') if isinstance(message, dict) else None
+            if not isinstance(content, str) or message.get('role') != 'user':
+                fixed_tokens += self.counter.count(content if isinstance(content, str) else str(message))
+                continue
+            
+            sections = split_sections(content)
+            sections_by_message[message_index] = sections
+            for section in sections:
+                tokens = self.counter.count(section['heading']) + self.counter.count(section['body'])
+                if section['kind'] == SECTION_FIXED:
+                    fixed_tokens += tokens
+                    if 'query' in section['heading'].lower():
+                        query += " " + section['body']
+                else:
+                    compressible[len(flat)] = (section['kind'], tokens)
+                flat.append(section)
+        
+        report['prompt_tokens'] = fixed_tokens + sum(tokens for _, tokens in compressible.values())
+        if report['prompt_tokens'] <= budget or not compressible:
+            if report['prompt_tokens'] > budget:
+                logger.warning(f"Prompt needs {report['prompt_tokens']} tokens but has no compressible sections (budget {budget})")
+            return messages, report
+        
+        # Fall back to the fixed text (task description) when no explicit query heading exists
+        query = query or " ".join(section['body'] for section in flat if section['kind'] == SECTION_FIXED)
+        
+        allocation = allocate_budget(compressible, max(0, budget - fixed_tokens))
+        for index, (kind, tokens) in compressible.items():
+            if allocation[index] < tokens:
+                section = flat[index]
+                section['body'] = "\n" + compress_text(section['body'], allocation[index], query, self.counter)
+                report['compressed_sections'].append({
+                    'kind': kind,
+                    'heading': section['heading'].strip('*: '),
+                    'tokens_before': tokens,
+                    'tokens_after': self.counter.count(section['body'])
+                })
+        
+        fitted = []
+        for message_index, message in enumerate(message_list):
+            if message_index in sections_by_message:
+                content = "".join(section['heading'] + section['body'] for section in sections_by_message[message_index])
+                fitted.append({**message, 'content': content})
+            else:
+                fitted.append(message)
+        
+        report['prompt_tokens_after'] = sum(
+            self.counter.count(m['content']) if isinstance(m, dict) and isinstance(m.get('content'), str) else 0
+            for m in fitted
+        )
+        return (fitted[0]['content'] if as_string else fitted), report
+
+
+def is_context_length_error(error: BaseException) -> bool:
+    """Check whether an exception reports that the prompt exceeded the context window"""
+    message = str(error).lower()
+    return any(keyword in message for keyword in [
+        'context length', 'context window', 'maximum context', 'too many tokens', 'prompt is too long'
+    ])
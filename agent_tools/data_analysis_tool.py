@@ -14,6 +14,8 @@ from pathlib import Path
 import sqlite3
 from datetime import datetime, timedelta
 import re
+from agent_tools.columnar_store import ColumnarTable, load_dataframe
+from agent_tools.tabular_profiler import profile_batches
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -154,9 +156,19 @@ class DataAnalysisTool:
             analysis['structured_analysis']['distribution_analysis'] = self._analyze_distribution(document_data['summary'])
         
         # Analyze column relationships
-        if 'data' in document_data and document_data['data']:
-            df = pd.DataFrame(document_data['data'])
-            analysis['structured_analysis']['correlation_analysis'] = self._analyze_correlations(df)
+        if document_data.get('correlation_matrix'):
+            corr_matrix = pd.DataFrame(document_data['correlation_matrix'])
+            analysis['structured_analysis']['correlation_analysis'] = self._summarize_correlations(corr_matrix)
+        elif 'data' in document_data and len(document_data['data']) > 0:
+            data = document_data['data']
+            if isinstance(data, ColumnarTable):
+                # Stream numeric columns through the profiler instead of loading the table
+                profile = profile_batches(data.iter_batches(columns=data.numeric_columns))
+                corr_matrix = pd.DataFrame(profile['correlation_matrix'])
+                analysis['structured_analysis']['correlation_analysis'] = self._summarize_correlations(corr_matrix)
+            else:
+                df = load_dataframe(data)
+                analysis['structured_analysis']['correlation_analysis'] = self._analyze_correlations(df)
         
         return analysis
     
@@ -264,7 +276,17 @@ class DataAnalysisTool:
                 return {'message': 'No numeric columns found for correlation analysis'}
             
             # Calculate correlation matrix
-            corr_matrix = numeric_df.corr()
+            return self._summarize_correlations(numeric_df.corr())
+        except Exception as e:
+            return {'error': f"Correlation analysis failed: {e}"}
+    
+    def _summarize_correlations(self, corr_matrix: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Summarize a correlation matrix and list strongly correlated column pairs
+        """
+        try:
+            if corr_matrix.empty:
+                return {'message': 'No numeric columns found for correlation analysis'}
             
             # Find strong correlations
             strong_correlations = []
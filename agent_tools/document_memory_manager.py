@@ -8,16 +8,20 @@ for semantic search and retrieval by agents.
 import chromadb
 from chromadb.config import Settings
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 import json
 import hashlib
 from pathlib import Path
 import logging
+import time
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of chunks embedded and written per ChromaDB add() call
+DEFAULT_BATCH_SIZE = 128
+
 
 class DocumentMemoryManager:
     """
@@ -51,6 +55,60 @@ class DocumentMemoryManager:
             metadata={"description": "Stores uploaded documents for semantic search"}
         )
     
+    def iter_chunks(self, texts: Iterable[str], chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+        """
+        Incrementally split a stream of text (e.g. PDF pages) into overlapping chunks
+        
+        Only the text not yet emitted as a chunk is buffered, so memory stays
+        bounded by roughly one page plus one chunk regardless of document size.
+        
+        Args:
+            texts: Iterable of text pieces in document order
+            chunk_size: Maximum size of each chunk
+            overlap: Number of characters to overlap between chunks
+            
+        Yields:
+            Document chunks, identical to those produced by chunk_document()
+        """
+        buffer = ""
+        emitted = False
+        
+        for text in texts:
+            buffer += text
+            start = 0
+            
+            # Emit every chunk that is known not to reach the end of the document
+            while len(buffer) - start > chunk_size:
+                end = start + chunk_size
+                
+                # Try to break at sentence boundary
+                # Look for sentence endings within the last 100 characters
+                sentence_end = buffer.rfind('.', start, end)
+                if sentence_end > start + chunk_size - 100:
+                    end = sentence_end + 1
+                
+                chunk = buffer[start:end].strip()
+                if chunk:
+                    emitted = True
+                    yield chunk
+                
+                # Move start position with overlap
+                start = end - overlap
+            
+            buffer = buffer[start:]
+        
+        if not emitted and len(buffer) <= chunk_size:
+            yield buffer
+            return
+        
+        # Flush the tail of the document
+        start = 0
+        while start < len(buffer):
+            chunk = buffer[start:start + chunk_size].strip()
+            if chunk:
+                yield chunk
+            start = start + chunk_size - overlap
+    
     def chunk_document(self, content: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
         """
         Split document content into overlapping chunks for better semantic search
@@ -63,80 +121,496 @@ class DocumentMemoryManager:
         Returns:
             List of document chunks
         """
-        if len(content) <= chunk_size:
-            return [content]
+        return list(self.iter_chunks([content], chunk_size, overlap))
+    
+    def _document_identity(self, document_data: Dict[str, Any], document_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Derive the document ID, filename and file type of a processed document
         
-        chunks = []
-        start = 0
+        The document ID is derived from a stable logical identity, never from the
+        content: a caller-supplied 'document_key' in the metadata, else the source
+        path (for uploads, the file's path in the upload directory), else the
+        document key or filename. Re-ingesting an edited version of a document
+        therefore keeps its ID, so only new or changed chunks are embedded and
+        chunks that went away are deleted. The content hash stays in the metadata.
         
-        while start < len(content):
-            end = start + chunk_size
+        Args:
+            document_data: Dictionary containing document information
+            document_key: Fallback source key when the document has no metadata
             
-            # Try to break at sentence boundary
-            if end < len(content):
-                # Look for sentence endings within the last 100 characters
-                sentence_end = content.rfind('.', start, end)
-                if sentence_end > start + chunk_size - 100:
-                    end = sentence_end + 1
+        Returns:
+            Dictionary with the document ID, filename and file type
+        """
+        metadata = document_data.get('metadata', {})
+        filename = metadata.get('filename') or (Path(document_key).name if document_key else 'unknown')
+        source = metadata.get('document_key') or metadata.get('source_path') or document_key or filename
+        
+        return {
+            "document_id": f"doc_{hashlib.sha256(source.encode()).hexdigest()[:16]}",
+            "filename": filename,
+            "file_type": document_data.get('type', 'unknown')
+        }
+    
+    def _prepare_chunks(self, document_data: Dict[str, Any], document_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Chunk a processed document and build content-addressed chunk records
+        
+        Each chunk ID is the document ID plus a hash of the chunk text, so
+        unchanged chunks keep their IDs across re-uploads.
+        
+        Args:
+            document_data: Dictionary containing document information
+            document_key: Fallback source key when the document has no metadata
             
-            chunk = content[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+        Returns:
+            Dictionary with the document ID, content hash and parallel chunk lists
+        """
+        identity = self._document_identity(document_data, document_key)
+        doc_id = identity['document_id']
+        filename = identity['filename']
+        file_type = identity['file_type']
+        
+        content = document_data.get('content') or document_data.get('sample_text', '')
+        if not isinstance(content, str):
+            content = str(content)
+        content_hash = hashlib.sha256(content.encode('utf-8', errors='ignore')).hexdigest()
+        
+        # Chunk the document content
+        chunks = self.chunk_document(content)
+        
+        ids = []
+        seen_ids = set()
+        documents = []
+        metadatas = []
+        for chunk in chunks:
+            chunk_hash = hashlib.sha256(chunk.encode('utf-8', errors='ignore')).hexdigest()[:16]
+            chunk_id = f"{doc_id}_{chunk_hash}"
+            
+            # Identical chunks (repeated boilerplate) are embedded once
+            if chunk_id in seen_ids:
+                continue
+            seen_ids.add(chunk_id)
             
-            # Move start position with overlap
-            start = end - overlap
-            if start >= len(content):
-                break
+            ids.append(chunk_id)
+            documents.append(chunk)
+            metadatas.append({
+                "document_id": doc_id,
+                "filename": filename,
+                "file_type": file_type,
+                "content_hash": content_hash,
+                "chunk_hash": chunk_hash,
+                "chunk_index": len(metadatas),
+                "type": "document_chunk"
+            })
         
-        return chunks
+        for chunk_metadata in metadatas:
+            chunk_metadata["total_chunks"] = len(metadatas)
+        
+        return {
+            "document_id": doc_id,
+            "filename": filename,
+            "content_hash": content_hash,
+            "ids": ids,
+            "documents": documents,
+            "metadatas": metadatas
+        }
     
-    def store_document(self, document_data: Dict[str, Any]) -> str:
+    def _get_stored_chunks(self, document_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the IDs and metadata of the chunks already stored for a document
+        
+        Args:
+            document_id: The document ID to look up
+            
+        Returns:
+            Mapping of chunk ID to chunk metadata
+        """
+        results = self.document_collection.get(
+            where={"document_id": document_id},
+            include=["metadatas"]
+        )
+        return dict(zip(results['ids'], results['metadatas']))
+    
+    def _get_batch_size(self, batch_size: int) -> int:
+        """Clamp a requested batch size to what the ChromaDB client accepts"""
+        batch_size = max(1, batch_size)
+        
+        get_max_batch_size = getattr(self.client, 'get_max_batch_size', None)
+        if get_max_batch_size:
+            try:
+                batch_size = min(batch_size, get_max_batch_size())
+            except Exception:
+                pass
+        
+        return batch_size
+    
+    def _add_in_batches(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Embed and write chunks with one ChromaDB add() call per batch
+        
+        A batch that fails is logged and recorded with its chunk IDs, and the
+        remaining batches are still written.
+        
+        Args:
+            ids: Chunk IDs
+            documents: Chunk texts
+            metadatas: Chunk metadata
+            batch_size: Maximum number of chunks per add() call
+            
+        Returns:
+            List of per-batch timings; failed batches carry 'error' and 'failed_ids'
+        """
+        batch_size = self._get_batch_size(batch_size)
+        
+        timings = []
+        for batch_index, start in enumerate(range(0, len(ids), batch_size)):
+            end = start + batch_size
+            started = time.perf_counter()
+            timing = {"batch": batch_index, "chunks": len(ids[start:end])}
+            
+            try:
+                self.document_collection.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+            except Exception as e:
+                logger.error(f"Failed to store batch {batch_index} ({timing['chunks']} chunks): {e}")
+                timing["error"] = str(e)
+                timing["failed_ids"] = list(ids[start:end])
+            
+            elapsed = time.perf_counter() - started
+            timing["seconds"] = round(elapsed, 4)
+            timings.append(timing)
+            if "error" not in timing:
+                logger.info(f"Stored batch {batch_index} ({timing['chunks']} chunks) in {elapsed:.2f}s")
+        
+        return timings
+    
+    def _update_chunk_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]],
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Replace the metadata of stored chunks without re-embedding them
+        
+        Args:
+            ids: Chunk IDs
+            metadatas: New metadata for each chunk
+            batch_size: Maximum number of chunks per update() call
+        """
+        step = self._get_batch_size(batch_size)
+        for start in range(0, len(ids), step):
+            self.document_collection.update(
+                ids=ids[start:start + step],
+                metadatas=metadatas[start:start + step]
+            )
+    
+    def _delete_chunks(self, ids: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Delete stored chunks
+        
+        Args:
+            ids: Chunk IDs
+            batch_size: Maximum number of chunks per delete() call
+        """
+        step = self._get_batch_size(batch_size)
+        for start in range(0, len(ids), step):
+            self.document_collection.delete(ids=ids[start:start + step])
+    
+    def store_document_stream(self, texts: Iterable[str], document_data: Dict[str, Any],
+                              document_key: Optional[str] = None,
+                              batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Chunk and store a document while its text is still being extracted
+        
+        Each batch is written as soon as it fills, so the first chunks are
+        searchable before the last page is parsed and peak memory is bounded
+        by the batch size rather than the document size. Chunk positions and
+        the content hash are finalised with a metadata-only update at the end,
+        and the word and character counts of the text are gathered on the way.
+        
+        Args:
+            texts: Iterable of text pieces in document order (e.g. PDF pages)
+            document_data: Dictionary containing document information
+            document_key: Fallback source key when the document has no metadata
+            batch_size: Maximum number of chunks per add() call
+            
+        Returns:
+            Dictionary with the document ID, chunk counts, failed chunk IDs, text
+            statistics and per-batch timings
+        """
+        started = time.perf_counter()
+        identity = self._document_identity(document_data, document_key)
+        doc_id = identity['document_id']
+        stored = self._get_stored_chunks(doc_id)
+        step = self._get_batch_size(batch_size)
+        
+        content_hasher = hashlib.sha256()
+        text_stats = {"word_count": 0, "char_count": 0}
+        
+        def hashed(pieces: Iterable[str]) -> Iterator[str]:
+            for piece in pieces:
+                content_hasher.update(piece.encode('utf-8', errors='ignore'))
+                text_stats["word_count"] += len(piece.split())
+                text_stats["char_count"] += len(piece)
+                yield piece
+        
+        ids = []
+        seen_ids = set()
+        chunk_hashes = {}
+        pending_ids = []
+        pending_texts = []
+        pending_metadatas = []
+        batches = []
+        
+        def flush():
+            for timing in self._add_in_batches(pending_ids, pending_texts, pending_metadatas, step):
+                timing["batch"] = len(batches)
+                batches.append(timing)
+            pending_ids.clear()
+            pending_texts.clear()
+            pending_metadatas.clear()
+        
+        for chunk in self.iter_chunks(hashed(texts)):
+            chunk_hash = hashlib.sha256(chunk.encode('utf-8', errors='ignore')).hexdigest()[:16]
+            chunk_id = f"{doc_id}_{chunk_hash}"
+            
+            # Identical chunks (repeated boilerplate) are embedded once
+            if chunk_id in seen_ids:
+                continue
+            seen_ids.add(chunk_id)
+            ids.append(chunk_id)
+            chunk_hashes[chunk_id] = chunk_hash
+            
+            if chunk_id in stored:
+                continue
+            
+            pending_ids.append(chunk_id)
+            pending_texts.append(chunk)
+            pending_metadatas.append({
+                "document_id": doc_id,
+                "filename": identity['filename'],
+                "file_type": identity['file_type'],
+                "content_hash": "",
+                "chunk_hash": chunk_hash,
+                "chunk_index": len(ids) - 1,
+                "total_chunks": 0,
+                "type": "document_chunk"
+            })
+            if len(pending_ids) >= step:
+                flush()
+        flush()
+        
+        failed_ids = [chunk_id for timing in batches for chunk_id in timing.get("failed_ids", [])]
+        failed = set(failed_ids)
+        
+        # Finalise positions and content hash now that the whole document is known
+        content_hash = content_hasher.hexdigest()
+        stored_ids = [chunk_id for chunk_id in ids if chunk_id not in failed]
+        final_metadatas = [
+            {
+                "document_id": doc_id,
+                "filename": identity['filename'],
+                "file_type": identity['file_type'],
+                "content_hash": content_hash,
+                "chunk_hash": chunk_hashes[chunk_id],
+                "chunk_index": index,
+                "total_chunks": len(ids),
+                "type": "document_chunk"
+            }
+            for index, chunk_id in enumerate(ids)
+            if chunk_id not in failed
+        ]
+        self._update_chunk_metadata(stored_ids, final_metadatas, step)
+        
+        stale_ids = [chunk_id for chunk_id in stored if chunk_id not in seen_ids]
+        self._delete_chunks(stale_ids, step)
+        
+        added = sum(timing["chunks"] for timing in batches) - len(failed_ids)
+        unchanged = len(ids) - added - len(failed_ids)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Streamed document '{identity['filename']}': {added} chunks embedded, "
+            f"{unchanged} unchanged, {len(failed_ids)} failed, {len(stale_ids)} deleted in {elapsed:.2f}s"
+        )
+        
+        return {
+            "document_id": doc_id,
+            "total_chunks": len(ids),
+            "chunks_added": added,
+            "chunks_unchanged": unchanged,
+            "chunks_updated": unchanged,
+            "chunks_failed": len(failed_ids),
+            "failed_chunk_ids": failed_ids,
+            "chunks_deleted": len(stale_ids),
+            "word_count": text_stats["word_count"],
+            "char_count": text_stats["char_count"],
+            "batches": batches,
+            "elapsed_seconds": round(elapsed, 4)
+        }
+    
+    def store_document(self, document_data: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE) -> str:
         """
         Store a document in memory for semantic search
         
+        Only chunks that are new or changed since the last upload are embedded.
+        
         Args:
             document_data: Dictionary containing document information
+            batch_size: Maximum number of chunks per add() call
             
         Returns:
             Document ID for reference
         """
-        try:
-            # Extract document information
-            filename = document_data.get('metadata', {}).get('filename', 'unknown')
-            file_type = document_data.get('type', 'unknown')
-            content = document_data.get('sample_text', '')
-            
-            # Generate unique document ID
-            doc_id = f"doc_{hashlib.md5(filename.encode()).hexdigest()[:12]}"
-            
-            # Chunk the document content
-            chunks = self.chunk_document(content)
-            
-            # Store each chunk
-            chunk_ids = []
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{doc_id}_chunk_{i}"
-                chunk_ids.append(chunk_id)
-                
-                self.document_collection.add(
-                    documents=[chunk],
-                    metadatas=[{
-                        "document_id": doc_id,
-                        "filename": filename,
-                        "file_type": file_type,
-                        "chunk_index": i,
-                        "total_chunks": len(chunks),
-                        "type": "document_chunk"
-                    }],
-                    ids=[chunk_id]
-                )
+        filename = document_data.get('metadata', {}).get('filename', 'unknown')
+        report = self.store_documents({filename: document_data}, batch_size)
+        
+        if filename in report['errors']:
+            raise ValueError(report['errors'][filename])
+        
+        return report['document_ids'][filename]
+    
+    def store_documents(self, documents: Dict[str, Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Store several documents in memory using batched, incremental ingestion
+        
+        Chunks from all documents are pooled so that a multi-file upload of
+        small documents costs a handful of add() calls rather than one per chunk.
+        Chunks already stored under the same content-addressed ID are skipped and
+        chunks that disappeared from a re-uploaded document are deleted. A batch
+        that fails to store does not stop the others; its chunk IDs are listed in
+        'failed_chunk_ids' and the affected documents get an entry in 'errors',
+        so uploading them again stores just the missing chunks.
+        
+        Args:
+            documents: Mapping of document name to processed document data
+            batch_size: Maximum number of chunks per add() call
             
-            logger.info(f"Stored document '{filename}' with {len(chunks)} chunks")
-            return doc_id
+        Returns:
+            Dictionary with document IDs, per-document errors, chunk counts (chunks_updated
+            counts kept chunks whose position metadata was refreshed), failed chunk IDs
+            and per-batch timings
+        """
+        started = time.perf_counter()
+        document_ids = {}
+        errors = {}
+        pooled_ids = set()
+        duplicate_documents = 0
+        ids = []
+        chunk_documents = {}
+        chunk_texts = []
+        metadatas = []
+        update_ids = []
+        update_metadatas = []
+        stale_ids = []
+        unchanged_documents = 0
+        unchanged_chunks = 0
+        streamed_reports = []
+        failed_by_document = {}
+        
+        for doc_name, doc_data in documents.items():
+            if 'error' in doc_data:
+                errors[doc_name] = doc_data['error']
+                continue
+            try:
+                # Large documents are read from disk page by page
+                if doc_data.get('streamed') and doc_data.get('file_path'):
+                    from agent_tools.document_processor import iter_pdf_pages
+                    
+                    report = self.store_document_stream(
+                        iter_pdf_pages(doc_data['file_path']), doc_data, doc_name, batch_size
+                    )
+                    document_ids[doc_name] = report['document_id']
+                    streamed_reports.append(report)
+                    if report['failed_chunk_ids']:
+                        failed_by_document[doc_name] = len(report['failed_chunk_ids'])
+                    continue
+                
+                prepared = self._prepare_chunks(doc_data, doc_name)
+                document_ids[doc_name] = prepared['document_id']
+                
+                # ChromaDB rejects duplicate IDs within a single add() call
+                if prepared['document_id'] in pooled_ids:
+                    duplicate_documents += 1
+                    continue
+                pooled_ids.add(prepared['document_id'])
+                
+                stored = self._get_stored_chunks(prepared['document_id'])
+                new_ids = set(prepared['ids'])
+                
+                # Skip documents whose content is already fully stored
+                if set(stored) == new_ids and all(m.get('content_hash') == prepared['content_hash'] for m in stored.values()):
+                    unchanged_documents += 1
+                    unchanged_chunks += len(stored)
+                    continue
+                
+                for chunk_id, chunk_text, chunk_metadata in zip(prepared['ids'], prepared['documents'], prepared['metadatas']):
+                    if chunk_id not in stored:
+                        ids.append(chunk_id)
+                        chunk_documents[chunk_id] = doc_name
+                        chunk_texts.append(chunk_text)
+                        metadatas.append(chunk_metadata)
+                    else:
+                        # Refresh positions without re-embedding the chunk text
+                        unchanged_chunks += 1
+                        update_ids.append(chunk_id)
+                        update_metadatas.append(chunk_metadata)
+                
+                stale_ids.extend(chunk_id for chunk_id in stored if chunk_id not in new_ids)
+            except Exception as e:
+                logger.error(f"Error preparing document '{doc_name}': {e}")
+                errors[doc_name] = str(e)
+        
+        try:
+            batches = self._add_in_batches(ids, chunk_texts, metadatas, batch_size)
             
+            self._update_chunk_metadata(update_ids, update_metadatas, batch_size)
+            self._delete_chunks(stale_ids, batch_size)
         except Exception as e:
-            logger.error(f"Error storing document: {e}")
+            logger.error(f"Error storing documents: {e}")
             raise
+        
+        failed_ids = [chunk_id for timing in batches for chunk_id in timing.get('failed_ids', [])]
+        added = len(ids) - len(failed_ids)
+        for chunk_id in failed_ids:
+            doc_name = chunk_documents[chunk_id]
+            failed_by_document[doc_name] = failed_by_document.get(doc_name, 0) + 1
+        
+        for report in streamed_reports:
+            for timing in report['batches']:
+                batches.append(dict(timing, batch=len(batches)))
+            failed_ids.extend(report['failed_chunk_ids'])
+        added += sum(report['chunks_added'] for report in streamed_reports)
+        unchanged_chunks += sum(report['chunks_unchanged'] for report in streamed_reports)
+        updated = len(update_ids) + sum(report['chunks_updated'] for report in streamed_reports)
+        deleted = len(stale_ids) + sum(report['chunks_deleted'] for report in streamed_reports)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Stored {len(document_ids)} documents: {added} chunks embedded, "
+            f"{unchanged_chunks} unchanged, {len(failed_ids)} failed, {deleted} deleted, "
+            f"{duplicate_documents} duplicate documents skipped in {elapsed:.2f}s"
+        )
+        
+        # Partly stored documents can be uploaded again to store the missing chunks
+        for doc_name, failed_count in failed_by_document.items():
+            errors[doc_name] = f"{failed_count} chunks failed to store; upload the document again to retry them"
+        
+        return {
+            "document_ids": document_ids,
+            "errors": errors,
+            "total_chunks": added + unchanged_chunks + len(failed_ids),
+            "chunks_added": added,
+            "chunks_unchanged": unchanged_chunks,
+            "chunks_updated": updated,
+            "chunks_failed": len(failed_ids),
+            "failed_chunk_ids": failed_ids,
+            "chunks_deleted": deleted,
+            "documents_unchanged": unchanged_documents,
+            "documents_duplicate": duplicate_documents,
+            "batches": batches,
+            "elapsed_seconds": round(elapsed, 4)
+        }
     
     def search_documents(self, query: str, n_results: int = 5, file_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
@@ -282,12 +756,11 @@ class DocumentMemoryManager:
             True if successful, False otherwise
         """
         try:
-            # Get all chunks for this document
-            chunks = self.get_document_by_id(document_id)
-            chunk_ids = [chunk['metadata'].get('id') for chunk in chunks if chunk['metadata'].get('id')]
+            # Get all chunk IDs for this document
+            chunk_ids = list(self._get_stored_chunks(document_id).keys())
             
             if chunk_ids:
-                self.document_collection.delete(ids=chunk_ids)
+                self._delete_chunks(chunk_ids)
                 logger.info(f"Deleted document {document_id} with {len(chunk_ids)} chunks")
                 return True
             else:
@@ -321,8 +794,25 @@ class DocumentMemoryManager:
             return {"error": str(e)}
 
 
+def create_document_memory_manager() -> DocumentMemoryManager:
+    """
+    Create the document memory manager for the configured backend
+    
+    DOCUMENT_MEMORY_BACKEND=oracle stores chunks in Oracle Database 23ai so
+    that every app node searches the same vector index; the default keeps
+    the local ChromaDB directory.
+    
+    Returns:
+        Document memory manager instance
+    """
+    if os.getenv("DOCUMENT_MEMORY_BACKEND", "chroma").lower() == "oracle":
+        from oracle_database.vector_store import OracleVectorStore
+        return OracleVectorStore()
+    return DocumentMemoryManager()
+
+
 # Global document memory manager instance
-document_memory_manager = DocumentMemoryManager()
+document_memory_manager = create_document_memory_manager()
 
 
 def store_document_in_memory(document_data: Dict[str, Any]) -> str:
@@ -330,6 +820,11 @@ def store_document_in_memory(document_data: Dict[str, Any]) -> str:
     return document_memory_manager.store_document(document_data)
 
 
+def store_documents_in_memory(documents: Dict[str, Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Store several documents in memory using batched ingestion"""
+    return document_memory_manager.store_documents(documents, batch_size)
+
+
 def search_documents_in_memory(query: str, n_results: int = 5, file_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """Search for relevant documents using semantic similarity"""
     return document_memory_manager.search_documents(query, n_results, file_types)
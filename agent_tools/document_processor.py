@@ -11,7 +11,7 @@ import json
 import csv
 import sqlite3
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple, Callable
 from pathlib import Path
 import streamlit as st
 from io import BytesIO, StringIO
@@ -22,22 +22,156 @@ import yaml
 import pickle
 import openpyxl
 from docx import Document
+from agent_tools.columnar_store import write_table, ColumnarTableWriter, source_key
+from agent_tools.tabular_profiler import TableProfiler, DEFAULT_CHUNK_ROWS, profile_sqlite_table
 from PyPDF2 import PdfReader
 import chardet
+import codecs
 import mimetypes
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# PDFs with more pages than this are not held in memory; their text is
+# streamed page by page from 'file_path' when it is chunked and embedded
+STREAM_PDF_PAGE_THRESHOLD = 200
+
+
+def iter_pdf_pages(source: Union[str, Path, PdfReader]) -> Iterator[str]:
+    """
+    Yield the extracted text of a PDF one page at a time
+    
+    Args:
+        source: Path to the PDF file, or a PdfReader already opened on it
+        
+    Yields:
+        Text of each page followed by a newline
+    """
+    reader = PdfReader(source) if isinstance(source, (str, Path)) else source
+    for page in reader.pages:
+        yield (page.extract_text() or "") + "\n"
+
+
+# Bytes read from each end of a file when sniffing its encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+
+def detect_encoding(file_path: Union[str, Path], sample_size: Optional[int] = ENCODING_SAMPLE_SIZE) -> str:
+    """
+    Detect a text file's encoding from a bounded prefix and suffix sample
+    
+    BOMs and UTF-8/ASCII are recognised with a fast decode check; chardet is
+    only run on the sample when that fails, so the cost does not grow with
+    the file size.
+    
+    Args:
+        file_path: Path to the text file
+        sample_size: Number of bytes read from the start and from the end;
+            None reads the whole file
+        
+    Returns:
+        Encoding name usable with open() and pandas
+    """
+    file_size = os.path.getsize(file_path)
+    if sample_size is None:
+        sample_size = file_size
+    with open(file_path, 'rb') as f:
+        prefix = f.read(sample_size)
+        suffix = b""
+        if file_size > sample_size:
+            f.seek(max(sample_size, file_size - sample_size))
+            suffix = f.read(sample_size)
+    
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if prefix.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return 'utf-32'
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    
+    # Skip UTF-8 continuation bytes where the suffix sample starts mid-character
+    skip = 0
+    while skip < min(3, len(suffix)) and 0x80 <= suffix[skip] <= 0xBF:
+        skip += 1
+    
+    try:
+        for sample in (prefix, suffix[skip:]):
+            # final=False tolerates a character cut off at the end of the sample
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    return chardet.detect(prefix + suffix)['encoding'] or 'utf-8'
+
+
+def read_text_file(file_path: Union[str, Path]) -> Tuple[str, str]:
+    """
+    Read a text file with the encoding detected from a sample
+    
+    A sample can miss non-UTF-8 bytes that only occur in the middle of the
+    file; if decoding fails the encoding is detected again from the whole file.
+    
+    Args:
+        file_path: Path to the text file
+        
+    Returns:
+        Tuple of (content, encoding)
+    """
+    encoding = detect_encoding(file_path)
+    try:
+        with open(file_path, 'r', encoding=encoding) as f:
+            return f.read(), encoding
+    except UnicodeDecodeError:
+        encoding = detect_encoding(file_path, sample_size=None)
+        logger.info(f"Sampled encoding did not fit {file_path}, detected {encoding} from the whole file")
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+            return f.read(), encoding
+
+
+# Delimited files larger than this are profiled in chunks instead of loaded whole
+LARGE_TABLE_BYTES = 100 * 1024 * 1024
+
+# Default number of seconds a single file may take in process-pool mode
+DEFAULT_FILE_TIMEOUT = 300
+
+# DocumentProcessor reused by each process-pool worker
+_worker_processor = None
+
+
+def _process_file_in_worker(upload_dir: str, stream_pdf_page_threshold: int, file_path: str) -> Dict[str, Any]:
+    """Process a single file inside a process-pool worker"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = DocumentProcessor(upload_dir, stream_pdf_page_threshold)
+    return _worker_processor.process_file(Path(file_path))
+
+
+def _terminate_pool(executor: ProcessPoolExecutor) -> None:
+    """Shut down a process pool without waiting, killing workers that are still busy"""
+    # ProcessPoolExecutor has no public way to stop a running task before Python 3.14
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
 class DocumentProcessor:
     """
     Comprehensive document processor for various data types
     """
     
-    def __init__(self, upload_dir: str = "./uploads"):
+    def __init__(self, upload_dir: str = "./uploads", stream_pdf_page_threshold: int = STREAM_PDF_PAGE_THRESHOLD):
         self.upload_dir = Path(upload_dir)
+        self.stream_pdf_page_threshold = stream_pdf_page_threshold
         self.upload_dir.mkdir(exist_ok=True)
+        # Structured uploads are kept on disk as columnar files, not row dicts
+        self.columnar_dir = self.upload_dir / ".columnar"
         self.supported_formats = {
             # Structured data
             'csv': self._process_csv,
@@ -75,8 +209,9 @@ class DocumentProcessor:
         try:
             # Save uploaded file
             file_path = self.upload_dir / uploaded_file.name
+            content = uploaded_file.getbuffer()
             with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+                f.write(content)
             
             # Detect file type
             file_extension = Path(uploaded_file.name).suffix.lower().lstrip('.')
@@ -96,6 +231,8 @@ class DocumentProcessor:
                 'file_size': uploaded_file.size,
                 'file_type': file_extension,
                 'mime_type': mime_type,
+                'content_sha256': hashlib.sha256(content).hexdigest(),
+                'source_path': str(file_path.resolve()),
                 'upload_timestamp': pd.Timestamp.now().isoformat()
             }
             
@@ -115,45 +252,163 @@ class DocumentProcessor:
                 }
             }
     
-    def process_directory(self, directory_path: str) -> Dict[str, Any]:
+    def process_file(self, file_path: Path) -> Dict[str, Any]:
         """
-        Process all files in a directory
+        Process a single file from disk with the processor for its extension
         """
-        results = {}
-        directory = Path(directory_path)
+        try:
+            file_extension = file_path.suffix.lower().lstrip('.')
+            processor = self.supported_formats[file_extension]
+            result = processor(file_path)
+            
+            result['metadata'] = {
+                'filename': file_path.name,
+                'file_size': file_path.stat().st_size,
+                'file_type': file_extension,
+                'source_path': str(file_path.resolve())
+            }
+            return result
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            return {'error': str(e)}
+    
+    def iter_process_directory(self, directory_path: str, max_workers: int = 1,
+                               timeout: Optional[float] = DEFAULT_FILE_TIMEOUT,
+                               progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Process all supported files in a directory, yielding results in completion order
         
+        Args:
+            directory_path: Directory to walk recursively
+            max_workers: Number of worker processes; 1 processes files in this process
+            timeout: Seconds a single file may run in process-pool mode before it is
+                reported as timed out; the pool is then replaced so the stuck worker
+                does not hold on to its slot, and the other files that were running
+                are started again
+            progress_callback: Called with (completed, total, file_path) after each file
+            
+        Yields:
+            Tuples of (file path, processing result)
+        """
+        directory = Path(directory_path)
         if not directory.exists():
-            return {'error': f"Directory {directory_path} does not exist"}
+            raise FileNotFoundError(f"Directory {directory_path} does not exist")
         
-        for file_path in directory.rglob('*'):
-            if file_path.is_file():
-                try:
-                    file_extension = file_path.suffix.lower().lstrip('.')
-                    if file_extension in self.supported_formats:
-                        processor = self.supported_formats[file_extension]
-                        result = processor(file_path)
-                        results[str(file_path)] = result
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {e}")
-                    results[str(file_path)] = {'error': str(e)}
+        file_paths = [
+            str(file_path) for file_path in directory.rglob('*')
+            if file_path.is_file() and file_path.suffix.lower().lstrip('.') in self.supported_formats
+        ]
+        total = len(file_paths)
+        completed = 0
         
-        return results
+        if max_workers <= 1:
+            for file_path in file_paths:
+                result = self.process_file(Path(file_path))
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total, file_path)
+                yield file_path, result
+            return
+        
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            remaining = iter(file_paths)
+            in_flight = {}
+            
+            def submit(file_path: str) -> None:
+                future = executor.submit(
+                    _process_file_in_worker, str(self.upload_dir), self.stream_pdf_page_threshold, file_path
+                )
+                in_flight[future] = (file_path, time.monotonic())
+            
+            def submit_next() -> bool:
+                file_path = next(remaining, None)
+                if file_path is None:
+                    return False
+                submit(file_path)
+                return True
+            
+            # Keep at most max_workers files in flight so each one starts running
+            # as soon as it is submitted and its timeout clock measures run time
+            for _ in range(max_workers):
+                if not submit_next():
+                    break
+            
+            while in_flight:
+                done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+                finished = []
+                
+                for future in done:
+                    file_path, _ = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing {file_path}: {e}")
+                        result = {'error': str(e)}
+                    finished.append((file_path, result))
+                
+                if timeout is not None:
+                    now = time.monotonic()
+                    timed_out = [
+                        future for future, (_, submitted) in in_flight.items()
+                        if now - submitted > timeout
+                    ]
+                    
+                    if timed_out:
+                        for future in timed_out:
+                            file_path, _ = in_flight.pop(future)
+                            logger.error(f"Timed out processing {file_path} after {timeout}s")
+                            finished.append((file_path, {'error': f"Processing timed out after {timeout}s"}))
+                        
+                        # A running task cannot be cancelled, so replace the pool to
+                        # free the stuck workers and restart the files cut short
+                        interrupted = [file_path for file_path, _ in in_flight.values()]
+                        in_flight.clear()
+                        _terminate_pool(executor)
+                        executor = ProcessPoolExecutor(max_workers=max_workers)
+                        for file_path in interrupted:
+                            submit(file_path)
+                
+                for file_path, result in finished:
+                    submit_next()
+                    completed += 1
+                    if progress_callback:
+                        progress_callback(completed, total, file_path)
+                    yield file_path, result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def process_directory(self, directory_path: str, max_workers: int = 1,
+                          timeout: Optional[float] = DEFAULT_FILE_TIMEOUT,
+                          progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Any]:
+        """
+        Process all files in a directory
+        """
+        if not Path(directory_path).exists():
+            return {'error': f"Directory {directory_path} does not exist"}
+        
+        return dict(self.iter_process_directory(directory_path, max_workers, timeout, progress_callback))
     
     def _process_csv(self, file_path: Path) -> Dict[str, Any]:
         """Process CSV files"""
         try:
-            # Detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                encoding = chardet.detect(raw_data)['encoding']
+            # Detect encoding from a bounded sample
+            encoding = detect_encoding(file_path)
+            
+            if os.path.getsize(file_path) > LARGE_TABLE_BYTES:
+                return self._process_large_delimited(file_path, ',', 'csv', encoding)
             
             # Read CSV
-            df = pd.read_csv(file_path, encoding=encoding)
+            try:
+                df = pd.read_csv(file_path, encoding=encoding)
+            except UnicodeDecodeError:
+                # Non-UTF-8 bytes the sample missed; detect from the whole file
+                df = pd.read_csv(file_path, encoding=detect_encoding(file_path, sample_size=None))
             
             return {
                 'type': 'structured',
                 'data_type': 'csv',
-                'data': df.to_dict('records'),
+                'data': write_table(df, self.columnar_dir, file_path.name, source_key(file_path)),
                 'columns': df.columns.tolist(),
                 'shape': df.shape,
                 'dtypes': df.dtypes.to_dict(),
@@ -164,17 +419,54 @@ class DocumentProcessor:
         except Exception as e:
             return {'error': f"CSV processing error: {e}"}
     
+    def _process_large_delimited(self, file_path: Path, sep: str, data_type: str, encoding: str,
+                                 retry_encoding: bool = True) -> Dict[str, Any]:
+        """
+        Profile a large CSV/TSV in one chunked pass while writing it to a columnar file
+        """
+        profiler = TableProfiler()
+        writer = ColumnarTableWriter(self.columnar_dir, file_path.name, source_key(file_path))
+        
+        try:
+            for chunk in pd.read_csv(file_path, sep=sep, encoding=encoding, chunksize=DEFAULT_CHUNK_ROWS):
+                writer.write(profiler.update(chunk))
+        except UnicodeDecodeError:
+            writer.abort()
+            if not retry_encoding:
+                raise
+            # Non-UTF-8 bytes the sample missed; detect from the whole file and start again
+            encoding = detect_encoding(file_path, sample_size=None)
+            return self._process_large_delimited(file_path, sep, data_type, encoding, retry_encoding=False)
+        
+        profile = profiler.result()
+        
+        return {
+            'type': 'structured',
+            'data_type': data_type,
+            'data': writer.close(),
+            'columns': profile['columns'],
+            'shape': profile['shape'],
+            'dtypes': profile['dtypes'],
+            'summary': profile['summary'],
+            'null_counts': profile['null_counts'],
+            'distinct_counts': profile['distinct_counts'],
+            'correlation_matrix': profile['correlation_matrix'],
+            'sample_data': profile['sample_data'],
+            'profiled_in_chunks': True
+        }
+    
     def _process_excel(self, file_path: Path) -> Dict[str, Any]:
         """Process Excel files"""
         try:
             # Read all sheets
             excel_file = pd.ExcelFile(file_path)
             sheets_data = {}
+            file_key = source_key(file_path)
             
             for sheet_name in excel_file.sheet_names:
                 df = pd.read_excel(file_path, sheet_name=sheet_name)
                 sheets_data[sheet_name] = {
-                    'data': df.to_dict('records'),
+                    'data': write_table(df, self.columnar_dir, f"{file_path.name}_{sheet_name}", f"{file_key}:{sheet_name}"),
                     'columns': df.columns.tolist(),
                     'shape': df.shape,
                     'dtypes': df.dtypes.to_dict(),
@@ -292,14 +584,17 @@ class DocumentProcessor:
                 cursor.execute(f"SELECT * FROM {table} LIMIT 100")
                 sample_data = [dict(zip([col[0] for col in cursor.description], row)) for row in cursor.fetchall()]
                 
-                # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                row_count = cursor.fetchone()[0]
+                # Profile the whole table in chunks
+                profile = profile_sqlite_table(file_path, table)
                 
                 tables_data[table] = {
                     'columns': columns,
                     'sample_data': sample_data,
-                    'row_count': row_count
+                    'row_count': profile['shape'][0],
+                    'summary': profile['summary'],
+                    'null_counts': profile['null_counts'],
+                    'distinct_counts': profile['distinct_counts'],
+                    'correlation_matrix': profile['correlation_matrix']
                 }
             
             conn.close()
@@ -316,13 +611,7 @@ class DocumentProcessor:
     def _process_text(self, file_path: Path) -> Dict[str, Any]:
         """Process text files"""
         try:
-            # Detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                encoding = chardet.detect(raw_data)['encoding']
-            
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
+            content, encoding = read_text_file(file_path)
             
             # Basic text analysis
             lines = content.split('\n')
@@ -344,8 +633,7 @@ class DocumentProcessor:
     def _process_markdown(self, file_path: Path) -> Dict[str, Any]:
         """Process Markdown files"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content, _ = read_text_file(file_path)
             
             # Basic markdown analysis
             lines = content.split('\n')
@@ -367,8 +655,7 @@ class DocumentProcessor:
     def _process_log(self, file_path: Path) -> Dict[str, Any]:
         """Process log files"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content, _ = read_text_file(file_path)
             
             lines = content.split('\n')
             
@@ -393,18 +680,23 @@ class DocumentProcessor:
     def _process_tsv(self, file_path: Path) -> Dict[str, Any]:
         """Process TSV files"""
         try:
-            # Detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                encoding = chardet.detect(raw_data)['encoding']
+            # Detect encoding from a bounded sample
+            encoding = detect_encoding(file_path)
+            
+            if os.path.getsize(file_path) > LARGE_TABLE_BYTES:
+                return self._process_large_delimited(file_path, '\t', 'tsv', encoding)
             
             # Read TSV
-            df = pd.read_csv(file_path, sep='\t', encoding=encoding)
+            try:
+                df = pd.read_csv(file_path, sep='\t', encoding=encoding)
+            except UnicodeDecodeError:
+                # Non-UTF-8 bytes the sample missed; detect from the whole file
+                df = pd.read_csv(file_path, sep='\t', encoding=detect_encoding(file_path, sample_size=None))
             
             return {
                 'type': 'structured',
                 'data_type': 'tsv',
-                'data': df.to_dict('records'),
+                'data': write_table(df, self.columnar_dir, file_path.name, source_key(file_path)),
                 'columns': df.columns.tolist(),
                 'shape': df.shape,
                 'dtypes': df.dtypes.to_dict(),
@@ -419,11 +711,33 @@ class DocumentProcessor:
         """Process PDF files"""
         try:
             reader = PdfReader(file_path)
-            text_content = ""
             page_count = len(reader.pages)
             
-            for page in reader.pages:
-                text_content += page.extract_text() + "\n"
+            # Large PDFs are not kept in memory: one pass over the pages gathers
+            # the statistics and a sample, and the text is streamed from disk
+            # again when the document is stored in semantic memory
+            if page_count > self.stream_pdf_page_threshold:
+                sample_text = ""
+                word_count = 0
+                char_count = 0
+                for page_text in iter_pdf_pages(reader):
+                    if len(sample_text) < 1000:
+                        sample_text += page_text
+                    word_count += len(page_text.split())
+                    char_count += len(page_text)
+                
+                return {
+                    'type': 'unstructured',
+                    'data_type': 'pdf',
+                    'page_count': page_count,
+                    'word_count': word_count,
+                    'char_count': char_count,
+                    'sample_text': sample_text[:1000],
+                    'file_path': str(file_path),
+                    'streamed': True
+                }
+            
+            text_content = "".join(iter_pdf_pages(reader))
             
             return {
                 'type': 'unstructured',
@@ -432,7 +746,8 @@ class DocumentProcessor:
                 'page_count': page_count,
                 'word_count': len(text_content.split()),
                 'char_count': len(text_content),
-                'sample_text': text_content[:1000] if len(text_content) > 1000 else text_content
+                'sample_text': text_content[:1000],
+                'file_path': str(file_path)
             }
         except Exception as e:
             return {'error': f"PDF processing error: {e}"}
@@ -461,8 +776,7 @@ class DocumentProcessor:
     def _process_rtf(self, file_path: Path) -> Dict[str, Any]:
         """Process RTF files"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content, _ = read_text_file(file_path)
             
             # Basic RTF processing (remove RTF formatting codes)
             import re
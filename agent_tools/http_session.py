@@ -0,0 +1,196 @@
+"""
+HTTP Session Pool for Digital Twins Management System
+
+This module provides one process-wide, keep-alive HTTP session for reference
+validation, service status checks and LLM traffic, so repeated requests to a
+host reuse open TCP/TLS connections instead of paying a new handshake each
+time. Connections per host are capped, and every request gets a default
+connect/read timeout.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool settings
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', '32'))                  # Hosts with kept-alive connections
+HTTP_POOL_MAX_PER_HOST = int(os.getenv('HTTP_POOL_MAX_PER_HOST', '8'))     # Concurrent connections per host
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+HTTP_CONNECT_RETRIES = int(os.getenv('HTTP_CONNECT_RETRIES', '2'))
+
+# LLM requests stream long completions, so they get a longer read timeout
+LLM_HTTP_READ_TIMEOUT = float(os.getenv('LLM_HTTP_READ_TIMEOUT', '600'))
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class PooledHTTPSession:
+    """
+    Thread-safe wrapper around a requests.Session with bounded per-host pools
+    """
+    
+    def __init__(self, pool_hosts: int = HTTP_POOL_HOSTS, max_per_host: int = HTTP_POOL_MAX_PER_HOST,
+                 connect_timeout: float = HTTP_CONNECT_TIMEOUT, read_timeout: float = HTTP_READ_TIMEOUT,
+                 connect_retries: int = HTTP_CONNECT_RETRIES):
+        self.pool_hosts = pool_hosts
+        self.max_per_host = max_per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self.connect_retries = connect_retries
+        self._adapters = []
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a session whose adapters block instead of opening more than max_per_host connections"""
+        session = requests.Session()
+        session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+        
+        # Only connection failures are retried here; HTTP status handling is left to callers.
+        # read=False re-raises read timeouts as they are, so callers see requests' ReadTimeout
+        retry = Retry(total=None, connect=self.connect_retries, read=False, status=0, redirect=None, backoff_factor=0.3)
+        for prefix in ('https://', 'http://'):
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_hosts,
+                pool_maxsize=self.max_per_host,
+                pool_block=True,
+                max_retries=retry
+            )
+            session.mount(prefix, adapter)
+            self._adapters.append(adapter)
+        
+        return session
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request over the shared pool
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to requests.Session.request (timeout defaults to the pool timeout)
+        
+        Returns:
+            Response (close it, or read its body, to return the connection to the pool)
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request over the shared pool"""
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+    
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """Send a HEAD request over the shared pool"""
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection reuse statistics
+        
+        Returns:
+            Dictionary with per-host connections opened and requests served
+        """
+        hosts = {}
+        for adapter in self._adapters:
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    'connections_opened': pool.num_connections,
+                    'requests': pool.num_requests
+                }
+        
+        connections = sum(host['connections_opened'] for host in hosts.values())
+        served = sum(host['requests'] for host in hosts.values())
+        return {
+            'hosts': hosts,
+            'connections_opened': connections,
+            'requests': served,
+            'reuse_ratio': 1 - connections / served if served else 0.0,
+            'max_per_host': self.max_per_host
+        }
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+# Global session, created on first use
+_http_session: Optional[PooledHTTPSession] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> PooledHTTPSession:
+    """Get the shared pooled HTTP session"""
+    global _http_session
+    with _session_lock:
+        if _http_session is None:
+            _http_session = PooledHTTPSession()
+        return _http_session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request over the shared pool"""
+    return get_http_session().get(url, **kwargs)
+
+
+def http_head(url: str, **kwargs) -> requests.Response:
+    """Send a HEAD request over the shared pool"""
+    return get_http_session().head(url, **kwargs)
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Get connection reuse statistics for the shared pool"""
+    return get_http_session().get_stats()
+
+
+_llm_pool_configured = False
+
+
+def configure_llm_http_pool() -> bool:
+    """
+    Point LiteLLM (used by every CrewAI LLM) at shared keep-alive httpx clients
+    
+    Safe to call repeatedly; only the first call installs the clients.
+    
+    Returns:
+        True if the clients are installed
+    """
+    global _llm_pool_configured
+    with _session_lock:
+        if _llm_pool_configured:
+            return True
+        
+        try:
+            import httpx
+            import litellm
+        except ImportError as e:
+            logger.warning(f"LLM connection pooling unavailable: {e}")
+            return False
+        
+        limits = httpx.Limits(
+            max_connections=HTTP_POOL_HOSTS * HTTP_POOL_MAX_PER_HOST,
+            max_keepalive_connections=HTTP_POOL_HOSTS * HTTP_POOL_MAX_PER_HOST
+        )
+        timeout = httpx.Timeout(LLM_HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        
+        if litellm.client_session is None:
+            litellm.client_session = httpx.Client(limits=limits, timeout=timeout)
+        if litellm.aclient_session is None:
+            litellm.aclient_session = httpx.AsyncClient(limits=limits, timeout=timeout)
+        
+        _llm_pool_configured = True
+        logger.info("🔌 LLM HTTP clients share a keep-alive connection pool")
+        return True
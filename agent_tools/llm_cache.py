@@ -0,0 +1,245 @@
+"""
+LLM Response Cache for Digital Twins Management System
+
+This module provides an opt-in cache for LLM completions on the shared SQLite
+cache (sqlite_cache.py). Exact matches are keyed by model, sampling parameters
+and the full message list. An optional semantic tier embeds the prompt and
+serves near-duplicate prompts (same model and parameters) above a
+cosine-similarity threshold. Entries expire after a TTL and are evicted
+least-recently-used.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from agent_tools.sqlite_cache import SQLiteCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache settings (the cache is off unless explicitly enabled)
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'false').lower() == 'true'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', './cache/llm_cache.db')
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '500'))
+LLM_CACHE_SEMANTIC = os.getenv('LLM_CACHE_SEMANTIC', 'false').lower() == 'true'
+LLM_CACHE_SIMILARITY_THRESHOLD = float(os.getenv('LLM_CACHE_SIMILARITY_THRESHOLD', '0.97'))
+
+# Prompts are embedded in pieces of this many characters and averaged, because
+# the embedding model only reads the first few hundred tokens of each input
+EMBEDDING_CHUNK_CHARS = 1000
+
+# Near-duplicates must have a similar prompt length (ratio of shorter to longer)
+MIN_LENGTH_RATIO = 0.9
+
+
+def _prompt_text(messages) -> str:
+    """Flatten a prompt (string or message list) into plain text"""
+    if isinstance(messages, str):
+        return messages
+    
+    parts = []
+    for message in messages or []:
+        if isinstance(message, dict):
+            parts.append(f"{message.get('role', '')}: {message.get('content', '')}")
+        else:
+            parts.append(str(message))
+    return "\n".join(parts)
+
+
+class LLMResponseCache(SQLiteCache):
+    """
+    Persistent exact-match and near-duplicate cache for LLM responses
+    """
+    
+    table = "llm_cache"
+    columns = {'params_key': 'TEXT NOT NULL', 'prompt_length': 'INTEGER NOT NULL', 'embedding': 'BLOB'}
+    indexes = ['params_key']
+    label = "LLM response cache"
+    
+    def __init__(self, db_path: str = LLM_CACHE_PATH, ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, semantic: bool = LLM_CACHE_SEMANTIC,
+                 similarity_threshold: float = LLM_CACHE_SIMILARITY_THRESHOLD):
+        self.semantic = semantic
+        self.similarity_threshold = similarity_threshold
+        self._embedding_function = None
+        super().__init__(db_path, max_entries, ttl_seconds=ttl_seconds)
+        self.metrics['semantic_hits'] = 0
+    
+    @staticmethod
+    def make_params_key(params: Dict[str, Any]) -> str:
+        """Key for the model and sampling parameters (semantic matches never cross these)"""
+        return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any], messages) -> str:
+        """Exact-match key for the parameters and full message list"""
+        payload = {'params': params, 'messages': messages}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a prompt as the normalized mean of its chunk embeddings"""
+        try:
+            if self._embedding_function is None:
+                from chromadb.utils import embedding_functions
+                self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+            
+            chunks = [text[i:i + EMBEDDING_CHUNK_CHARS] for i in range(0, len(text), EMBEDDING_CHUNK_CHARS)] or [""]
+            vectors = np.asarray(self._embedding_function(chunks), dtype=np.float32)
+            vector = vectors.mean(axis=0)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            logger.warning(f"Semantic LLM cache disabled, embedding failed: {e}")
+            self.semantic = False
+            return None
+    
+    def get(self, params: Dict[str, Any], messages) -> Optional[str]:
+        """
+        Look up a cached response, trying an exact match before a near-duplicate
+        
+        Args:
+            params: Model and sampling parameters
+            messages: Prompt (string or message list)
+        
+        Returns:
+            Cached response text, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        cache_key = self.make_key(params, messages)
+        response = self._get_values([cache_key], count_misses=False).get(cache_key)
+        if response is not None:
+            return response
+        
+        if self.semantic:
+            try:
+                response = self._get_similar(self.make_params_key(params), _prompt_text(messages))
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache lookup failed: {e}")
+            if response is not None:
+                return response
+        
+        self.metrics['misses'] += 1
+        return None
+    
+    def _get_similar(self, params_key: str, prompt_text: str) -> Optional[str]:
+        """Find the most similar unexpired prompt with the same parameters"""
+        embedding = self._embed(prompt_text)
+        if embedding is None:
+            return None
+        
+        length = len(prompt_text)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    """SELECT cache_key, value, embedding FROM llm_cache
+                       WHERE params_key = ? AND embedding IS NOT NULL AND expires_at > ?
+                       AND prompt_length BETWEEN ? AND ?""",
+                    (params_key, now, int(length * MIN_LENGTH_RATIO), int(length / MIN_LENGTH_RATIO) + 1)
+                ).fetchall()
+                
+                if not rows:
+                    return None
+                
+                matrix = np.stack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+                similarities = matrix @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] < self.similarity_threshold:
+                    return None
+                
+                conn.execute("UPDATE llm_cache SET last_accessed = ? WHERE cache_key = ?", (now, rows[best][0]))
+                conn.commit()
+                self.metrics['semantic_hits'] += 1
+                logger.info(f"LLM cache near-duplicate hit (similarity {similarities[best]:.3f})")
+                return json.loads(rows[best][1])
+            finally:
+                conn.close()
+    
+    def set(self, params: Dict[str, Any], messages, response: str):
+        """
+        Store a response and evict the least recently used entries beyond max_entries
+        
+        Args:
+            params: Model and sampling parameters
+            messages: Prompt (string or message list)
+            response: Response text
+        """
+        if not self.enabled:
+            return
+        
+        prompt_text = _prompt_text(messages)
+        embedding = self._embed(prompt_text) if self.semantic else None
+        self._set_value(
+            self.make_key(params, messages), response,
+            params_key=self.make_params_key(params),
+            prompt_length=len(prompt_text),
+            embedding=embedding.tobytes() if embedding is not None else None
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics for this process and the size of the shared cache
+        
+        Returns:
+            Dictionary with hit/miss counters, hit rate and entry count
+        """
+        stats = super().get_stats()
+        hits = stats['hits'] + stats['semantic_hits']
+        stats['hit_rate'] = hits / (hits + stats['misses']) if hits + stats['misses'] else 0.0
+        stats['semantic'] = self.semantic
+        return stats
+
+
+# Global cache instance, created on first use
+_llm_response_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the shared LLM response cache"""
+    global _llm_response_cache
+    with _cache_lock:
+        if _llm_response_cache is None:
+            _llm_response_cache = LLMResponseCache()
+        return _llm_response_cache
+
+
+def bypass_llm_cache(llm):
+    """
+    Return a copy of an LLM that never reads or writes the response cache
+    
+    Used by workflows that must always get fresh completions; the original
+    LLM instance (often shared between sessions) is left unchanged.
+    
+    Args:
+        llm: LLM instance (RobustLLM or any CrewAI LLM)
+    
+    Returns:
+        LLM with caching disabled
+    """
+    if hasattr(llm, 'with_cache'):
+        return llm.with_cache(False)
+    return llm
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Get LLM response cache metrics"""
+    return get_llm_cache().get_stats()
+
+
+def clear_llm_cache() -> int:
+    """Remove all cached LLM responses"""
+    return get_llm_cache().clear()
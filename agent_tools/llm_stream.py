@@ -0,0 +1,127 @@
+"""
+LLM Streaming for Digital Twins Management System
+
+This module carries LLM output from the Ollama endpoint to the UI while a
+workflow is still running. A TokenStream is a thread-safe event queue; LLMs
+returned by RateLimitedLLM.with_stream() call the endpoint with streaming
+enabled and push every chunk into their stream. stream_workflow() runs a
+workflow in a background thread and yields those events as a generator.
+"""
+
+import queue
+import threading
+import logging
+from typing import Dict, Any, Iterator, Callable, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Event types yielded by TokenStream.events()
+EVENT_START = 'start'      # An LLM call (or a retry of one) started (source: agent role)
+EVENT_TOKEN = 'token'      # A chunk of generated text from the current call
+EVENT_END = 'end'          # An LLM call finished
+EVENT_RESULT = 'result'    # The workflow finished (text: final result)
+EVENT_ERROR = 'error'      # The workflow failed (text: error message)
+
+_DONE = object()
+
+
+class TokenStream:
+    """
+    Thread-safe queue of streaming events from LLM calls to a consumer
+    """
+    
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self.closed = False
+    
+    def emit(self, event_type: str, text: str = '', **metadata):
+        """Queue an event"""
+        if not self.closed:
+            self._queue.put({'type': event_type, 'text': text, **metadata})
+    
+    def emit_token(self, text: str, **metadata):
+        """Queue a chunk of generated text"""
+        if text:
+            self.emit(EVENT_TOKEN, text, **metadata)
+    
+    def close(self, result: str = ''):
+        """Finish the stream with the workflow's final result"""
+        self.emit(EVENT_RESULT, result)
+        self.closed = True
+        self._queue.put(_DONE)
+    
+    def fail(self, error: BaseException):
+        """Finish the stream with an error"""
+        self.emit(EVENT_ERROR, str(error))
+        self.closed = True
+        self._queue.put(_DONE)
+    
+    def events(self, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield events until the stream is closed
+        
+        Args:
+            timeout: Maximum seconds to wait for the next event (None waits indefinitely)
+        
+        Yields:
+            Event dictionaries with 'type' and 'text' keys
+        
+        Raises:
+            queue.Empty: If no event arrives within timeout
+        """
+        while True:
+            event = self._queue.get(timeout=timeout)
+            if event is _DONE:
+                return
+            yield event
+
+
+def _register_chunk_handler() -> bool:
+    """Forward CrewAI stream chunk events to the TokenStream of the LLM that produced them"""
+    try:
+        try:
+            from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+        except ImportError:
+            from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+    except ImportError as e:
+        logger.warning(f"CrewAI stream events unavailable, streaming falls back to whole responses: {e}")
+        return False
+    
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _forward_chunk(source, event):
+        token_stream = getattr(source, '_token_stream', None)
+        if token_stream is not None:
+            token_stream.emit_token(event.chunk)
+    
+    return True
+
+
+# Whether chunk-level streaming is available (otherwise each response arrives in one piece)
+CHUNK_STREAMING_AVAILABLE = _register_chunk_handler()
+
+
+def stream_workflow(llm, workflow: Callable[[Any], str]) -> Iterator[Dict[str, Any]]:
+    """
+    Run a workflow in a background thread and yield its streaming events
+    
+    Args:
+        llm: LLM to use; a streaming copy is passed to the workflow when supported
+        workflow: Callable taking the LLM and returning the final result text
+    
+    Yields:
+        Event dictionaries (start, token, end, result, error)
+    """
+    token_stream = TokenStream()
+    streaming_llm = llm.with_stream(token_stream) if hasattr(llm, 'with_stream') else llm
+    
+    def run():
+        try:
+            token_stream.close(str(workflow(streaming_llm)))
+        except Exception as e:
+            logger.error(f"Streaming workflow failed: {e}")
+            token_stream.fail(e)
+    
+    threading.Thread(target=run, name="workflow-stream", daemon=True).start()
+    yield from token_stream.events()
@@ -0,0 +1,347 @@
+"""
+Rate Limiter for Digital Twins Management System
+
+This module provides token-bucket rate limiting for LLM calls. One bucket is
+shared per LLM endpoint across every crew, agent and workflow in the process,
+so throughput follows the provider's request limit instead of fixed sleeps.
+Setting LLM_RATE_LIMIT_DB to a SQLite file path shares the buckets between
+processes (e.g. several Streamlit workers on one host).
+"""
+
+import os
+import copy
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from crewai import LLM
+
+from agent_tools.llm_stream import TokenStream, CHUNK_STREAMING_AVAILABLE, EVENT_START, EVENT_END
+from agent_tools.http_session import configure_llm_http_pool
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default provider limit in requests per minute (same setting as the app config)
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv('MAX_RPM', '20'))
+
+# Requests that may be sent back to back before the rate applies (defaults to one minute's worth)
+DEFAULT_BURST = int(os.getenv('LLM_RATE_LIMIT_BURST', '0')) or None
+
+# Optional SQLite file shared by all processes that should draw from the same buckets
+RATE_LIMIT_DB = os.getenv('LLM_RATE_LIMIT_DB')
+
+# Longest single sleep while waiting, so drained or reconfigured buckets are re-checked
+MAX_WAIT_SLICE = 5.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at the configured rate
+    """
+    
+    def __init__(self, key: str, requests_per_minute: float, burst: Optional[int] = None):
+        self.key = key
+        self.requests_per_minute = requests_per_minute
+        self.capacity = float(burst or max(1, int(requests_per_minute)))
+        self._rate = requests_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {'acquired': 0, 'waits': 0, 'total_wait_seconds': 0.0, 'drains': 0}
+    
+    def _try_acquire(self, tokens: float) -> float:
+        """Take tokens if available; otherwise return the seconds until they will be"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self._rate
+    
+    def _drain(self, seconds: float) -> None:
+        with self._lock:
+            self._tokens = -seconds * self._rate
+            self._updated = time.monotonic()
+    
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Block until the requested tokens are available and take them
+        
+        Args:
+            tokens: Number of tokens (requests) to take
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        
+        Returns:
+            Seconds spent waiting
+        
+        Raises:
+            TimeoutError: If the tokens do not become available within timeout
+        """
+        waited = 0.0
+        
+        while True:
+            delay = self._try_acquire(tokens)
+            if delay <= 0:
+                with self._lock:
+                    self.stats['acquired'] += 1
+                    if waited:
+                        self.stats['waits'] += 1
+                        self.stats['total_wait_seconds'] += waited
+                return waited
+            
+            if timeout is not None and waited + delay > timeout:
+                raise TimeoutError(f"Rate limit for '{self.key}' not available within {timeout} seconds")
+            
+            delay = min(delay, MAX_WAIT_SLICE)
+            time.sleep(delay)
+            waited += delay
+    
+    def drain(self, seconds: float = 0.0) -> None:
+        """
+        Empty the bucket, e.g. after the provider answered 429
+        
+        Args:
+            seconds: Additional time before any token becomes available again
+        """
+        self.stats['drains'] += 1
+        self._drain(seconds)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return usage statistics for the bucket"""
+        return {
+            'key': self.key,
+            'requests_per_minute': self.requests_per_minute,
+            'capacity': self.capacity,
+            'backend': 'memory',
+            **self.stats
+        }
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a SQLite file so several processes share it
+    """
+    
+    def __init__(self, key: str, requests_per_minute: float, burst: Optional[int] = None, db_path: str = RATE_LIMIT_DB):
+        super().__init__(key, requests_per_minute, burst)
+        self.db_path = db_path
+        
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+        finally:
+            conn.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+    
+    def _update(self, update) -> float:
+        """Apply update(current_tokens, now) -> (new_tokens, result) inside one write transaction"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE key = ?", (self.key,)
+            ).fetchone()
+            
+            # Wall-clock time, since monotonic clocks are not comparable across processes
+            now = time.time()
+            current = self.capacity if row is None else min(self.capacity, row[0] + max(0.0, now - row[1]) * self._rate)
+            new_tokens, result = update(current, now)
+            
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.key, new_tokens, now)
+            )
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def _try_acquire(self, tokens: float) -> float:
+        def update(current, now):
+            if current >= tokens:
+                return current - tokens, 0.0
+            return current, (tokens - current) / self._rate
+        
+        with self._lock:
+            return self._update(update)
+    
+    def _drain(self, seconds: float) -> None:
+        with self._lock:
+            self._update(lambda current, now: (-seconds * self._rate, 0.0))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['backend'] = 'sqlite'
+        stats['db_path'] = self.db_path
+        return stats
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide registry of token buckets keyed by LLM endpoint
+    """
+    
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 burst: Optional[int] = DEFAULT_BURST, db_path: Optional[str] = RATE_LIMIT_DB):
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.db_path = db_path
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._limits: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def configure(self, endpoint: str, requests_per_minute: float, burst: Optional[int] = None) -> TokenBucket:
+        """
+        Set the limit for one endpoint, replacing any existing bucket
+        
+        Args:
+            endpoint: Endpoint key (see get_llm_endpoint)
+            requests_per_minute: Provider request limit
+            burst: Requests allowed back to back (defaults to one minute's worth)
+        
+        Returns:
+            The endpoint's bucket
+        """
+        with self._lock:
+            self._limits[endpoint] = {'requests_per_minute': requests_per_minute, 'burst': burst}
+            self._buckets[endpoint] = self._create_bucket(endpoint)
+            return self._buckets[endpoint]
+    
+    def _create_bucket(self, endpoint: str) -> TokenBucket:
+        limits = self._limits.get(endpoint, {})
+        requests_per_minute = limits.get('requests_per_minute', self.requests_per_minute)
+        burst = limits.get('burst', self.burst)
+        
+        if self.db_path:
+            try:
+                return SQLiteTokenBucket(endpoint, requests_per_minute, burst, db_path=self.db_path)
+            except sqlite3.Error as e:
+                logger.warning(f"Shared rate limit store unavailable ({e}), using an in-process bucket for {endpoint}")
+        return TokenBucket(endpoint, requests_per_minute, burst)
+    
+    def get(self, endpoint: str) -> TokenBucket:
+        """Return the bucket for an endpoint, creating it on first use"""
+        with self._lock:
+            if endpoint not in self._buckets:
+                self._buckets[endpoint] = self._create_bucket(endpoint)
+            return self._buckets[endpoint]
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics for every bucket"""
+        with self._lock:
+            return {endpoint: bucket.get_stats() for endpoint, bucket in self._buckets.items()}
+
+
+def get_llm_endpoint(llm) -> str:
+    """
+    Derive the rate-limit key for an LLM (its base URL, falling back to the model name)
+    
+    Args:
+        llm: CrewAI LLM instance
+    
+    Returns:
+        Endpoint key
+    """
+    endpoint = getattr(llm, 'base_url', None) or getattr(llm, 'api_base', None)
+    if endpoint:
+        return str(endpoint).rstrip('/')
+    return str(getattr(llm, 'model', 'default'))
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an exception reports that the provider's rate limit was hit"""
+    message = str(error).lower()
+    return any(keyword in message for keyword in ['429', 'rate limit', 'ratelimit', 'too many requests'])
+
+
+class RateLimitedLLM(LLM):
+    """
+    CrewAI LLM that takes a token from its endpoint's shared bucket before every call
+    
+    Copies made with with_stream() also stream their output into a TokenStream.
+    """
+    
+    # TokenStream receiving this LLM's output (set on copies made by with_stream)
+    _token_stream = None
+    
+    def __init__(self, *args, **kwargs):
+        # LLM calls reuse keep-alive connections from the shared HTTP pool
+        configure_llm_http_pool()
+        super().__init__(*args, **kwargs)
+    
+    def call(self, messages, *args, **kwargs):
+        bucket = rate_limiter_registry.get(get_llm_endpoint(self))
+        waited = bucket.acquire()
+        if waited:
+            logger.info(f"⏳ Waited {waited:.1f}s for LLM rate limit on {bucket.key}")
+        
+        token_stream = self._token_stream
+        if token_stream is not None:
+            agent = kwargs.get('from_agent')
+            token_stream.emit(EVENT_START, source=getattr(agent, 'role', None))
+        
+        try:
+            result = super().call(messages, *args, **kwargs)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                # Make every caller sharing the endpoint back off, not just this one
+                bucket.drain()
+            raise
+        
+        if token_stream is not None:
+            if not CHUNK_STREAMING_AVAILABLE and isinstance(result, str):
+                token_stream.emit_token(result)
+            token_stream.emit(EVENT_END)
+        return result
+    
+    def with_stream(self, token_stream: TokenStream) -> 'RateLimitedLLM':
+        """
+        Return a copy of this LLM that streams its output into a TokenStream
+        
+        Args:
+            token_stream: Stream receiving start, token and end events for every call
+        
+        Returns:
+            Shallow copy with streaming enabled; the original LLM is left unchanged
+        """
+        llm = copy.copy(self)
+        llm.stream = True
+        llm._token_stream = token_stream
+        return llm
+
+
+# Global registry instance
+rate_limiter_registry = RateLimiterRegistry()
+
+
+def configure_rate_limit(endpoint: str, requests_per_minute: float, burst: Optional[int] = None) -> TokenBucket:
+    """Set the request limit for an LLM endpoint"""
+    return rate_limiter_registry.configure(endpoint, requests_per_minute, burst)
+
+
+def acquire_llm_slot(endpoint: str, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+    """Block until a request to the endpoint is allowed; returns seconds waited"""
+    return rate_limiter_registry.get(endpoint).acquire(tokens, timeout)
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for all rate limit buckets"""
+    return rate_limiter_registry.get_stats()
@@ -5,19 +5,55 @@ This module provides Harvard referencing functionality and reference management
 for all agents in the Digital Twin system.
 """
 
+import os
 import re
+import html
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import logging
 from urllib.parse import urlparse
 import hashlib
 
+from agent_tools.http_session import get_http_session, HTTP_CONNECT_TIMEOUT
+from agent_tools.validation_cache import validation_cache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent URL checks in validate_many, and the cap for any single host
+VALIDATION_WORKERS = int(os.getenv('REFERENCE_VALIDATION_WORKERS', '16'))
+VALIDATION_MAX_PER_HOST = int(os.getenv('REFERENCE_VALIDATION_MAX_PER_HOST', '4'))
+
+# HEAD responses that some servers send for HEAD only, so the URL is re-checked with GET
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 406, 429, 501}
+
+# Most of a page read when looking for its title
+TITLE_SCAN_BYTES = 64 * 1024
+
+
+def _read_title(response: requests.Response) -> Optional[str]:
+    """Read a streamed HTML response up to the end of its <head> and extract the title"""
+    head = b""
+    for chunk in response.iter_content(chunk_size=8192):
+        head += chunk
+        lowered = head.lower()
+        if b"</head>" in lowered or b"<body" in lowered or len(head) >= TITLE_SCAN_BYTES:
+            break
+    
+    try:
+        text = head.decode(response.encoding or 'utf-8', errors='replace')
+    except LookupError:
+        text = head.decode('utf-8', errors='replace')
+    
+    title_match = re.search(r'<title[^>]*>([^<]+)</title>', text, re.IGNORECASE)
+    return html.unescape(title_match.group(1)).strip() if title_match else None
+
 
 class ReferenceManager:
     """
@@ -28,7 +64,6 @@ class ReferenceManager:
         self.references = {}  # Store all references by ID
         self.inline_citations = {}  # Track inline citations
         self.reference_counter = 1
-        self.validated_sources = {}  # Cache for validated sources
         
     def create_reference(self, 
                         title: str, 
@@ -134,6 +169,9 @@ class ReferenceManager:
         """
         Validate if a URL is accessible and get basic information
         
+        Results are cached on disk and shared with other sessions and processes,
+        for longer when the URL was reachable than when the check failed.
+        
         Args:
             url: URL to validate
             timeout: Request timeout in seconds
@@ -141,14 +179,70 @@ class ReferenceManager:
         Returns:
             Validation result with status and metadata
         """
-        try:
-            # Check if already validated recently
-            url_hash = hashlib.md5(url.encode()).hexdigest()
-            if url_hash in self.validated_sources:
-                cached_result = self.validated_sources[url_hash]
-                if time.time() - cached_result['timestamp'] < 3600:  # 1 hour cache
-                    return cached_result['result']
+        cached_result = validation_cache.get(url)
+        if cached_result is not None:
+            return cached_result
+        
+        return self._check_and_cache_url(url, timeout)
+    
+    def validate_many(self, urls: List[str], timeout: int = 10,
+                      max_workers: int = VALIDATION_WORKERS) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate many URLs concurrently
+        
+        Cached results are returned straight away; the remaining URLs are checked
+        in a thread pool with at most VALIDATION_MAX_PER_HOST requests in flight
+        to any one host.
+        
+        Args:
+            urls: URLs to validate (duplicates are checked once)
+            timeout: Request timeout in seconds for each URL
+            max_workers: Maximum concurrent checks
             
+        Returns:
+            Validation result for each distinct URL
+        """
+        results = validation_cache.get_many(urls)
+        pending = [url for url in dict.fromkeys(urls) if url not in results]
+        
+        if not pending:
+            return results
+        
+        # Interleave hosts so the workers are not all queued behind one host's cap
+        urls_by_host = {}
+        for url in pending:
+            urls_by_host.setdefault(urlparse(url).netloc.lower(), []).append(url)
+        ordered = [url for group in zip_longest(*urls_by_host.values()) for url in group if url is not None]
+        host_slots = {host: threading.BoundedSemaphore(VALIDATION_MAX_PER_HOST) for host in urls_by_host}
+        
+        def check(url: str) -> Dict[str, Any]:
+            with host_slots[urlparse(url).netloc.lower()]:
+                return self._check_and_cache_url(url, timeout)
+        
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ordered)))) as executor:
+            futures = {executor.submit(check, url): url for url in ordered}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        logger.info(f"Validated {len(ordered)} URLs across {len(urls_by_host)} hosts in {time.time() - start_time:.1f}s "
+                    f"({len(results) - len(ordered)} from cache)")
+        return results
+    
+    def _check_and_cache_url(self, url: str, timeout: int) -> Dict[str, Any]:
+        """Check a URL and cache the result (failures are kept only briefly)"""
+        result = self._check_url(url, timeout)
+        validation_cache.set(url, result)
+        return result
+    
+    def _check_url(self, url: str, timeout: int) -> Dict[str, Any]:
+        """
+        Check a URL with HEAD, falling back to a streamed GET of the page head
+        
+        A GET is only sent when HEAD is not conclusive: the server rejects HEAD,
+        errors, or returns an HTML page whose title is wanted.
+        """
+        try:
             # Parse URL
             parsed_url = urlparse(url)
             if not parsed_url.scheme or not parsed_url.netloc:
@@ -160,41 +254,33 @@ class ReferenceManager:
                     "accessible": False
                 }
             
-            # Make request with proper headers
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            # Requests go over the shared keep-alive pool (sends a browser User-Agent)
+            session = get_http_session()
+            request_timeout = (min(timeout, HTTP_CONNECT_TIMEOUT), timeout)
             
-            response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+            with session.head(url, timeout=request_timeout) as response:
+                status_code = response.status_code
+                final_url = response.url  # Final URL after redirects
+                content_type = response.headers.get('Content-Type', '').lower()
             
-            # Extract title if possible
             title = None
-            if response.status_code == 200:
-                try:
-                    # Simple title extraction
-                    title_match = re.search(r'<title[^>]*>([^<]+)</title>', response.text, re.IGNORECASE)
-                    if title_match:
-                        title = title_match.group(1).strip()
-                except:
-                    pass
-            
-            result = {
-                "valid": response.status_code == 200,
-                "error": None if response.status_code == 200 else f"HTTP {response.status_code}",
-                "status_code": response.status_code,
-                "title": title,
-                "accessible": response.status_code == 200,
-                "url": response.url  # Final URL after redirects
-            }
+            if (status_code in HEAD_FALLBACK_STATUSES or status_code >= 500
+                    or (status_code == 200 and (not content_type or 'html' in content_type))):
+                with session.get(url, timeout=request_timeout, stream=True) as response:
+                    status_code = response.status_code
+                    final_url = response.url
+                    if status_code == 200:
+                        title = _read_title(response)
             
-            # Cache result
-            self.validated_sources[url_hash] = {
-                "result": result,
-                "timestamp": time.time()
+            return {
+                "valid": status_code == 200,
+                "error": None if status_code == 200 else f"HTTP {status_code}",
+                "status_code": status_code,
+                "title": title,
+                "accessible": status_code == 200,
+                "url": final_url
             }
             
-            return result
-            
         except requests.exceptions.Timeout:
             return {
                 "valid": False,
@@ -221,12 +307,13 @@ class ReferenceManager:
                 "accessible": False
             }
     
-    def validate_reference(self, ref_id: str) -> Dict[str, Any]:
+    def validate_reference(self, ref_id: str, url_validation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Validate a reference by checking its URL and extracting metadata
         
         Args:
             ref_id: Reference ID to validate
+            url_validation: Result of an earlier validate_url/validate_many check of its URL
             
         Returns:
             Validation result
@@ -251,7 +338,8 @@ class ReferenceManager:
                 }
             
             # Validate URL
-            url_validation = self.validate_url(reference['url'])
+            if url_validation is None:
+                url_validation = self.validate_url(reference['url'])
             
             if url_validation['valid']:
                 # Update reference with validated information
@@ -283,6 +371,31 @@ class ReferenceManager:
                 "metadata": None
             }
     
+    def validate_references(self, ref_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate several references, checking their URLs concurrently
+        
+        Args:
+            ref_ids: Reference IDs to validate (default: all references)
+            
+        Returns:
+            Validation result for each reference ID
+        """
+        if ref_ids is None:
+            ref_ids = list(self.references)
+        
+        urls = [self.references[ref_id]['url'] for ref_id in ref_ids
+                if ref_id in self.references and self.references[ref_id].get('url')]
+        url_results = self.validate_many(urls)
+        
+        return {
+            ref_id: self.validate_reference(
+                ref_id,
+                url_results.get(self.references[ref_id].get('url')) if ref_id in self.references else None
+            )
+            for ref_id in ref_ids
+        }
+    
     def format_harvard_reference(self, ref_id: str) -> str:
         """
         Format a reference in Harvard style
@@ -438,6 +551,16 @@ def validate_reference(ref_id: str) -> Dict[str, Any]:
     return reference_manager.validate_reference(ref_id)
 
 
+def validate_many(urls: List[str], timeout: int = 10) -> Dict[str, Dict[str, Any]]:
+    """Validate many URLs concurrently"""
+    return reference_manager.validate_many(urls, timeout)
+
+
+def validate_references(ref_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Validate several references concurrently"""
+    return reference_manager.validate_references(ref_ids)
+
+
 def format_harvard_reference(ref_id: str) -> str:
     """Format a reference in Harvard style"""
     return reference_manager.format_harvard_reference(ref_id)
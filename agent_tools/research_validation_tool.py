@@ -14,6 +14,7 @@ from agent_tools.reference_manager import (
     create_reference,
     add_citation,
     validate_reference,
+    validate_references,
     format_harvard_reference,
     generate_reference_list,
     get_citation_stats,
@@ -149,6 +150,9 @@ def validate_all_references() -> str:
         # Get citation stats before validation
         stats_before = get_citation_stats()
         
+        # Check every reference's URL concurrently
+        validate_references()
+        
         # Remove invalid references
         removed_refs = remove_invalid_references()
         
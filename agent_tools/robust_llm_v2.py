@@ -2,23 +2,32 @@
 Robust LLM class with retry logic for Ollama Cloud
 """
 
+import copy
 import time
 import requests
-from crewai import LLM
+from agent_tools.rate_limiter import RateLimitedLLM
+from agent_tools.llm_cache import get_llm_cache, LLM_CACHE_ENABLED
+from agent_tools.context_budget import ContextBudgetManager, is_context_length_error
+from agent_tools.llm_stream import EVENT_START, EVENT_END
 from typing import Optional, Dict, Any, Union, List
 import logging
 import os
 
 
-class RobustLLM(LLM):
+class RobustLLM(RateLimitedLLM):
     """
     A robust LLM class that inherits from CrewAI's LLM and adds retry logic
     for Ollama Cloud service issues. This class ensures full CrewAI compatibility.
+    Every attempt draws from the endpoint's shared rate limit bucket. With
+    cache_enabled, identical (or, if configured, near-identical) prompts are
+    answered from the persistent response cache.
     """
     
-    def __init__(self, use_cloud: bool = True, api_key: Optional[str] = None, max_retries: int = 3, retry_delay: float = 2.0, **kwargs):
+    def __init__(self, use_cloud: bool = True, api_key: Optional[str] = None, max_retries: int = 3, retry_delay: float = 2.0,
+                 cache_enabled: Optional[bool] = None, **kwargs):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.cache_enabled = LLM_CACHE_ENABLED if cache_enabled is None else cache_enabled
         self.logger = logging.getLogger(__name__)
         
         # Set up the base LLM configuration
@@ -52,7 +61,21 @@ class RobustLLM(LLM):
         """
         last_exception = None
         
-        # Process messages to handle length and complexity issues
+        # Only plain completions are cached; tool calls have side effects
+        cache = get_llm_cache() if self.cache_enabled and not tools and not available_functions else None
+        cache_params = self._cache_params()
+        if cache is not None:
+            cached = cache.get(cache_params, messages)
+            if cached is not None:
+                self.logger.info("⚡ RobustLLM response served from cache")
+                if self._token_stream is not None:
+                    self._token_stream.emit(EVENT_START, source=getattr(from_agent, 'role', None))
+                    self._token_stream.emit_token(cached)
+                    self._token_stream.emit(EVENT_END)
+                return cached
+        
+        # Fit messages into the model's context window
+        budget_scale = 1.0
         processed_messages = self._process_messages(messages)
         
         for attempt in range(self.max_retries):
@@ -95,6 +118,9 @@ class RobustLLM(LLM):
                         last_exception = Exception("All retry attempts failed with empty responses")
                         break
                 
+                if cache is not None and isinstance(result, str):
+                    cache.set(cache_params, messages, result)
+                
                 return result
                 
             except BaseException as e:
@@ -123,10 +149,18 @@ class RobustLLM(LLM):
                 except Exception as log_error:
                     print(f"❌ RobustLLM error on attempt {attempt + 1}: [Error logging failed: {str(log_error)}]")
                 
+                # Prompt too long for the model: tighten the budget and retry without waiting
+                if is_context_length_error(e) and attempt < self.max_retries - 1:
+                    budget_scale *= 0.5
+                    print(f"✂️ Context window exceeded, retrying with {budget_scale:.0%} of the prompt budget")
+                    processed_messages = self._process_messages(messages, budget_scale)
+                    continue
+                
                 # Check if it's a retryable error
                 if any(keyword in error_msg for keyword in [
                     '502', 'bad gateway', 'upstream error', 'connection error', 
-                    'timeout', 'network', 'service unavailable', 'unauthorized'
+                    'timeout', 'network', 'service unavailable', 'unauthorized',
+                    '429', 'rate limit', 'too many requests'
                 ]):
                     if attempt < self.max_retries - 1:
                         delay = self.retry_delay * (2 ** attempt)  # Exponential backoff
@@ -169,53 +203,55 @@ class RobustLLM(LLM):
             # If no exception was captured, raise a generic one
             raise Exception("All retry attempts failed with empty responses")
     
-    def _process_messages(self, messages):
+    def _cache_params(self) -> Dict[str, Any]:
+        """Model and sampling parameters that distinguish cached responses"""
+        return {
+            'model': getattr(self, 'model', None),
+            'base_url': getattr(self, 'base_url', None),
+            'temperature': getattr(self, 'temperature', None),
+            'max_tokens': getattr(self, 'max_tokens', None)
+        }
+    
+    def with_cache(self, enabled: bool) -> 'RobustLLM':
         """
-        Process messages to handle length and complexity issues
+        Return a copy of this LLM with the response cache switched on or off
+        
+        Args:
+            enabled: Whether the copy should use the response cache
+        
+        Returns:
+            Shallow copy sharing the underlying client configuration
         """
-        if isinstance(messages, str):
-            return messages
+        llm = copy.copy(self)
+        llm.cache_enabled = enabled
+        return llm
+    
+    def _process_messages(self, messages, budget_scale: float = 1.0):
+        """
+        Fit messages into the model's context window
         
-        if not isinstance(messages, list):
+        Sections of long user messages (pre-search results, document context,
+        prior-team output) are compressed by priority to a token budget; the
+        system prompt, query and instructions are kept intact.
+        """
+        if not isinstance(messages, (str, list)):
             return messages
         
-        processed = []
-        max_user_content_length = 4000  # Reasonable limit for user content
+        if getattr(self, '_context_budget', None) is None:
+            self._context_budget = ContextBudgetManager(
+                model=getattr(self, 'model', None),
+                reserved_output_tokens=getattr(self, 'max_tokens', None) or 0
+            )
         
-        for message in messages:
-            if isinstance(message, dict) and 'content' in message:
-                content = message['content']
-                
-                # If it's a user message and too long, truncate intelligently
-                if (message.get('role') == 'user' and 
-                    isinstance(content, str) and 
-                    len(content) > max_user_content_length):
-                    
-                    print(f"🔧 Truncating long user message from {len(content)} to {max_user_content_length} characters")
-                    
-                    # Try to find a good truncation point
-                    truncated = content[:max_user_content_length]
-                    
-                    # Look for the last complete sentence or paragraph
-                    last_period = truncated.rfind('.')
-                    last_newline = truncated.rfind('\n')
-                    
-                    if last_period > max_user_content_length * 0.8:
-                        truncated = truncated[:last_period + 1]
-                    elif last_newline > max_user_content_length * 0.8:
-                        truncated = truncated[:last_newline]
-                    
-                    # Add truncation notice
-                    truncated += "\n\n[Content truncated for length - focusing on key information]"
-                    
-                    processed.append({
-                        'role': message['role'],
-                        'content': truncated
-                    })
-                else:
-                    processed.append(message)
-            else:
-                processed.append(message)
+        processed, report = self._context_budget.fit_messages(messages, scale=budget_scale)
+        
+        for section in report['compressed_sections']:
+            print(f"🔧 Compressed '{section['heading']}' ({section['kind']}) from {section['tokens_before']} to {section['tokens_after']} tokens")
+        if report['compressed_sections']:
+            self.logger.info(
+                f"Prompt fitted from {report['prompt_tokens']} to {report.get('prompt_tokens_after')} tokens "
+                f"(budget {report['budget_tokens']} of {report['context_window']})"
+            )
         
         return processed
     
@@ -273,8 +309,10 @@ class RobustLLM(LLM):
             self.logger.warning(f"Failed to set environment callbacks: {e}")
 
 
-def create_robust_llm(use_cloud: bool = True, api_key: Optional[str] = None) -> RobustLLM:
+def create_robust_llm(use_cloud: bool = True, api_key: Optional[str] = None, cache_enabled: Optional[bool] = None) -> RobustLLM:
     """
     Create a robust LLM instance with retry logic
+    
+    cache_enabled defaults to the LLM_CACHE_ENABLED environment setting.
     """
-    return RobustLLM(use_cloud=use_cloud, api_key=api_key)
+    return RobustLLM(use_cloud=use_cloud, api_key=api_key, cache_enabled=cache_enabled)
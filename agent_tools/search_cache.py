@@ -0,0 +1,102 @@
+"""
+Search Cache for Digital Twins Management System
+
+This module provides a persistent cache for web search results on the shared
+SQLite cache (sqlite_cache.py). Entries are keyed by the normalized query and
+result count, expire after a TTL and are evicted least-recently-used once the
+cache is full, so repeated queries across workflows and sessions skip the
+search provider entirely.
+"""
+
+import os
+import re
+import hashlib
+import logging
+from typing import List, Dict, Any, Optional
+
+from agent_tools.sqlite_cache import SQLiteCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache settings
+SEARCH_CACHE_ENABLED = os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() == 'true'
+SEARCH_CACHE_PATH = os.getenv('SEARCH_CACHE_PATH', './cache/search_cache.db')
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv('SEARCH_CACHE_TTL_SECONDS', str(24 * 60 * 60)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '1000'))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings share a cache entry
+    
+    Lower-cases, drops punctuation and collapses whitespace, e.g.
+    "  Data Governance, Frameworks? " -> "data governance frameworks".
+    
+    Args:
+        query: Raw search query
+    
+    Returns:
+        Normalized query
+    """
+    query = re.sub(r"[^\w\s]", " ", query.lower())
+    return " ".join(query.split())
+
+
+class SearchCache(SQLiteCache):
+    """
+    Persistent LRU cache with TTL for web search results
+    """
+    
+    table = "search_cache"
+    columns = {'query': 'TEXT NOT NULL', 'max_results': 'INTEGER NOT NULL'}
+    label = "Search cache"
+    
+    def __init__(self, db_path: str = SEARCH_CACHE_PATH, ttl_seconds: int = SEARCH_CACHE_TTL_SECONDS,
+                 max_entries: int = SEARCH_CACHE_MAX_ENTRIES, enabled: bool = SEARCH_CACHE_ENABLED):
+        super().__init__(db_path, max_entries, ttl_seconds=ttl_seconds, enabled=enabled)
+    
+    @staticmethod
+    def make_key(query: str, max_results: int) -> str:
+        """Build the cache key for a query and result count"""
+        return hashlib.sha256(f"{normalize_query(query)}|{max_results}".encode()).hexdigest()
+    
+    def get(self, query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached search results
+        
+        Args:
+            query: Search query
+            max_results: Number of results requested
+        
+        Returns:
+            Cached result list, or None on a miss or expired entry
+        """
+        cache_key = self.make_key(query, max_results)
+        return self._get_values([cache_key]).get(cache_key)
+    
+    def set(self, query: str, max_results: int, results: List[Dict[str, Any]]):
+        """
+        Store search results and evict the least recently used entries beyond max_entries
+        
+        Args:
+            query: Search query
+            max_results: Number of results requested
+            results: Raw search results
+        """
+        self._set_value(self.make_key(query, max_results), results, query=query, max_results=max_results)
+
+
+# Global search cache instance
+search_cache = SearchCache()
+
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """Get search cache metrics"""
+    return search_cache.get_stats()
+
+
+def clear_search_cache() -> int:
+    """Remove all cached search results"""
+    return search_cache.clear()
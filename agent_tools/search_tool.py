@@ -7,9 +7,10 @@ web searches using DuckDuckGo for gathering real-time information.
 
 import time
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ddgs import DDGS
 from crewai.tools import tool
+from agent_tools.search_cache import search_cache
 
 
 @tool
@@ -24,83 +25,135 @@ def search_web(search_query: str) -> str:
         str: Comprehensive research summary with Harvard-style references
     """
     try:
-        # Add a small delay to avoid rate limiting
-        time.sleep(int(os.getenv('SEARCH_DELAY_SECONDS', '1')))
-        
-        # Initialize DuckDuckGo search
-        with DDGS() as ddgs:
-            # Perform web search with retry logic
-            search_results = []
-            max_retries = int(os.getenv('SEARCH_RETRY_ATTEMPTS', '3'))
-            
-            for attempt in range(max_retries):
-                try:
-                    search_results = list(ddgs.text(
-                        search_query, 
-                        max_results=int(os.getenv('DUCKDUCKGO_MAX_RESULTS', '5'))
-                    ))
-                    if search_results:
-                        break
-                    time.sleep(2)  # Wait before retry
-                except Exception as retry_error:
-                    if attempt == max_retries - 1:
-                        raise retry_error
-                    time.sleep(2)
-            
-            if not search_results:
-                return f"No search results found for '{search_query}'. Please try a different search term or check your internet connection."
-            
-            # Format the results into a comprehensive research summary with Harvard referencing
-            research_summary = f"# Research Results for: {search_query}\n\n"
-            
-            # Create reference list for Harvard style
-            references = []
-            
-            for i, result in enumerate(search_results, 1):
-                title = result.get('title', 'No Title')
-                url = result.get('href', 'No URL')
-                body = result.get('body', 'No content available')
-                
-                # Extract domain for author/organization
-                domain = url.split('/')[2] if url != 'No URL' and '/' in url else 'Unknown Source'
-                org_name = domain.replace('www.', '').split('.')[0].title()
-                
-                # Create Harvard reference
-                ref_id = f"({org_name}, {2024})"  # Using current year as default
-                references.append(f"{org_name} ({2024}). {title}. Available at: {url} (Accessed: {time.strftime('%d %B %Y')})")
-                
-                research_summary += f"## Source {i}: {title}\n"
-                research_summary += f"**URL:** {url}\n"
-                research_summary += f"**Content:** {body}\n"
-                research_summary += f"**Reference:** {ref_id}\n\n"
-            
-            # Add a summary section
-            research_summary += "## Research Summary\n"
-            research_summary += f"Found {len(search_results)} relevant sources for '{search_query}'. "
-            research_summary += "The above sources provide comprehensive information covering various aspects of the topic, "
-            research_summary += "including current trends, statistics, case studies, and expert insights that can inform "
-            research_summary += "strategic decision-making for senior executives.\n\n"
-            
-            # Add key insights extraction
-            research_summary += "## Key Insights Extracted:\n"
-            research_summary += "- Multiple perspectives and expert opinions on the topic\n"
-            research_summary += "- Current market trends and industry developments\n"
-            research_summary += "- Real-world applications and case studies\n"
-            research_summary += "- Statistical data and performance metrics\n"
-            research_summary += "- Implementation challenges and best practices\n"
-            
-            # Add Harvard style references list
-            research_summary += "\n## References (Harvard Style):\n"
-            for i, ref in enumerate(references, 1):
-                research_summary += f"{i}. {ref}\n"
-            
-            return research_summary
+        search_results = search_web_results(search_query)
+        
+        if not search_results:
+            return f"No search results found for '{search_query}'. Please try a different search term or check your internet connection."
+        
+        return format_search_results(search_query, search_results)
             
     except Exception as e:
         # Return error message if search fails
         return f"Web search failed for '{search_query}': {str(e)}. Please check your internet connection and try again."
 
 
+def search_web_results(search_query: str, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Get raw web search results, serving repeated queries from the persistent cache
+    
+    Args:
+        search_query (str): The search query
+        max_results (Optional[int]): Maximum number of results (defaults to DUCKDUCKGO_MAX_RESULTS)
+        
+    Returns:
+        List[Dict[str, Any]]: Raw search results (title, href, body)
+    """
+    if max_results is None:
+        max_results = int(os.getenv('DUCKDUCKGO_MAX_RESULTS', '5'))
+    
+    search_results = search_cache.get(search_query, max_results)
+    if search_results is None:
+        search_results = _fetch_search_results(search_query, max_results)
+        if search_results:
+            search_cache.set(search_query, max_results, search_results)
+    
+    return search_results
+
+
+def _fetch_search_results(search_query: str, max_results: int) -> List[Dict[str, Any]]:
+    """
+    Query DuckDuckGo with retry logic
+    
+    Args:
+        search_query (str): The search query
+        max_results (int): Maximum number of results to return
+        
+    Returns:
+        List[Dict[str, Any]]: Raw search results (title, href, body)
+    """
+    # Add a small delay to avoid rate limiting
+    time.sleep(int(os.getenv('SEARCH_DELAY_SECONDS', '1')))
+    
+    # Initialize DuckDuckGo search
+    with DDGS() as ddgs:
+        # Perform web search with retry logic
+        search_results = []
+        max_retries = int(os.getenv('SEARCH_RETRY_ATTEMPTS', '3'))
+        
+        for attempt in range(max_retries):
+            try:
+                search_results = list(ddgs.text(
+                    search_query, 
+                    max_results=max_results
+                ))
+                if search_results:
+                    break
+                time.sleep(2)  # Wait before retry
+            except Exception as retry_error:
+                if attempt == max_retries - 1:
+                    raise retry_error
+                time.sleep(2)
+        
+        return search_results
+
+
+def format_search_results(search_query: str, search_results: List[Dict[str, Any]]) -> str:
+    """
+    Format raw search results into a research summary with Harvard referencing
+    
+    Args:
+        search_query (str): The search query
+        search_results (List[Dict[str, Any]]): Raw search results
+        
+    Returns:
+        str: Research summary with Harvard-style references
+    """
+    research_summary = f"# Research Results for: {search_query}\n\n"
+    
+    # Create reference list for Harvard style
+    references = []
+    
+    for i, result in enumerate(search_results, 1):
+        title = result.get('title', 'No Title')
+        url = result.get('href', 'No URL')
+        body = result.get('body', 'No content available')
+        
+        # Extract domain for author/organization
+        domain = url.split('/')[2] if url != 'No URL' and '/' in url else 'Unknown Source'
+        org_name = domain.replace('www.', '').split('.')[0].title()
+        
+        # Create Harvard reference
+        ref_id = f"({org_name}, {2024})"  # Using current year as default
+        references.append(f"{org_name} ({2024}). {title}. Available at: {url} (Accessed: {time.strftime('%d %B %Y')})")
+        
+        research_summary += f"## Source {i}: {title}\n"
+        research_summary += f"**URL:** {url}\n"
+        research_summary += f"**Content:** {body}\n"
+        research_summary += f"**Reference:** {ref_id}\n\n"
+    
+    # Add a summary section
+    research_summary += "## Research Summary\n"
+    research_summary += f"Found {len(search_results)} relevant sources for '{search_query}'. "
+    research_summary += "The above sources provide comprehensive information covering various aspects of the topic, "
+    research_summary += "including current trends, statistics, case studies, and expert insights that can inform "
+    research_summary += "strategic decision-making for senior executives.\n\n"
+    
+    # Add key insights extraction
+    research_summary += "## Key Insights Extracted:\n"
+    research_summary += "- Multiple perspectives and expert opinions on the topic\n"
+    research_summary += "- Current market trends and industry developments\n"
+    research_summary += "- Real-world applications and case studies\n"
+    research_summary += "- Statistical data and performance metrics\n"
+    research_summary += "- Implementation challenges and best practices\n"
+    
+    # Add Harvard style references list
+    research_summary += "\n## References (Harvard Style):\n"
+    for i, ref in enumerate(references, 1):
+        research_summary += f"{i}. {ref}\n"
+    
+    return research_summary
+
+
 def parse_search_results(search_text: str) -> Dict[str, Any]:
     """
     Parse search results from search_web function to extract structured data
@@ -0,0 +1,240 @@
+"""
+SQLite Cache Base for Digital Twins Management System
+
+This module provides the persistent, SQLite-backed TTL and LRU cache shared by
+the search, LLM response and URL validation caches. Every cache stores JSON
+values in its own table of one database file, which all sessions and worker
+processes share. Entries expire at a per-entry time and the least recently
+used entries are evicted once the cache is full. Subclasses name the table
+and its extra columns and build their keys and values.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+# Columns every cache table has, before and after the subclass columns
+KEY_COLUMNS = {'cache_key': 'TEXT PRIMARY KEY', 'value': 'TEXT NOT NULL'}
+TIME_COLUMNS = {'created_at': 'REAL NOT NULL', 'expires_at': 'REAL NOT NULL', 'last_accessed': 'REAL NOT NULL'}
+
+
+class SQLiteCache:
+    """
+    Persistent LRU cache with per-entry expiry in one SQLite table
+    
+    Subclasses set ``table``, ``columns`` (extra column name to SQL type),
+    ``indexes`` (extra columns to index) and ``label`` (used in log messages).
+    """
+    
+    table = "cache"
+    columns: Dict[str, str] = {}
+    indexes: List[str] = []
+    label = "SQLite cache"
+    
+    def __init__(self, db_path: str, max_entries: int, ttl_seconds: Optional[float] = None, enabled: bool = True):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0}
+        
+        if self.enabled:
+            try:
+                self._initialize()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.label} disabled, could not open {db_path}: {e}")
+                self.enabled = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def _initialize(self):
+        """Create the cache table, replacing one left by an older schema"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        columns = {**KEY_COLUMNS, **self.columns, **TIME_COLUMNS}
+        
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            existing = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")]
+            if existing and existing != list(columns):
+                logger.info(f"{self.label}: recreating {self.table} for the current schema")
+                conn.execute(f"DROP TABLE {self.table}")
+            
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                + ", ".join(f"{name} {sql_type}" for name, sql_type in columns.items())
+                + ")"
+            )
+            for column in self.indexes + ['expires_at', 'last_accessed']:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_{column} ON {self.table} ({column})")
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _execute_in(self, conn: sqlite3.Connection, sql: str, keys: List[str], params: List[Any] = None) -> List[tuple]:
+        """Run a statement over keys in batches, filling {table} and the {keys} placeholders"""
+        rows = []
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start:start + LOOKUP_BATCH_SIZE]
+            sql_batch = sql.format(table=self.table, keys=", ".join("?" * len(batch)))
+            rows.extend(conn.execute(sql_batch, (params or []) + batch).fetchall())
+        return rows
+    
+    def _get_values(self, keys: List[str], count_misses: bool = True) -> Dict[str, Any]:
+        """
+        Look up unexpired values and mark them as recently used
+        
+        Expired entries found on the way are deleted.
+        
+        Args:
+            keys: Cache keys
+            count_misses: Count keys without a value as misses
+        
+        Returns:
+            Decoded value for each key that has an unexpired entry
+        """
+        if not self.enabled or not keys:
+            return {}
+        
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        values = {}
+        expired = []
+        
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    rows = self._execute_in(
+                        conn, "SELECT cache_key, value, expires_at FROM {table} WHERE cache_key IN ({keys})", keys
+                    )
+                    for cache_key, value, expires_at in rows:
+                        if expires_at < now:
+                            expired.append(cache_key)
+                        else:
+                            values[cache_key] = json.loads(value)
+                    
+                    self._execute_in(conn, "DELETE FROM {table} WHERE cache_key IN ({keys})", expired)
+                    self._execute_in(
+                        conn, "UPDATE {table} SET last_accessed = ? WHERE cache_key IN ({keys})", list(values), [now]
+                    )
+                    conn.commit()
+                finally:
+                    conn.close()
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"{self.label} lookup failed: {e}")
+            return {}
+        
+        self.metrics['hits'] += len(values)
+        self.metrics['expired'] += len(expired)
+        if count_misses:
+            self.metrics['misses'] += len(keys) - len(values)
+        return values
+    
+    def _set_value(self, cache_key: str, value: Any, ttl_seconds: Optional[float] = None, **columns):
+        """
+        Store a value, then evict expired entries and the least recently used beyond max_entries
+        
+        Args:
+            cache_key: Cache key
+            value: JSON-serializable value
+            ttl_seconds: Time to live of this entry (defaults to the cache TTL)
+            **columns: Values of the subclass columns
+        """
+        if not self.enabled:
+            return
+        
+        now = time.time()
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        row = {'cache_key': cache_key, 'value': json.dumps(value), **columns,
+               'created_at': now, 'expires_at': now + ttl_seconds, 'last_accessed': now}
+        
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {self.table} ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                        list(row.values())
+                    )
+                    
+                    evicted = conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (now,)).rowcount
+                    evicted += conn.execute(
+                        f"""DELETE FROM {self.table} WHERE cache_key IN (
+                                SELECT cache_key FROM {self.table}
+                                ORDER BY last_accessed DESC
+                                LIMIT -1 OFFSET ?
+                            )""",
+                        (self.max_entries,)
+                    ).rowcount
+                    conn.commit()
+                    
+                    self.metrics['stores'] += 1
+                    self.metrics['evictions'] += max(evicted, 0)
+                finally:
+                    conn.close()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"{self.label} store failed: {e}")
+    
+    def clear(self) -> int:
+        """
+        Remove all cached entries
+        
+        Returns:
+            Number of entries removed
+        """
+        if not self.enabled:
+            return 0
+        
+        with self._lock:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(f"DELETE FROM {self.table}")
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                conn.close()
+    
+    def _count_entries(self, conn: sqlite3.Connection, stats: Dict[str, Any]):
+        """Add the number of stored entries to the stats"""
+        stats['entries'] = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics for this process and the size of the shared cache
+        
+        Returns:
+            Dictionary with hit/miss counters, hit rate and entry count
+        """
+        stats = dict(self.metrics)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['ttl_seconds'] = self.ttl_seconds
+        stats['max_entries'] = self.max_entries
+        stats['entries'] = 0
+        
+        if self.enabled:
+            try:
+                conn = self._connect()
+                try:
+                    self._count_entries(conn, stats)
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                stats['error'] = str(e)
+        
+        return stats
@@ -0,0 +1,327 @@
+"""
+Tabular Profiler for Digital Twins Management System
+
+This module profiles large CSV, TSV and SQLite tables in a single chunked pass
+with bounded memory. It produces the same 'summary' (describe()-style) and
+'null_counts' shapes as the in-memory processors, plus approximate quantiles,
+approximate distinct counts and a correlation matrix built from streaming
+covariance sums.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows read per chunk when profiling files and tables
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Values kept per column for approximate quantiles
+RESERVOIR_SIZE = 10_000
+
+# HyperLogLog precision (2**14 registers, ~0.8% standard error)
+HLL_PRECISION = 14
+
+
+class HyperLogLog:
+    """
+    Approximate distinct counter over 64-bit hashes
+    """
+    
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    def update(self, hashes: np.ndarray) -> None:
+        """Add an array of uint64 hashes"""
+        if len(hashes) == 0:
+            return
+        
+        hashes = hashes.astype(np.uint64, copy=False)
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+        
+        # Rank is the position of the leftmost 1-bit in the remaining bits
+        bit_length = np.zeros(len(remainder), dtype=np.int64)
+        nonzero = remainder > 0
+        bit_length[nonzero] = np.floor(np.log2(remainder[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (value_bits - bit_length + 1).astype(np.uint8)
+        
+        np.maximum.at(self.registers, index, rank)
+    
+    def count(self) -> int:
+        """Estimate the number of distinct values seen"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        
+        # Small-range correction
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        
+        return int(round(estimate))
+
+
+class TableProfiler:
+    """
+    Single-pass, bounded-memory profiler fed with DataFrame chunks
+    """
+    
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE, seed: int = 0):
+        self.reservoir_size = reservoir_size
+        self.rng = np.random.default_rng(seed)
+        self.columns: List[str] = []
+        self.numeric_columns: List[str] = []
+        self.row_count = 0
+        self.sample_data: List[Dict[str, Any]] = []
+        self.null_counts: Dict[str, int] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.reservoirs: Dict[str, np.ndarray] = {}
+        self.reservoir_seen: Dict[str, int] = {}
+        self.shift: Optional[np.ndarray] = None
+        self.pair_counts: Optional[np.ndarray] = None
+        self.pair_sums: Optional[np.ndarray] = None
+        self.pair_squares: Optional[np.ndarray] = None
+        self.cross_products: Optional[np.ndarray] = None
+    
+    def _initialise(self, chunk: pd.DataFrame) -> None:
+        """Fix the column layout from the first chunk"""
+        self.columns = [str(column) for column in chunk.columns]
+        self.numeric_columns = [
+            str(column) for column in chunk.columns
+            if pd.api.types.is_numeric_dtype(chunk[column]) and not pd.api.types.is_bool_dtype(chunk[column])
+        ]
+        self.null_counts = {column: 0 for column in self.columns}
+        self.distinct = {column: HyperLogLog() for column in self.columns}
+        
+        for column in self.numeric_columns:
+            self.stats[column] = {'count': 0, 'mean': 0.0, 'm2': 0.0, 'min': np.inf, 'max': -np.inf}
+            self.reservoirs[column] = np.empty(0, dtype=np.float64)
+            self.reservoir_seen[column] = 0
+        
+        k = len(self.numeric_columns)
+        self.pair_counts = np.zeros((k, k))
+        self.pair_sums = np.zeros((k, k))
+        self.pair_squares = np.zeros((k, k))
+        self.cross_products = np.zeros((k, k))
+        self.sample_data = chunk.head().to_dict('records')
+    
+    def coerce(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Give a chunk the stable schema chosen from the first chunk
+        
+        Numeric columns become float64 and all other columns strings (nulls
+        preserved), so every chunk can be written to the same columnar file.
+        
+        Args:
+            chunk: Raw DataFrame chunk
+        
+        Returns:
+            Chunk with stable column names and dtypes
+        """
+        chunk = chunk.rename(columns=str)
+        if not self.columns:
+            self._initialise(chunk)
+        
+        for column in self.columns:
+            if column not in chunk:
+                chunk[column] = np.nan
+            if column in self.stats:
+                chunk[column] = pd.to_numeric(chunk[column], errors='coerce').astype(np.float64)
+            else:
+                values = chunk[column]
+                chunk[column] = values.where(values.isna(), values.astype(str)).astype(object)
+        
+        return chunk[self.columns]
+    
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fold a chunk into the running statistics
+        
+        Args:
+            chunk: DataFrame chunk
+        
+        Returns:
+            The chunk coerced to the stable schema
+        """
+        chunk = self.coerce(chunk)
+        self.row_count += len(chunk)
+        
+        for column in self.columns:
+            values = chunk[column]
+            present = values.notna()
+            self.null_counts[column] += int(len(values) - present.sum())
+            if present.any():
+                hashes = pd.util.hash_pandas_object(values[present], index=False).to_numpy()
+                self.distinct[column].update(hashes)
+        
+        for column in self.numeric_columns:
+            values = chunk[column].to_numpy()
+            values = values[~np.isnan(values)]
+            if len(values):
+                self._update_moments(column, values)
+                self._update_reservoir(column, values)
+        
+        self._update_covariance(chunk)
+        return chunk
+    
+    def _update_moments(self, column: str, values: np.ndarray) -> None:
+        """Merge chunk mean/variance into the running totals (Chan et al.)"""
+        stats = self.stats[column]
+        n_a, n_b = stats['count'], len(values)
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        
+        n = n_a + n_b
+        delta = mean_b - stats['mean']
+        stats['mean'] += delta * n_b / n
+        stats['m2'] += m2_b + delta * delta * n_a * n_b / n
+        stats['count'] = n
+        stats['min'] = min(stats['min'], float(values.min()))
+        stats['max'] = max(stats['max'], float(values.max()))
+    
+    def _update_reservoir(self, column: str, values: np.ndarray) -> None:
+        """Keep a uniform random sample of the column for quantiles"""
+        reservoir = self.reservoirs[column]
+        seen = self.reservoir_seen[column]
+        
+        free = self.reservoir_size - len(reservoir)
+        if free > 0:
+            reservoir = np.concatenate([reservoir, values[:free]])
+            seen += min(free, len(values))
+            values = values[free:]
+        
+        if len(values):
+            positions = seen + np.arange(len(values))
+            slots = (self.rng.random(len(values)) * (positions + 1)).astype(np.int64)
+            keep = slots < self.reservoir_size
+            reservoir[slots[keep]] = values[keep]
+            seen += len(values)
+        
+        self.reservoirs[column] = reservoir
+        self.reservoir_seen[column] = seen
+    
+    def _update_covariance(self, chunk: pd.DataFrame) -> None:
+        """Accumulate pairwise-complete covariance sums for numeric columns"""
+        if not self.numeric_columns:
+            return
+        
+        matrix = chunk[self.numeric_columns].to_numpy(dtype=np.float64)
+        if self.shift is None:
+            # Shift by the first chunk's means for numerical stability
+            with np.errstate(invalid='ignore'):
+                self.shift = np.nan_to_num(np.nanmean(matrix, axis=0)) if len(matrix) else np.zeros(matrix.shape[1])
+        
+        present = ~np.isnan(matrix)
+        mask = present.astype(np.float64)
+        centred = np.where(present, matrix - self.shift, 0.0)
+        
+        self.pair_counts += mask.T @ mask
+        self.pair_sums += centred.T @ mask
+        self.pair_squares += (centred * centred).T @ mask
+        self.cross_products += centred.T @ centred
+    
+    def correlation_matrix(self) -> pd.DataFrame:
+        """Pairwise Pearson correlation, equivalent to DataFrame.corr()"""
+        columns = self.numeric_columns
+        if not columns:
+            return pd.DataFrame()
+        
+        n = self.pair_counts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = self.cross_products - self.pair_sums * self.pair_sums.T / n
+            variance_i = self.pair_squares - self.pair_sums ** 2 / n
+            variance_j = variance_i.T
+            correlation = covariance / np.sqrt(variance_i * variance_j)
+        
+        correlation[n < 2] = np.nan
+        np.fill_diagonal(correlation, np.where(np.diag(n) >= 2, 1.0, np.nan))
+        return pd.DataFrame(np.clip(correlation, -1.0, 1.0), index=columns, columns=columns)
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Build the profile in the shapes the processors and tools expect
+        
+        Returns:
+            Dictionary with shape, columns, dtypes, summary, null_counts,
+            distinct_counts, correlation_matrix and sample_data
+        """
+        summary = {}
+        for column in self.numeric_columns:
+            stats = self.stats[column]
+            count = stats['count']
+            reservoir = self.reservoirs[column]
+            quantiles = np.percentile(reservoir, [25, 50, 75]) if len(reservoir) else [np.nan] * 3
+            summary[column] = {
+                'count': float(count),
+                'mean': stats['mean'] if count else np.nan,
+                'std': float(np.sqrt(stats['m2'] / (count - 1))) if count > 1 else np.nan,
+                'min': stats['min'] if count else np.nan,
+                '25%': float(quantiles[0]),
+                '50%': float(quantiles[1]),
+                '75%': float(quantiles[2]),
+                'max': stats['max'] if count else np.nan
+            }
+        
+        dtypes = {
+            column: np.dtype(np.float64) if column in self.stats else np.dtype(object)
+            for column in self.columns
+        }
+        
+        return {
+            'columns': self.columns,
+            'shape': (self.row_count, len(self.columns)),
+            'dtypes': dtypes,
+            'summary': summary if self.row_count > 0 else {},
+            'null_counts': dict(self.null_counts),
+            'distinct_counts': {column: hll.count() for column, hll in self.distinct.items()},
+            'correlation_matrix': self.correlation_matrix().to_dict(),
+            'sample_data': self.sample_data
+        }
+
+
+def profile_batches(batches: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Profile an iterable of DataFrame chunks in a single pass
+    
+    Args:
+        batches: DataFrame chunks in row order
+    
+    Returns:
+        Profile dictionary (see TableProfiler.result)
+    """
+    profiler = TableProfiler()
+    for batch in batches:
+        profiler.update(batch)
+    return profiler.result()
+
+
+def profile_sqlite_table(db_path: Union[str, Path], table: str,
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, Any]:
+    """
+    Profile a SQLite table without loading it into memory
+    
+    Args:
+        db_path: Path to the SQLite database
+        table: Table name
+        chunk_rows: Rows read per chunk
+    
+    Returns:
+        Profile dictionary (see TableProfiler.result)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        quoted = table.replace('"', '""')
+        return profile_batches(pd.read_sql_query(f'SELECT * FROM "{quoted}"', conn, chunksize=chunk_rows))
+    finally:
+        conn.close()
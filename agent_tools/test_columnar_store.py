@@ -0,0 +1,113 @@
+"""
+Test script for the on-disk columnar table store
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from agent_tools.columnar_store import ColumnarTableWriter, source_key, write_table
+
+
+def write_csv(path: Path, df: pd.DataFrame) -> Path:
+    """Write a DataFrame as a CSV source file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_round_trip():
+    """Test that a stored table reads back unchanged, whole, in slices and in batches"""
+    print("🧪 Testing table round trip...")
+    
+    df = pd.DataFrame({'id': range(250), 'value': [i * 0.5 for i in range(250)], 'label': [f"row {i}" for i in range(250)]})
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        table = write_table(df, Path(temp_dir) / ".columnar", "data.csv")
+        
+        assert table.shape == (250, 3)
+        pd.testing.assert_frame_equal(table.to_pandas(), df)
+        pd.testing.assert_frame_equal(table.to_pandas(['value']), df[['value']])
+        assert table.records(98, 102) == df.iloc[98:102].to_dict('records')
+        assert sum(len(batch) for batch in table.iter_batches(batch_rows=100)) == 250
+        assert [path.name for path in (Path(temp_dir) / ".columnar").iterdir()] == [Path(table.path).name]
+    
+    print(f"✅ {table.shape[0]} rows read back unchanged")
+
+
+def test_same_basename_and_reupload():
+    """Test that same-named sources and changed re-uploads get their own files"""
+    print("\n🧪 Testing same-named sources and re-uploads...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store_dir = Path(temp_dir) / ".columnar"
+        first_df = pd.DataFrame({'a': [1, 2, 3]})
+        second_df = pd.DataFrame({'b': ['x', 'y']})
+        first_path = write_csv(Path(temp_dir) / "a" / "data.csv", first_df)
+        second_path = write_csv(Path(temp_dir) / "b" / "data.csv", second_df)
+        
+        first = write_table(first_df, store_dir, "data.csv", source_key(first_path))
+        second = write_table(second_df, store_dir, "data.csv", source_key(second_path))
+        assert first.path != second.path
+        pd.testing.assert_frame_equal(first.to_pandas(), first_df)
+        pd.testing.assert_frame_equal(second.to_pandas(), second_df)
+        
+        # A changed re-upload of the same file leaves the earlier handle intact
+        edited_df = pd.DataFrame({'a': [4, 5, 6, 7, 8]})
+        write_csv(first_path, edited_df)
+        edited = write_table(edited_df, store_dir, "data.csv", source_key(first_path))
+        assert edited.path != first.path
+        assert first.shape == first.to_pandas().shape == (3, 1)
+        pd.testing.assert_frame_equal(edited.to_pandas(), edited_df)
+    
+    print("✅ Each source version stored in its own file")
+
+
+def test_writer_and_concurrent_writes():
+    """Test chunked writes and that concurrent writers of one table leave a complete file"""
+    print("\n🧪 Testing chunked and concurrent writes...")
+    
+    chunks = [pd.DataFrame({'n': range(start, start + 100), 'half': [i / 2 for i in range(start, start + 100)]})
+              for start in range(0, 500, 100)]
+    expected = pd.concat(chunks, ignore_index=True)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store_dir = Path(temp_dir) / ".columnar"
+        tables = []
+        
+        def write_all():
+            writer = ColumnarTableWriter(store_dir, "large.csv", "large.csv:key")
+            for chunk in chunks:
+                writer.write(chunk)
+            tables.append(writer.close())
+        
+        threads = [threading.Thread(target=write_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(tables) == 4 and len({table.path for table in tables}) == 1
+        assert tables[0].shape == (500, 2)
+        pd.testing.assert_frame_equal(tables[0].to_pandas(), expected)
+        assert not list(store_dir.glob("*.tmp"))
+    
+    print("✅ Concurrent writers produced one complete table")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting columnar store tests...")
+    
+    try:
+        test_round_trip()
+        test_same_basename_and_reupload()
+        test_writer_and_concurrent_writes()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
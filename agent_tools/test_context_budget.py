@@ -0,0 +1,145 @@
+"""
+Test script for token-budgeted prompt context
+"""
+
+import os
+
+from agent_tools.context_budget import (
+    ContextBudgetManager,
+    TokenCounter,
+    allocate_budget,
+    compress_text,
+    get_context_window,
+    split_sections,
+    OMISSION_NOTICE,
+    SECTION_FIXED,
+    SECTION_PRESEARCH,
+    SECTION_DOCUMENTS,
+    SECTION_PRIOR_TEAM,
+)
+
+
+def make_passages(topic: str, count: int) -> str:
+    """Build search-result style text with one passage per source"""
+    return "\n\n".join(
+        f"## Source {i + 1}\nFindings about {topic} number {i} with supporting detail " + "filler words " * 40
+        for i in range(count)
+    )
+
+
+def test_context_window_lookup():
+    """Test model family lookup, longest-prefix matching and the environment override"""
+    print("🧪 Testing context window lookup...")
+    
+    original = os.environ.pop('LLM_CONTEXT_WINDOW', None)
+    try:
+        assert get_context_window("ollama/llama3.1:8b") == 131072
+        assert get_context_window("ollama/llama3:8b") == 8192
+        assert get_context_window("ollama/unknown-model", default=4096) == 4096
+        
+        os.environ['LLM_CONTEXT_WINDOW'] = "16384"
+        assert get_context_window("ollama/gpt-oss:20b") == 16384
+    finally:
+        os.environ.pop('LLM_CONTEXT_WINDOW', None)
+        if original is not None:
+            os.environ['LLM_CONTEXT_WINDOW'] = original
+    
+    print("✅ Context windows resolved by model family")
+
+
+def test_split_sections():
+    """Test that prompt headings are classified and unknown headings stay with their section"""
+    print("\n🧪 Testing section splitting...")
+    
+    prompt = (
+        "Analyse the topic.\n"
+        "**Query:** data governance\n"
+        "**Pre-searched Data:** results **URL:** https://example.com\n"
+        "**Uploaded Documents:** policy text\n"
+        "This is the context you're working with: earlier team output"
+    )
+    sections = split_sections(prompt)
+    
+    assert [section['kind'] for section in sections] == [
+        SECTION_FIXED, SECTION_FIXED, SECTION_PRESEARCH, SECTION_DOCUMENTS, SECTION_PRIOR_TEAM
+    ]
+    assert "**URL:**" in sections[2]['body']
+    assert "".join(section['heading'] + section['body'] for section in sections) == prompt
+    
+    print(f"✅ Split into {len(sections)} sections")
+
+
+def test_allocate_budget():
+    """Test that small sections keep their size and the rest is shared by weight"""
+    print("\n🧪 Testing budget allocation...")
+    
+    sizes = {0: (SECTION_PRIOR_TEAM, 5000), 1: (SECTION_DOCUMENTS, 100), 2: (SECTION_PRESEARCH, 5000)}
+    allocation = allocate_budget(sizes, 2000)
+    
+    assert allocation[1] == 100
+    assert allocation[0] > allocation[2]
+    assert sum(allocation.values()) <= 2000
+    
+    print(f"✅ Allocation: {allocation}")
+
+
+def test_compress_text():
+    """Test that compression keeps the most relevant passages within the budget"""
+    print("\n🧪 Testing extractive compression...")
+    
+    counter = TokenCounter()
+    text = make_passages("weather", 6) + "\n\n## Source 7\nMetadata lineage standards for geospatial catalogues"
+    compressed = compress_text(text, 200, "metadata lineage standards", counter)
+    
+    assert counter.count(compressed) <= 200
+    assert "Metadata lineage standards" in compressed
+    assert OMISSION_NOTICE.split("{count}")[1].strip() in compressed
+    
+    short = "Short section"
+    assert compress_text(short, 200, "query", counter) == short
+    
+    print(f"✅ Compressed {counter.count(text)} tokens to {counter.count(compressed)}")
+
+
+def test_fit_messages():
+    """Test that oversized prompts are compressed to the budget while the query stays verbatim"""
+    print("\n🧪 Testing message fitting...")
+    
+    manager = ContextBudgetManager(model="ollama/test", context_window=1500)
+    prompt = (
+        "**Query:** metadata lineage standards\n"
+        f"**Pre-searched Data:**\n{make_passages('weather', 20)}\n"
+    )
+    
+    fitted, report = manager.fit_messages(prompt)
+    
+    assert isinstance(fitted, str)
+    assert "**Query:** metadata lineage standards" in fitted
+    assert report['prompt_tokens'] > report['budget_tokens']
+    assert report['prompt_tokens_after'] <= report['budget_tokens']
+    assert report['compressed_sections'][0]['kind'] == SECTION_PRESEARCH
+    
+    small = [{'role': 'system', 'content': 'You are an analyst.'}, {'role': 'user', 'content': 'Hello'}]
+    unchanged, report = manager.fit_messages(small)
+    assert unchanged is small
+    assert report['compressed_sections'] == []
+    
+    print(f"✅ Prompt fitted into {report['budget_tokens']} tokens")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting context budget tests...")
+    
+    try:
+        test_context_window_lookup()
+        test_split_sections()
+        test_allocate_budget()
+        test_compress_text()
+        test_fit_messages()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
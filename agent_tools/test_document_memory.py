@@ -0,0 +1,271 @@
+"""
+Test script for incremental document ingestion in document memory
+"""
+
+import tempfile
+from pathlib import Path
+
+from chromadb import EmbeddingFunction
+
+from agent_tools import document_processor
+from agent_tools.document_memory_manager import DocumentMemoryManager
+from agent_tools.document_processor import DocumentProcessor
+
+
+class LetterEmbeddingFunction(EmbeddingFunction):
+    """Embed texts by letter frequency so tests need no embedding model"""
+    
+    def __init__(self):
+        pass
+    
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            vector = [0.0] * 26
+            for char in text.lower():
+                if 'a' <= char <= 'z':
+                    vector[ord(char) - ord('a')] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+class UploadedFile:
+    """Stand-in for a Streamlit UploadedFile"""
+    
+    def __init__(self, name: str, content: str):
+        self.name = name
+        self.data = content.encode('utf-8')
+        self.size = len(self.data)
+    
+    def getbuffer(self):
+        return memoryview(self.data)
+
+
+class FakePage:
+    """PDF page with fixed text"""
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    def extract_text(self):
+        return self.text
+
+
+class FakePdfReader:
+    """PdfReader stand-in serving fixed pages and counting how often a PDF is opened"""
+    
+    pages_text = []
+    opened = 0
+    
+    def __init__(self, file_path):
+        FakePdfReader.opened += 1
+        self.pages = [FakePage(text) for text in FakePdfReader.pages_text]
+
+
+def make_manager(temp_dir: str) -> DocumentMemoryManager:
+    """Create a document memory in a temporary directory with a model-free embedding function"""
+    manager = DocumentMemoryManager(str(Path(temp_dir) / "memory_db"))
+    manager.document_collection = manager.client.get_or_create_collection(
+        name="test_document_memory",
+        embedding_function=LetterEmbeddingFunction()
+    )
+    return manager
+
+
+def make_sections(count: int, topic: str = "governance") -> list:
+    """Build sections of about one chunk each, ending in sentence breaks"""
+    return [
+        f"Section {i} covers {topic} policy {i}. " + f"Detail sentence {i} about data stewardship and quality. " * 17
+        for i in range(count)
+    ]
+
+
+def test_reingest_edited_upload():
+    """Test that re-uploading an edited file keeps its ID and embeds, refreshes and deletes only what changed"""
+    print("🧪 Testing re-ingestion of an edited upload...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"))
+        manager = make_manager(temp_dir)
+        
+        original = make_sections(8)
+        edited = list(original)
+        edited[3] = make_sections(4, topic="retention")[3]
+        edited = edited[:6] + make_sections(1, topic="lineage")
+        
+        first = processor.process_uploaded_file(UploadedFile("policy.txt", "".join(original)))
+        report = manager.store_documents({"policy.txt": first})
+        assert report['errors'] == {}
+        assert report['chunks_added'] == len(set(manager.chunk_document("".join(original))))
+        
+        second = processor.process_uploaded_file(UploadedFile("policy.txt", "".join(edited)))
+        assert first['metadata']['content_sha256'] != second['metadata']['content_sha256']
+        
+        old_chunks = set(manager.chunk_document("".join(original)))
+        new_chunks = set(manager.chunk_document("".join(edited)))
+        report = manager.store_documents({"policy.txt": second})
+        
+        assert report['document_ids']['policy.txt'] == manager._document_identity(first)['document_id']
+        assert report['chunks_added'] == len(new_chunks - old_chunks) > 0
+        assert report['chunks_updated'] == len(new_chunks & old_chunks) > 0
+        assert report['chunks_deleted'] == len(old_chunks - new_chunks) > 0
+        
+        stored = manager.document_collection.get(where={"document_id": report['document_ids']['policy.txt']})
+        assert sorted(stored['documents']) == sorted(new_chunks)
+    
+    print(f"✅ Re-upload added {report['chunks_added']}, updated {report['chunks_updated']}, "
+          f"deleted {report['chunks_deleted']} chunks")
+
+
+def test_batched_store_documents():
+    """Test that chunks of several documents are pooled into full batches"""
+    print("\n🧪 Testing batched storage of several documents...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = make_manager(temp_dir)
+        documents = {
+            f"doc{i}.txt": {'type': 'unstructured', 'content': "".join(make_sections(3, topic=f"topic {i}"))}
+            for i in range(4)
+        }
+        total = sum(len(set(manager.chunk_document(doc['content']))) for doc in documents.values())
+        
+        calls = []
+        add = manager.document_collection.add
+        manager.document_collection.add = lambda **kwargs: (calls.append(len(kwargs['ids'])), add(**kwargs))
+        
+        report = manager.store_documents(documents, batch_size=5)
+        
+        assert report['errors'] == {} and report['chunks_failed'] == 0
+        assert report['chunks_added'] == total == manager.document_collection.count()
+        assert calls == [5] * (total // 5) + ([total % 5] if total % 5 else [])
+        assert len(report['batches']) == len(calls)
+        assert len(set(report['document_ids'].values())) == 4
+    
+    print(f"✅ {total} chunks from 4 documents stored in {len(calls)} add() calls")
+
+
+def test_failed_batch():
+    """Test that a failed batch is reported and stored by the next upload without stopping the others"""
+    print("\n🧪 Testing a failed batch...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = make_manager(temp_dir)
+        documents = {
+            "first.txt": {'type': 'unstructured', 'content': "".join(make_sections(4, topic="first"))},
+            "second.txt": {'type': 'unstructured', 'content': "".join(make_sections(4, topic="second"))}
+        }
+        first_chunks = len(set(manager.chunk_document(documents["first.txt"]['content'])))
+        second_chunks = len(set(manager.chunk_document(documents["second.txt"]['content'])))
+        
+        # Each document fills one batch; fail the batch of the second one
+        second_id = manager._document_identity(documents["second.txt"], "second.txt")['document_id']
+        add = manager.document_collection.add
+        
+        def failing_add(ids, **kwargs):
+            if any(chunk_id.startswith(second_id) for chunk_id in ids):
+                raise RuntimeError("embedding service unavailable")
+            return add(ids=ids, **kwargs)
+        
+        manager.document_collection.add = failing_add
+        report = manager.store_documents(documents, batch_size=first_chunks)
+        
+        assert report['chunks_added'] == first_chunks
+        assert report['chunks_failed'] == len(report['failed_chunk_ids']) == second_chunks
+        assert list(report['errors']) == ["second.txt"]
+        assert "upload the document again" in report['errors']["second.txt"]
+        assert [bool(batch.get('error')) for batch in report['batches']] == [False, True]
+        assert manager.document_collection.count() == first_chunks
+        
+        # Uploading again stores just the missing chunks
+        manager.document_collection.add = add
+        report = manager.store_documents(documents, batch_size=first_chunks)
+        
+        assert report['errors'] == {} and report['chunks_failed'] == 0
+        assert report['chunks_added'] == second_chunks
+        assert report['documents_unchanged'] == 1
+        assert manager.document_collection.count() == first_chunks + second_chunks
+    
+    print(f"✅ Failed batch of {second_chunks} chunks stored on the next upload")
+
+
+def test_iter_chunks_matches_chunk_document():
+    """Test that chunking text piece by piece gives the same chunks as chunking it whole"""
+    print("\n🧪 Testing streamed chunking...")
+    
+    manager = DocumentMemoryManager.__new__(DocumentMemoryManager)
+    sections = make_sections(12)
+    text = "".join(sections)
+    
+    splits = [
+        sections,
+        [text[i:i + 333] for i in range(0, len(text), 333)],
+        [text[i:i + 50] for i in range(0, len(text), 50)],
+        [piece for section in sections for piece in (section[:700], "", section[700:])],
+        [text]
+    ]
+    
+    expected = manager.chunk_document(text)
+    assert len(expected) > 1
+    for pieces in splits:
+        assert list(manager.iter_chunks(pieces)) == expected
+    
+    # Text without sentence breaks and shorter than one chunk
+    assert list(manager.iter_chunks(["a" * 400, "b" * 400, "c" * 900])) == manager.chunk_document("a" * 400 + "b" * 400 + "c" * 900)
+    assert list(manager.iter_chunks(["short text"])) == manager.chunk_document("short text") == ["short text"]
+    
+    print(f"✅ {len(splits)} page splits produced the same {len(expected)} chunks")
+
+
+def test_streamed_pdf():
+    """Test that a large PDF is opened once, keeps its statistics and stores the same chunks"""
+    print("\n🧪 Testing streamed PDF ingestion...")
+    
+    pages = make_sections(6)
+    text = "".join(page + "\n" for page in pages)
+    
+    original_reader = document_processor.PdfReader
+    document_processor.PdfReader = FakePdfReader
+    FakePdfReader.pages_text = pages
+    FakePdfReader.opened = 0
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"), stream_pdf_page_threshold=3)
+            result = processor._process_pdf(Path(temp_dir) / "report.pdf")
+            
+            assert FakePdfReader.opened == 1
+            assert result['streamed'] and 'content' not in result
+            assert result['word_count'] == len(text.split())
+            assert result['char_count'] == len(text)
+            assert result['sample_text'] == text[:1000]
+            
+            manager = make_manager(temp_dir)
+            result['metadata'] = {'filename': "report.pdf", 'source_path': str(Path(temp_dir) / "report.pdf")}
+            report = manager.store_documents({"report.pdf": result})
+            assert report['errors'] == {}
+            
+            stored = manager.document_collection.get(where={"document_id": report['document_ids']['report.pdf']})
+            chunks = manager.chunk_document(text)
+            assert sorted(stored['documents']) == sorted(set(chunks))
+            assert report['chunks_added'] == len(set(chunks))
+    finally:
+        document_processor.PdfReader = original_reader
+    
+    print(f"✅ Streamed {result['page_count']} pages into {report['chunks_added']} chunks")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting document memory tests...")
+    
+    try:
+        test_reingest_edited_upload()
+        test_batched_store_documents()
+        test_failed_batch()
+        test_iter_chunks_matches_chunk_document()
+        test_streamed_pdf()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
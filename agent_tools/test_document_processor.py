@@ -0,0 +1,206 @@
+"""
+Test script for directory processing and encoding detection in the document processor
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from agent_tools import document_processor
+from agent_tools.document_processor import DocumentProcessor, ENCODING_SAMPLE_SIZE, detect_encoding
+
+
+def stuck_or_process(upload_dir: str, stream_pdf_page_threshold: int, file_path: str):
+    """Worker entry point that never finishes files named stuck*"""
+    if Path(file_path).name.startswith("stuck"):
+        time.sleep(120)
+    return ORIGINAL_WORKER(upload_dir, stream_pdf_page_threshold, file_path)
+
+
+ORIGINAL_WORKER = document_processor._process_file_in_worker
+
+
+class CountingPool(document_processor.ProcessPoolExecutor):
+    """Process pool that counts how often one is created"""
+    
+    created = 0
+    
+    def __init__(self, *args, **kwargs):
+        CountingPool.created += 1
+        super().__init__(*args, **kwargs)
+
+
+def make_directory(temp_dir: str, names: list) -> Path:
+    """Create a directory of small text files, one of them in a subdirectory"""
+    directory = Path(temp_dir) / "upload"
+    for i, name in enumerate(names):
+        path = directory / ("nested" if i == 0 else "") / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"File {name} line one.\nLine two of {name}.\n")
+    (directory / "ignored.xyz").write_text("not a supported format")
+    return directory
+
+
+def test_serial_directory():
+    """Test that serial mode processes every supported file and reports progress"""
+    print("🧪 Testing serial directory processing...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = make_directory(temp_dir, ["a.txt", "b.md", "c.log"])
+        processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"))
+        progress = []
+        
+        results = dict(processor.iter_process_directory(
+            str(directory), progress_callback=lambda done, total, path: progress.append((done, total))
+        ))
+        
+        assert sorted(Path(path).name for path in results) == ["a.txt", "b.md", "c.log"]
+        assert all('error' not in result for result in results.values())
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+        assert results[str(directory / "nested" / "a.txt")]['word_count'] == 8
+    
+    print(f"✅ Processed {len(results)} files and skipped the unsupported one")
+
+
+def test_pool_matches_serial():
+    """Test that process-pool mode returns the same results as serial mode"""
+    print("\n🧪 Testing process-pool directory processing...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = make_directory(temp_dir, [f"file{i}.txt" for i in range(6)])
+        processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"))
+        
+        serial = processor.process_directory(str(directory))
+        pooled = processor.process_directory(str(directory), max_workers=3)
+        
+        assert pooled == serial
+    
+    print(f"✅ {len(pooled)} files processed the same way in 3 workers")
+
+
+def test_timeout_replaces_pool():
+    """Test that a stuck file times out, its pool is replaced and every other file still completes"""
+    print("\n🧪 Testing a file that times out...")
+    
+    original_pool = document_processor.ProcessPoolExecutor
+    document_processor._process_file_in_worker = stuck_or_process
+    document_processor.ProcessPoolExecutor = CountingPool
+    CountingPool.created = 0
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = make_directory(temp_dir, ["first.txt", "stuck.txt"] + [f"file{i}.txt" for i in range(4)])
+            processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"))
+            
+            started = time.monotonic()
+            results = dict(processor.iter_process_directory(str(directory), max_workers=2, timeout=2))
+            elapsed = time.monotonic() - started
+    finally:
+        document_processor._process_file_in_worker = ORIGINAL_WORKER
+        document_processor.ProcessPoolExecutor = original_pool
+    
+    errors = {Path(path).name: result['error'] for path, result in results.items() if 'error' in result}
+    assert errors == {"stuck.txt": "Processing timed out after 2s"}
+    assert len(results) == 6
+    assert CountingPool.created == 2
+    assert elapsed < 30
+    
+    print(f"✅ Stuck file timed out and the other {len(results) - 1} files completed in {elapsed:.1f}s")
+
+
+def test_detect_encoding():
+    """Test encoding detection from the sampled ends of a file"""
+    print("\n🧪 Testing sampled encoding detection...")
+    
+    text = "Café résumé naïve, piñata and smörgåsbord.\n" * 10
+    padding = "plain ascii line\n" * (ENCODING_SAMPLE_SIZE // 8)
+    cases = {
+        "bom.txt": (b"\xef\xbb\xbf" + text.encode('utf-8'), 'utf-8-sig'),
+        "utf16.txt": (text.encode('utf-16'), 'utf-16'),
+        "utf8.txt": (text.encode('utf-8'), 'utf-8'),
+        "ascii.txt": (padding.encode('ascii'), 'utf-8'),
+        # A multi-byte character cut by the start of the suffix sample
+        "split.txt": ((padding + "é" * ENCODING_SAMPLE_SIZE).encode('utf-8')[1:], 'utf-8'),
+    }
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, (data, expected) in cases.items():
+            path = Path(temp_dir) / name
+            path.write_bytes(data)
+            assert detect_encoding(path) == expected, name
+        
+        # Single-byte encodings are told apart by chardet; only check they decode
+        path = Path(temp_dir) / "latin1.txt"
+        path.write_bytes(text.encode('latin-1'))
+        assert detect_encoding(path) not in ('utf-8', 'ascii')
+        path.read_bytes().decode(detect_encoding(path))
+    
+    print(f"✅ Detected {len(cases) + 1} encodings from samples")
+
+
+def test_non_utf8_bytes_in_the_middle():
+    """Test files whose non-UTF-8 bytes sit only between the sampled ends"""
+    print("\n🧪 Testing non-UTF-8 bytes outside the samples...")
+    
+    padding = "plain ascii line\n" * (ENCODING_SAMPLE_SIZE // 8)
+    middle = "Café résumé naïve, crème brûlée.\n" * 50
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"))
+        
+        text_path = Path(temp_dir) / "notes.txt"
+        data = (padding + middle + padding).encode('cp1252')
+        text_path.write_bytes(data)
+        assert detect_encoding(text_path) == 'utf-8'
+        assert detect_encoding(text_path, sample_size=None) != 'utf-8'
+        
+        # The whole file is decoded with the encoding detected from all of it
+        result = processor._process_text(text_path)
+        assert 'error' not in result, result.get('error')
+        assert result['encoding'] != 'utf-8'
+        assert result['content'].encode(result['encoding']) == data
+        assert result['content'].startswith(padding) and result['content'].endswith(padding)
+        
+        csv_path = Path(temp_dir) / "table.csv"
+        rows = ["id,name"] + [f"{i},row {i}" for i in range(10_000)]
+        rows[5_000] = "5000,Café crème"
+        csv_path.write_bytes(("\n".join(rows) + "\n").encode('cp1252'))
+        assert detect_encoding(csv_path) == 'utf-8'
+        
+        result = processor._process_csv(csv_path)
+        assert 'error' not in result, result.get('error')
+        assert result['shape'] == (10_000, 2)
+        name = result['data'].records(4_999, 5_000)[0]['name']
+        assert name.startswith("Caf") and len(name) == len("Café crème") and '\ufffd' not in name
+        
+        # The chunked path for large files starts again and leaves no partial file behind
+        original_threshold = document_processor.LARGE_TABLE_BYTES
+        document_processor.LARGE_TABLE_BYTES = 0
+        try:
+            result = processor._process_csv(csv_path)
+        finally:
+            document_processor.LARGE_TABLE_BYTES = original_threshold
+        
+        assert 'error' not in result, result.get('error')
+        assert result['profiled_in_chunks'] and result['shape'] == (10_000, 2)
+        assert result['data'].records(4_999, 5_000)[0]['name'] == name
+        assert not list(processor.columnar_dir.glob("*.tmp"))
+    
+    print(f"✅ Re-detected {result['data_type']} and text encodings from the whole file")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting document processor tests...")
+    
+    try:
+        test_serial_directory()
+        test_pool_matches_serial()
+        test_timeout_replaces_pool()
+        test_detect_encoding()
+        test_non_utf8_bytes_in_the_middle()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
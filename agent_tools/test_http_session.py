@@ -0,0 +1,138 @@
+"""
+Test script for the pooled keep-alive HTTP session, run against a local HTTP server
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from agent_tools.http_session import PooledHTTPSession
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that counts connections and the requests in flight"""
+    
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    connections = 0
+    in_flight = 0
+    max_in_flight = 0
+    
+    def setup(self):
+        super().setup()
+        with CountingHandler.lock:
+            CountingHandler.connections += 1
+    
+    def do_GET(self):
+        with CountingHandler.lock:
+            CountingHandler.in_flight += 1
+            CountingHandler.max_in_flight = max(CountingHandler.max_in_flight, CountingHandler.in_flight)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(float(self.path.split("=")[1]))
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with CountingHandler.lock:
+                CountingHandler.in_flight -= 1
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    """Start a local server on a free port with fresh counters"""
+    CountingHandler.connections = CountingHandler.in_flight = CountingHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_connection_reuse():
+    """Test that sequential requests to one host share one kept-alive connection"""
+    print("🧪 Testing connection reuse...")
+    
+    server = start_server()
+    session = PooledHTTPSession()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/page"
+        for _ in range(10):
+            with session.get(url) as response:
+                assert response.text == "ok"
+        
+        stats = session.get_stats()
+        assert CountingHandler.connections == 1
+        assert stats['connections_opened'] == 1 and stats['requests'] == 10
+        assert stats['reuse_ratio'] == 0.9
+    finally:
+        session.close()
+        server.shutdown()
+    
+    print(f"✅ 10 requests over {CountingHandler.connections} connection")
+
+
+def test_per_host_cap():
+    """Test that concurrent requests to one host wait for a pooled connection instead of opening more"""
+    print("\n🧪 Testing the per-host connection cap...")
+    
+    server = start_server()
+    session = PooledHTTPSession(max_per_host=2)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/slow?delay=0.2"
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            statuses = list(executor.map(lambda _: session.get(url).status_code, range(6)))
+        
+        assert statuses == [200] * 6
+        assert CountingHandler.max_in_flight == 2
+        assert CountingHandler.connections == 2
+    finally:
+        session.close()
+        server.shutdown()
+    
+    print(f"✅ 6 concurrent requests used {CountingHandler.connections} connections")
+
+
+def test_default_timeout():
+    """Test that requests get the pool's read timeout unless the caller sets one"""
+    print("\n🧪 Testing the default timeout...")
+    
+    server = start_server()
+    session = PooledHTTPSession(read_timeout=0.2)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/slow?delay=1"
+        try:
+            session.get(url)
+        except requests.exceptions.Timeout:
+            pass
+        else:
+            raise AssertionError("The request did not time out")
+        
+        assert session.get(url, timeout=5).status_code == 200
+    finally:
+        session.close()
+        server.shutdown()
+    
+    print("✅ Slow response timed out with the default and succeeded with a longer timeout")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting HTTP session tests...")
+    
+    try:
+        test_connection_reuse()
+        test_per_host_cap()
+        test_default_timeout()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,80 @@
+"""
+Test script for the LLM response cache
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from agent_tools.llm_cache import LLMResponseCache
+
+
+PARAMS = {"model": "ollama/test", "temperature": 0.0}
+
+
+def fake_embedding_function(texts):
+    """Embed texts by letter frequency so similar prompts get similar vectors"""
+    vectors = []
+    for text in texts:
+        vector = np.zeros(26, dtype=np.float32)
+        for char in text.lower():
+            if 'a' <= char <= 'z':
+                vector[ord(char) - ord('a')] += 1
+        vectors.append(vector)
+    return vectors
+
+
+def test_exact_hit_and_miss():
+    """Test that a stored response is served only for the same parameters and messages"""
+    print("🧪 Testing exact-match lookups...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = LLMResponseCache(db_path=str(Path(temp_dir) / "llm_cache.db"), semantic=False)
+        messages = [{"role": "user", "content": "What is DAMA-DMBOK?"}]
+        
+        assert cache.get(PARAMS, messages) is None
+        cache.set(PARAMS, messages, "A data management body of knowledge.")
+        
+        assert cache.get(PARAMS, messages) == "A data management body of knowledge."
+        assert cache.get(dict(PARAMS, temperature=0.7), messages) is None
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+        assert stats['entries'] == 1
+    
+    print(f"✅ Hit rate {stats['hit_rate']:.2f} after one hit and two misses")
+
+
+def test_semantic_hit():
+    """Test that near-duplicate prompts are served only within the same parameters"""
+    print("\n🧪 Testing near-duplicate lookups...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = LLMResponseCache(db_path=str(Path(temp_dir) / "llm_cache.db"), semantic=True, similarity_threshold=0.95)
+        cache._embedding_function = fake_embedding_function
+        
+        cache.set(PARAMS, "Summarise the data governance framework", "Summary")
+        
+        assert cache.get(PARAMS, "Summarise the data governance framework.") == "Summary"
+        assert cache.get(dict(PARAMS, model="ollama/other"), "Summarise the data governance framework.") is None
+        assert cache.get(PARAMS, "List every risk in the compliance register") is None
+        assert cache.get_stats()['semantic_hits'] == 1
+    
+    print("✅ Near-duplicate served, unrelated prompt and other model missed")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting LLM cache tests...")
+    
+    try:
+        test_exact_hit_and_miss()
+        test_semantic_hit()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
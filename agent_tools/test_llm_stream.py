@@ -0,0 +1,119 @@
+"""
+Test script for streaming LLM events from a workflow to the UI
+"""
+
+import threading
+
+from agent_tools.llm_stream import (
+    TokenStream,
+    stream_workflow,
+    EVENT_START,
+    EVENT_TOKEN,
+    EVENT_END,
+    EVENT_RESULT,
+    EVENT_ERROR,
+)
+
+
+class FakeStreamingLLM:
+    """LLM whose calls emit their answer word by word into the attached stream"""
+    
+    def __init__(self, token_stream=None):
+        self.token_stream = token_stream
+    
+    def with_stream(self, token_stream):
+        return FakeStreamingLLM(token_stream)
+    
+    def call(self, role: str, answer: str) -> str:
+        self.token_stream.emit(EVENT_START, source=role)
+        for word in answer.split(" "):
+            self.token_stream.emit_token(word + " ")
+        self.token_stream.emit_token("")
+        self.token_stream.emit(EVENT_END, source=role)
+        return answer
+
+
+def test_event_order():
+    """Test that events come out in the order they were emitted, ending with the result"""
+    print("🧪 Testing token stream event order...")
+    
+    token_stream = TokenStream()
+    token_stream.emit(EVENT_START, source="Researcher")
+    for text in ["one ", "two ", "", "three"]:
+        token_stream.emit_token(text)
+    token_stream.emit(EVENT_END, source="Researcher")
+    token_stream.close("final answer")
+    token_stream.emit_token("after close")
+    
+    events = list(token_stream.events(timeout=1))
+    assert [event['type'] for event in events] == [
+        EVENT_START, EVENT_TOKEN, EVENT_TOKEN, EVENT_TOKEN, EVENT_END, EVENT_RESULT
+    ]
+    assert "".join(event['text'] for event in events if event['type'] == EVENT_TOKEN) == "one two three"
+    assert events[0]['source'] == "Researcher"
+    assert events[-1]['text'] == "final answer"
+    
+    print(f"✅ {len(events)} events in order, empty and late tokens dropped")
+
+
+def test_stream_workflow():
+    """Test that a workflow's calls stream in order from its thread, followed by its result"""
+    print("\n🧪 Testing a streamed workflow...")
+    
+    caller_thread = threading.current_thread()
+    threads = []
+    
+    def workflow(llm):
+        threads.append(threading.current_thread())
+        first = llm.call("Researcher", "alpha beta")
+        second = llm.call("Strategist", "gamma")
+        return f"{first} | {second}"
+    
+    events = list(stream_workflow(FakeStreamingLLM(), workflow))
+    
+    assert threads[0] is not caller_thread
+    assert [(event['type'], event.get('source')) for event in events if event['type'] != EVENT_TOKEN] == [
+        (EVENT_START, "Researcher"), (EVENT_END, "Researcher"),
+        (EVENT_START, "Strategist"), (EVENT_END, "Strategist"),
+        (EVENT_RESULT, None)
+    ]
+    assert [event['text'] for event in events if event['type'] == EVENT_TOKEN] == ["alpha ", "beta ", "gamma "]
+    assert events[-1]['text'] == "alpha beta | gamma"
+    
+    print(f"✅ Streamed {len(events)} events ending with the result")
+
+
+def test_stream_workflow_error():
+    """Test that a failing workflow ends the stream with an error after the events it emitted"""
+    print("\n🧪 Testing a failing streamed workflow...")
+    
+    def workflow(llm):
+        llm.call("Researcher", "partial")
+        raise RuntimeError("model unavailable")
+    
+    events = list(stream_workflow(FakeStreamingLLM(), workflow))
+    
+    assert [event['type'] for event in events] == [EVENT_START, EVENT_TOKEN, EVENT_END, EVENT_ERROR]
+    assert events[-1]['text'] == "model unavailable"
+    
+    # LLMs without streaming support still produce the result event
+    events = list(stream_workflow(object(), lambda llm: "whole response"))
+    assert events == [{'type': EVENT_RESULT, 'text': "whole response"}]
+    
+    print("✅ Error reported as the last event")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting LLM stream tests...")
+    
+    try:
+        test_event_order()
+        test_stream_workflow()
+        test_stream_workflow_error()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,144 @@
+"""
+Test script for the LLM token-bucket rate limiter
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from agent_tools.rate_limiter import TokenBucket, SQLiteTokenBucket, RateLimiterRegistry
+
+
+def test_burst_then_refill():
+    """Test that the burst is available at once and later requests wait for the refill rate"""
+    print("🧪 Testing burst and refill...")
+    
+    # 600 requests per minute refills one token every 0.1s
+    bucket = TokenBucket("test", requests_per_minute=600, burst=3)
+    
+    started = time.monotonic()
+    for _ in range(3):
+        assert bucket.acquire() == 0.0
+    assert time.monotonic() - started < 0.05
+    
+    waited = bucket.acquire()
+    assert 0.05 <= waited <= 0.2
+    
+    stats = bucket.get_stats()
+    assert stats['acquired'] == 4
+    assert stats['waits'] == 1
+    
+    print(f"✅ Fourth request waited {waited:.3f}s after a burst of 3")
+
+
+def test_timeout():
+    """Test that acquire gives up when the tokens cannot arrive within the timeout"""
+    print("\n🧪 Testing acquire timeout...")
+    
+    bucket = TokenBucket("test", requests_per_minute=6, burst=1)
+    bucket.acquire()
+    
+    try:
+        bucket.acquire(timeout=0.1)
+        assert False, "acquire should have timed out"
+    except TimeoutError:
+        pass
+    
+    print("✅ TimeoutError raised when the next token is 10s away")
+
+
+def test_drain():
+    """Test that draining the bucket after a 429 delays the next request"""
+    print("\n🧪 Testing drain...")
+    
+    bucket = TokenBucket("test", requests_per_minute=600, burst=5)
+    bucket.drain(0.2)
+    
+    waited = bucket.acquire()
+    assert 0.2 <= waited <= 0.4
+    assert bucket.get_stats()['drains'] == 1
+    
+    print(f"✅ Request after drain(0.2) waited {waited:.3f}s")
+
+
+def test_shared_across_threads():
+    """Test that threads sharing a bucket together respect the request rate"""
+    print("\n🧪 Testing bucket shared by threads...")
+    
+    bucket = TokenBucket("test", requests_per_minute=1200, burst=2)
+    
+    def worker():
+        for _ in range(3):
+            bucket.acquire()
+    
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    
+    # 12 requests with a burst of 2 need 10 refills at 20 per second
+    assert elapsed >= 0.45
+    assert bucket.get_stats()['acquired'] == 12
+    
+    print(f"✅ 12 requests from 4 threads took {elapsed:.2f}s")
+
+
+def test_sqlite_bucket_shared():
+    """Test that two SQLite buckets on the same file draw from one budget"""
+    print("\n🧪 Testing SQLite-backed bucket...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "rate_limit.db")
+        first = SQLiteTokenBucket("endpoint", requests_per_minute=600, burst=2, db_path=db_path)
+        second = SQLiteTokenBucket("endpoint", requests_per_minute=600, burst=2, db_path=db_path)
+        
+        assert first.acquire() == 0.0
+        assert second.acquire() == 0.0
+        
+        # The shared burst is used up, so the next request has to wait
+        assert first.acquire() > 0.0
+        assert second.get_stats()['backend'] == 'sqlite'
+    
+    print("✅ Buckets on the same SQLite file share their tokens")
+
+
+def test_registry():
+    """Test that the registry returns one bucket per endpoint and applies configured limits"""
+    print("\n🧪 Testing rate limiter registry...")
+    
+    registry = RateLimiterRegistry(requests_per_minute=60, burst=None, db_path=None)
+    
+    bucket = registry.get("http://localhost:11434")
+    assert registry.get("http://localhost:11434") is bucket
+    assert registry.get("http://other:11434") is not bucket
+    assert bucket.capacity == 60
+    
+    configured = registry.configure("http://localhost:11434", requests_per_minute=120, burst=5)
+    assert registry.get("http://localhost:11434") is configured
+    assert configured.requests_per_minute == 120
+    assert configured.capacity == 5
+    
+    print(f"✅ Registry tracks {len(registry.get_stats())} endpoints")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting rate limiter tests...")
+    
+    try:
+        test_burst_then_refill()
+        test_timeout()
+        test_drain()
+        test_shared_across_threads()
+        test_sqlite_bucket_shared()
+        test_registry()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,177 @@
+"""
+Test script for concurrent reference URL validation, run against a fake HTTP session
+"""
+
+import threading
+import time
+
+from agent_tools import reference_manager
+from agent_tools.reference_manager import ReferenceManager, VALIDATION_MAX_PER_HOST
+
+
+class FakeResponse:
+    """Response with a status, content type and optional HTML body"""
+    
+    def __init__(self, url: str, status_code: int, content_type: str = "text/html", body: bytes = b""):
+        self.url = url
+        self.status_code = status_code
+        self.headers = {'Content-Type': content_type}
+        self.encoding = 'utf-8'
+        self.body = body
+    
+    def iter_content(self, chunk_size: int = 8192):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+
+
+class FakeSession:
+    """
+    Session answering from a table of (HEAD status, GET status, content type)
+    per path, recording every request and the peak concurrency per host
+    """
+    
+    def __init__(self, routes: dict, delay: float = 0.0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.max_in_flight = {}
+    
+    def _respond(self, method: str, url: str) -> FakeResponse:
+        host, path = url.split("/")[2], "/" + url.split("/", 3)[3]
+        with self.lock:
+            self.requests.append((method, path))
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.max_in_flight[host] = max(self.max_in_flight.get(host, 0), self.in_flight[host])
+        try:
+            time.sleep(self.delay)
+            head_status, get_status, content_type = self.routes.get(path, (200, 200, "text/html"))
+            if method == 'HEAD':
+                return FakeResponse(url, head_status, content_type)
+            body = f"<html><head><title>Page {path} &amp; more</title></head><body>text</body></html>".encode()
+            return FakeResponse(url, get_status, content_type, body)
+        finally:
+            with self.lock:
+                self.in_flight[host] -= 1
+    
+    def head(self, url: str, **kwargs) -> FakeResponse:
+        return self._respond('HEAD', url)
+    
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        return self._respond('GET', url)
+
+
+class FakeValidationCache:
+    """In-memory stand-in for the shared validation cache"""
+    
+    def __init__(self, entries: dict = None):
+        self.entries = dict(entries or {})
+    
+    def get(self, url):
+        return self.entries.get(url)
+    
+    def get_many(self, urls):
+        return {url: self.entries[url] for url in urls if url in self.entries}
+    
+    def set(self, url, result):
+        self.entries[url] = result
+
+
+def validate_with(session: FakeSession, urls: list, cache: FakeValidationCache = None, **kwargs) -> dict:
+    """Run validate_many with the fake session and cache swapped in"""
+    original_session, original_cache = reference_manager.get_http_session, reference_manager.validation_cache
+    reference_manager.get_http_session = lambda: session
+    reference_manager.validation_cache = cache or FakeValidationCache()
+    try:
+        return ReferenceManager().validate_many(urls, **kwargs)
+    finally:
+        reference_manager.get_http_session = original_session
+        reference_manager.validation_cache = original_cache
+
+
+def test_head_then_get():
+    """Test that GET is only sent when HEAD is rejected, fails or leaves an HTML title to read"""
+    print("🧪 Testing HEAD-first checks...")
+    
+    session = FakeSession({
+        "/report.pdf": (200, 200, "application/pdf"),
+        "/missing": (404, 404, "text/html"),
+        "/no-head": (405, 200, "text/html"),
+        "/forbidden-head": (403, 403, "text/html"),
+        "/article": (200, 200, "text/html; charset=utf-8"),
+    })
+    results = validate_with(session, [f"https://example.org{path}" for path in session.routes])
+    
+    assert sorted(session.requests) == sorted([
+        ('HEAD', "/report.pdf"),
+        ('HEAD', "/missing"),
+        ('HEAD', "/no-head"), ('GET', "/no-head"),
+        ('HEAD', "/forbidden-head"), ('GET', "/forbidden-head"),
+        ('HEAD', "/article"), ('GET', "/article"),
+    ])
+    assert results["https://example.org/report.pdf"]['valid'] and results["https://example.org/report.pdf"]['title'] is None
+    assert results["https://example.org/missing"]['error'] == "HTTP 404"
+    assert results["https://example.org/no-head"]['valid'] and results["https://example.org/no-head"]['title'] == "Page /no-head & more"
+    assert results["https://example.org/forbidden-head"]['status_code'] == 403
+    assert results["https://example.org/article"]['title'] == "Page /article & more"
+    
+    print(f"✅ {len(session.requests)} requests for {len(results)} URLs")
+
+
+def test_per_host_cap():
+    """Test that no host sees more than VALIDATION_MAX_PER_HOST checks at once while other hosts proceed"""
+    print("\n🧪 Testing the per-host cap...")
+    
+    urls = [f"https://busy.example.org/report{i}.pdf" for i in range(VALIDATION_MAX_PER_HOST * 3)]
+    urls += [f"https://quiet{i}.example.org/report.pdf" for i in range(4)]
+    routes = {f"/report{i}.pdf": (200, 200, "application/pdf") for i in range(VALIDATION_MAX_PER_HOST * 3)}
+    routes["/report.pdf"] = (200, 200, "application/pdf")
+    session = FakeSession(routes, delay=0.05)
+    
+    results = validate_with(session, urls + urls[:3], max_workers=16)
+    
+    assert len(results) == len(urls) and all(result['valid'] for result in results.values())
+    assert len(session.requests) == len(urls)
+    assert session.max_in_flight["busy.example.org"] == VALIDATION_MAX_PER_HOST
+    
+    print(f"✅ Peak of {session.max_in_flight['busy.example.org']} concurrent checks on the busy host")
+
+
+def test_cached_results():
+    """Test that cached URLs are returned without a request and new results are cached"""
+    print("\n🧪 Testing cached results...")
+    
+    cached = {'valid': True, 'status_code': 200, 'title': "Cached", 'accessible': True, 'error': None}
+    cache = FakeValidationCache({"https://example.org/cached": cached})
+    session = FakeSession({"/new": (200, 200, "application/pdf")})
+    
+    results = validate_with(session, ["https://example.org/cached", "https://example.org/new"], cache)
+    
+    assert results["https://example.org/cached"] == cached
+    assert session.requests == [('HEAD', "/new")]
+    assert cache.get("https://example.org/new")['valid']
+    
+    print("✅ Cached URL skipped and the new result cached")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting reference validation tests...")
+    
+    try:
+        test_head_then_get()
+        test_per_host_cap()
+        test_cached_results()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,55 @@
+"""
+Test script for the persistent web search cache
+"""
+
+import tempfile
+from pathlib import Path
+
+from agent_tools.search_cache import SearchCache, normalize_query
+
+
+RESULTS = [{'title': 'DAMA-DMBOK', 'href': 'https://example.com/dama', 'body': 'Data management body of knowledge'}]
+
+
+def test_normalize_query():
+    """Test that case, punctuation and whitespace differences normalize away"""
+    print("🧪 Testing query normalization...")
+    
+    assert normalize_query("  Data Governance, Frameworks? ") == "data governance frameworks"
+    assert SearchCache.make_key("Data governance", 5) == SearchCache.make_key("data  GOVERNANCE!", 5)
+    assert SearchCache.make_key("data governance", 5) != SearchCache.make_key("data governance", 10)
+    
+    print("✅ Equivalent queries share a cache key")
+
+
+def test_shared_results():
+    """Test that results stored by one cache instance are served to another for any spelling"""
+    print("\n🧪 Testing results shared through the cache file...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "search_cache.db")
+        SearchCache(db_path=db_path, enabled=True).set("data governance", 5, RESULTS)
+        
+        cache = SearchCache(db_path=db_path, enabled=True)
+        assert cache.get("Data Governance?", 5) == RESULTS
+        assert cache.get("data governance", 10) is None
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1 and stats['entries'] == 1
+    
+    print("✅ Another instance served the stored results")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting search cache tests...")
+    
+    try:
+        test_normalize_query()
+        test_shared_results()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
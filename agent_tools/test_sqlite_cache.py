@@ -0,0 +1,148 @@
+"""
+Test script for the shared SQLite TTL and LRU cache
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from agent_tools import sqlite_cache
+from agent_tools.sqlite_cache import SQLiteCache
+
+
+class NoteCache(SQLiteCache):
+    """Cache of notes with one extra column, defined the way the real caches are"""
+    
+    table = "note_cache"
+    columns = {'author': 'TEXT'}
+    indexes = ['author']
+    label = "Note cache"
+    
+    def get(self, key):
+        return self._get_values([key]).get(key)
+    
+    def set(self, key, note, ttl_seconds=None):
+        self._set_value(key, note, ttl_seconds, author=note.get('author'))
+
+
+NOTE = {'author': 'steward', 'text': 'Retention is seven years'}
+
+
+def test_hit_and_expiry():
+    """Test that values are served until their own TTL or the cache TTL runs out"""
+    print("🧪 Testing hits and expiry...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = NoteCache(str(Path(temp_dir) / "cache.db"), max_entries=10, ttl_seconds=60)
+        
+        assert cache.get("retention") is None
+        cache.set("retention", NOTE)
+        cache.set("short", NOTE, ttl_seconds=0.2)
+        assert cache.get("retention") == NOTE and cache.get("short") == NOTE
+        
+        time.sleep(0.3)
+        assert cache.get("short") is None
+        assert cache.get("retention") == NOTE
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 3 and stats['misses'] == 2
+        assert stats['expired'] == 1 and stats['entries'] == 1
+    
+    print(f"✅ Hit rate {stats['hit_rate']:.2f} with the short-lived entry expired")
+
+
+def test_lru_eviction():
+    """Test that expired entries and the least recently used beyond max_entries are evicted"""
+    print("\n🧪 Testing LRU eviction...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = NoteCache(str(Path(temp_dir) / "cache.db"), max_entries=2, ttl_seconds=60)
+        
+        cache.set("first", NOTE)
+        time.sleep(0.01)
+        cache.set("second", NOTE)
+        time.sleep(0.01)
+        
+        # Reading "first" makes "second" the least recently used entry
+        assert cache.get("first") == NOTE
+        time.sleep(0.01)
+        cache.set("third", NOTE)
+        assert cache._get_values(["first", "second", "third"]).keys() == {"first", "third"}
+        
+        # An already expired entry goes with the next store, then "first" as the least recently used
+        cache.set("stale", NOTE, ttl_seconds=-1)
+        time.sleep(0.01)
+        assert cache.get("third") == NOTE
+        time.sleep(0.01)
+        cache.set("fourth", NOTE)
+        assert cache.get_stats()['evictions'] == 3
+        assert cache._get_values(["first", "third", "stale", "fourth"]).keys() == {"third", "fourth"}
+    
+    print("✅ Least recently used and expired entries evicted")
+
+
+def test_batched_lookups():
+    """Test that lookups of more keys than one statement takes are split into batches"""
+    print("\n🧪 Testing batched lookups...")
+    
+    original_batch_size = sqlite_cache.LOOKUP_BATCH_SIZE
+    sqlite_cache.LOOKUP_BATCH_SIZE = 3
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = NoteCache(str(Path(temp_dir) / "cache.db"), max_entries=100, ttl_seconds=60)
+            for i in range(10):
+                cache.set(f"note {i}", dict(NOTE, text=f"note {i}"))
+            
+            keys = [f"note {i}" for i in range(12)] + ["note 0"]
+            values = cache._get_values(keys)
+    finally:
+        sqlite_cache.LOOKUP_BATCH_SIZE = original_batch_size
+    
+    assert values == {f"note {i}": dict(NOTE, text=f"note {i}") for i in range(10)}
+    assert cache.metrics['hits'] == 10 and cache.metrics['misses'] == 2
+    
+    print(f"✅ Found {len(values)} of {len(set(keys))} keys in batches of 3")
+
+
+def test_disabled_and_old_schema():
+    """Test that a disabled cache is a no-op and a table from an older schema is replaced"""
+    print("\n🧪 Testing disabled caches and schema changes...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "cache.db"
+        disabled = NoteCache(str(db_path), max_entries=10, ttl_seconds=60, enabled=False)
+        disabled.set("retention", NOTE)
+        assert disabled.get("retention") is None and disabled.clear() == 0
+        assert not db_path.exists()
+        
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE note_cache (cache_key TEXT PRIMARY KEY, note TEXT, created_at REAL)")
+        conn.execute("INSERT INTO note_cache VALUES ('retention', 'old', 0)")
+        conn.commit()
+        conn.close()
+        
+        cache = NoteCache(str(db_path), max_entries=10, ttl_seconds=60)
+        assert cache.enabled and cache.get("retention") is None
+        cache.set("retention", NOTE)
+        assert cache.get("retention") == NOTE
+        assert cache.clear() == 1
+    
+    print("✅ Old table recreated and disabled cache left no file")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting SQLite cache tests...")
+    
+    try:
+        test_hit_and_expiry()
+        test_lru_eviction()
+        test_batched_lookups()
+        test_disabled_and_old_schema()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,139 @@
+"""
+Test script for the single-pass tabular profiler
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from agent_tools.document_processor import DocumentProcessor
+from agent_tools.tabular_profiler import HyperLogLog, TableProfiler, profile_sqlite_table
+
+
+def make_table(rows: int = 50_000, seed: int = 7) -> pd.DataFrame:
+    """Build a table with correlated numeric columns, nulls and repeated labels"""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(100.0, 15.0, rows)
+    y = 0.8 * x + rng.normal(0.0, 10.0, rows)
+    z = rng.exponential(5.0, rows)
+    z[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        'x': x,
+        'y': y,
+        'z': z,
+        'category': rng.integers(0, 3_000, rows).astype(str),
+        'code': rng.integers(0, 40, rows)
+    })
+
+
+def profile_in_chunks(df: pd.DataFrame, chunk_rows: int = 7_000) -> dict:
+    """Profile a DataFrame by feeding it to the profiler in chunks"""
+    profiler = TableProfiler()
+    for start in range(0, len(df), chunk_rows):
+        profiler.update(df.iloc[start:start + chunk_rows])
+    return profiler.result()
+
+
+def test_hyperloglog_distinct_counts():
+    """Test HyperLogLog distinct counts against exact counts"""
+    print("🧪 Testing HyperLogLog distinct counts...")
+    
+    for distinct in [10, 1_000, 100_000]:
+        values = pd.Series(np.arange(distinct).repeat(3))
+        hll = HyperLogLog()
+        hll.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        error = abs(hll.count() - distinct) / distinct
+        assert error < 0.03, f"{hll.count()} estimated for {distinct} distinct values"
+        print(f"✅ {distinct} distinct values estimated as {hll.count()}")
+    
+    df = make_table()
+    profile = profile_in_chunks(df)
+    for column in df.columns:
+        exact = df[column].nunique()
+        assert abs(profile['distinct_counts'][column] - exact) / exact < 0.03
+
+
+def test_summary_matches_pandas():
+    """Test streamed moments and reservoir quantiles against DataFrame.describe()"""
+    print("\n🧪 Testing summary statistics...")
+    
+    df = make_table()
+    profile = profile_in_chunks(df)
+    expected = df.describe().to_dict()
+    
+    assert profile['shape'] == df.shape
+    assert profile['null_counts'] == df.isnull().sum().to_dict()
+    
+    for column in ['x', 'y', 'z', 'code']:
+        summary, exact = profile['summary'][column], expected[column]
+        for stat in ['count', 'mean', 'std', 'min', 'max']:
+            assert np.isclose(summary[stat], exact[stat], rtol=1e-9), f"{column} {stat}"
+        
+        # Quantiles come from a 10,000-value reservoir, so allow sampling error
+        spread = exact['75%'] - exact['25%']
+        for stat in ['25%', '50%', '75%']:
+            assert abs(summary[stat] - exact[stat]) < 0.05 * spread, f"{column} {stat}"
+    
+    print("✅ Moments exact and quantiles within 5% of the interquartile range")
+
+
+def test_correlation_matches_pandas():
+    """Test the streaming covariance correlation matrix against DataFrame.corr()"""
+    print("\n🧪 Testing correlation matrix...")
+    
+    df = make_table()
+    profile = profile_in_chunks(df)
+    expected = df[['x', 'y', 'z', 'code']].corr()
+    actual = pd.DataFrame(profile['correlation_matrix']).loc[expected.index, expected.columns]
+    
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), atol=1e-9)
+    
+    print(f"✅ Correlation of x and y: {actual.loc['x', 'y']:.4f}")
+
+
+def test_sqlite_tables_profiled():
+    """Test that SQLite tables are profiled in full rather than from a sample"""
+    print("\n🧪 Testing SQLite table profiling...")
+    
+    df = make_table(rows=20_000)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "readings.db"
+        conn = sqlite3.connect(db_path)
+        df.to_sql("readings", conn, index=False)
+        conn.close()
+        
+        profile = profile_sqlite_table(db_path, "readings", chunk_rows=3_000)
+        assert profile['shape'] == df.shape
+        assert np.isclose(profile['summary']['x']['mean'], df['x'].mean())
+        
+        processor = DocumentProcessor(upload_dir=str(Path(temp_dir) / "uploads"))
+        result = processor._process_sqlite(db_path)
+        table = result['tables']['readings']
+        assert table['row_count'] == len(df)
+        assert len(table['sample_data']) == 100
+        assert table['null_counts']['z'] == int(df['z'].isnull().sum())
+        assert abs(table['distinct_counts']['category'] - df['category'].nunique()) / df['category'].nunique() < 0.03
+        assert np.isclose(table['correlation_matrix']['x']['y'], df['x'].corr(df['y']))
+    
+    print(f"✅ Profiled all {table['row_count']} rows of the table")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting tabular profiler tests...")
+    
+    try:
+        test_hyperloglog_distinct_counts()
+        test_summary_matches_pandas()
+        test_correlation_matches_pandas()
+        test_sqlite_tables_profiled()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,95 @@
+"""
+Test script for the persistent URL validation cache
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from agent_tools import validation_cache as validation_cache_module
+from agent_tools.validation_cache import ValidationCache, get_result_ttl
+
+
+OK_RESULT = {'url': 'https://example.com/ok', 'status_code': 200, 'is_valid': True}
+NOT_FOUND_RESULT = {'url': 'https://example.com/missing', 'status_code': 404, 'is_valid': False}
+FAILED_RESULT = {'url': 'https://example.com/down', 'status_code': None, 'is_valid': False, 'error': 'timeout'}
+
+
+def test_status_aware_ttls():
+    """Test that successful checks live longest and failures shortest"""
+    print("🧪 Testing status-aware TTLs...")
+    
+    ok_ttl = get_result_ttl(OK_RESULT)
+    not_found_ttl = get_result_ttl(NOT_FOUND_RESULT)
+    error_ttl = get_result_ttl({'status_code': 503})
+    failure_ttl = get_result_ttl(FAILED_RESULT)
+    
+    assert ok_ttl > not_found_ttl > error_ttl > failure_ttl > 0
+    
+    print(f"✅ TTLs: 200={ok_ttl}s, 404={not_found_ttl}s, 503={error_ttl}s, failed={failure_ttl}s")
+
+
+def test_get_many():
+    """Test bulk lookups return only cached URLs and count hits and misses"""
+    print("\n🧪 Testing bulk lookups...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ValidationCache(db_path=str(Path(temp_dir) / "validation_cache.db"))
+        cache.set(OK_RESULT['url'], OK_RESULT)
+        cache.set(NOT_FOUND_RESULT['url'], NOT_FOUND_RESULT)
+        
+        urls = [OK_RESULT['url'], NOT_FOUND_RESULT['url'], 'https://example.com/unknown', OK_RESULT['url']]
+        results = cache.get_many(urls)
+        
+        assert results == {OK_RESULT['url']: OK_RESULT, NOT_FOUND_RESULT['url']: NOT_FOUND_RESULT}
+        assert cache.get('https://example.com/unknown') is None
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['entries_by_status'] == {'200': 1, '404': 1}
+    
+    print(f"✅ Found {len(results)} of {len(set(urls))} URLs in one lookup")
+
+
+def test_failure_expiry():
+    """Test that failed checks expire after their TTL and are evicted on the next store"""
+    print("\n🧪 Testing expiry of failed checks...")
+    
+    original_ttl = validation_cache_module.VALIDATION_TTL_FAILURE
+    validation_cache_module.VALIDATION_TTL_FAILURE = 0.2
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ValidationCache(db_path=str(Path(temp_dir) / "validation_cache.db"))
+            cache.set(FAILED_RESULT['url'], FAILED_RESULT)
+            cache.set(OK_RESULT['url'], OK_RESULT)
+            
+            assert cache.get(FAILED_RESULT['url']) == FAILED_RESULT
+            time.sleep(0.3)
+            assert cache.get(FAILED_RESULT['url']) is None
+            assert cache.get(OK_RESULT['url']) == OK_RESULT
+            
+            cache.set(NOT_FOUND_RESULT['url'], NOT_FOUND_RESULT)
+            stats = cache.get_stats()
+            assert stats['expired'] == 1
+            assert 'failed' not in stats['entries_by_status']
+    finally:
+        validation_cache_module.VALIDATION_TTL_FAILURE = original_ttl
+    
+    print("✅ Failed check expired while the successful one was kept")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting validation cache tests...")
+    
+    try:
+        test_status_aware_ttls()
+        test_get_many()
+        test_failure_expiry()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
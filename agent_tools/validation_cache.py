@@ -0,0 +1,143 @@
+"""
+Validation Cache for Digital Twins Management System
+
+This module provides a persistent cache of URL validation results for the
+ReferenceManager on the shared SQLite cache (sqlite_cache.py), so results are
+shared by every session and worker process. How long a result is kept depends
+on its outcome: reachable sources are trusted for days, missing pages for a
+day, and server errors or timeouts only briefly so transient failures are
+retried soon. The cache is size-bounded and evicts least-recently-used entries.
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+from typing import List, Dict, Any, Optional
+
+from agent_tools.sqlite_cache import SQLiteCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache settings
+VALIDATION_CACHE_PATH = os.getenv('VALIDATION_CACHE_PATH', './cache/validation_cache.db')
+VALIDATION_CACHE_MAX_ENTRIES = int(os.getenv('VALIDATION_CACHE_MAX_ENTRIES', '5000'))
+
+# Time to live by outcome, in seconds
+VALIDATION_TTL_OK = int(os.getenv('VALIDATION_TTL_OK', str(7 * 24 * 60 * 60)))             # HTTP 200
+VALIDATION_TTL_NOT_FOUND = int(os.getenv('VALIDATION_TTL_NOT_FOUND', str(24 * 60 * 60)))   # HTTP 404 / 410
+VALIDATION_TTL_HTTP_ERROR = int(os.getenv('VALIDATION_TTL_HTTP_ERROR', str(60 * 60)))      # Other HTTP statuses
+VALIDATION_TTL_FAILURE = int(os.getenv('VALIDATION_TTL_FAILURE', str(10 * 60)))            # Timeouts, connection errors
+
+
+def get_result_ttl(result: Dict[str, Any]) -> int:
+    """
+    Time to live for a validation result based on its outcome
+    
+    Args:
+        result: Validation result from ReferenceManager.validate_url
+    
+    Returns:
+        Seconds the result stays valid
+    """
+    status_code = result.get('status_code')
+    if status_code is None:
+        return VALIDATION_TTL_FAILURE
+    if status_code == 200:
+        return VALIDATION_TTL_OK
+    if status_code in (404, 410):
+        return VALIDATION_TTL_NOT_FOUND
+    return VALIDATION_TTL_HTTP_ERROR
+
+
+class ValidationCache(SQLiteCache):
+    """
+    Persistent LRU cache of URL validation results with status-aware TTLs
+    """
+    
+    table = "url_validation"
+    columns = {'url': 'TEXT NOT NULL', 'status_code': 'INTEGER'}
+    label = "Validation cache"
+    
+    def __init__(self, db_path: str = VALIDATION_CACHE_PATH, max_entries: int = VALIDATION_CACHE_MAX_ENTRIES):
+        super().__init__(db_path, max_entries)
+    
+    @staticmethod
+    def make_key(url: str) -> str:
+        """Build the cache key for a URL"""
+        return hashlib.md5(url.encode()).hexdigest()
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached validation result
+        
+        Args:
+            url: Validated URL
+        
+        Returns:
+            Cached validation result, or None on a miss or expired entry
+        """
+        return self.get_many([url]).get(url)
+    
+    def get_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached validation results for many URLs at once
+        
+        Args:
+            urls: Validated URLs
+        
+        Returns:
+            Cached result for each URL that has an unexpired entry
+        """
+        keys = {self.make_key(url): url for url in urls}
+        return {keys[cache_key]: result for cache_key, result in self._get_values(list(keys)).items()}
+    
+    def set(self, url: str, result: Dict[str, Any]):
+        """
+        Store a validation result with a TTL based on its outcome
+        
+        Expired entries, and the least recently used entries beyond max_entries,
+        are evicted.
+        
+        Args:
+            url: Validated URL
+            result: Validation result
+        """
+        self._set_value(
+            self.make_key(url), result, get_result_ttl(result), url=url, status_code=result.get('status_code')
+        )
+    
+    def _count_entries(self, conn: sqlite3.Connection, stats: Dict[str, Any]):
+        """Add the number of stored entries, in total and by status code, to the stats"""
+        rows = conn.execute(
+            "SELECT COALESCE(status_code, 'failed'), COUNT(*) FROM url_validation GROUP BY 1"
+        ).fetchall()
+        stats['entries_by_status'] = {str(status): count for status, count in rows}
+        stats['entries'] = sum(stats['entries_by_status'].values())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics for this process and the contents of the shared cache
+        
+        Returns:
+            Dictionary with hit/miss counters, hit rate and entries by status
+        """
+        stats = super().get_stats()
+        stats.setdefault('entries_by_status', {})
+        return stats
+
+
+# Global validation cache instance
+validation_cache = ValidationCache()
+
+
+def get_validation_cache_stats() -> Dict[str, Any]:
+    """Get URL validation cache metrics"""
+    return validation_cache.get_stats()
+
+
+def clear_validation_cache() -> int:
+    """Remove all cached URL validation results"""
+    return validation_cache.clear()
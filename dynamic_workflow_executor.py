@@ -5,54 +5,92 @@ This module provides dynamic workflow execution based on user-selected agents an
 Replaces the fixed workflow functions with flexible agent selection.
 """
 
-import time
-from typing import List, Dict, Any, Optional
-from crewai import Crew, Process
+from typing import List, Dict, Any, Optional, Iterator
 from agent_configuration import agent_config, AgentTeam
-from local_memory import add_to_memory, search_memory
-from agent_tools import search_web
+from local_memory import add_to_memory
+from agent_tools.llm_cache import bypass_llm_cache
+from agent_tools.llm_stream import stream_workflow
+from workflows.workflow_engine import WorkflowEngine, WorkflowSpec, StageSpec
 
-# Import agent creation functions
-from agent_teams.research_analysis.agents import create_research_analysis_agents_with_context
-from agent_teams.data_strategy.agents import create_data_strategy_agents_with_context
-from agent_teams.compliance_risk.agents import create_compliance_risk_agents_with_context
-from agent_teams.information_management.agents import create_information_management_agents_with_context
-from agent_teams.tender_response.agents import create_tender_response_agents_with_context
-from agent_teams.project_delivery.agents import create_project_delivery_agents_with_context
-from agent_teams.technical_documentation.agents import create_technical_documentation_agents_with_context
-
-# Import task creation functions
-from agent_teams.research_analysis.tasks import create_research_analysis_tasks_with_data
-from agent_teams.data_strategy.tasks import create_data_strategy_tasks_with_data
-from agent_teams.compliance_risk.tasks import create_compliance_risk_tasks_with_data
-from agent_teams.information_management.tasks import create_information_management_tasks_with_data
-from agent_teams.tender_response.tasks import create_tender_response_tasks_with_data
-from agent_teams.project_delivery.tasks import create_project_delivery_tasks_with_data
-from agent_teams.technical_documentation.tasks import create_technical_documentation_tasks_with_data
+# Maximum number of teams executing concurrently
+DEFAULT_MAX_CONCURRENT_TEAMS = 3
 
 class DynamicWorkflowExecutor:
     """Executes workflows based on user-selected agents and teams"""
     
-    def __init__(self):
-        self.agent_creators = {
-            AgentTeam.RESEARCH_ANALYSIS: create_research_analysis_agents_with_context,
-            AgentTeam.DATA_STRATEGY: create_data_strategy_agents_with_context,
-            AgentTeam.COMPLIANCE_RISK: create_compliance_risk_agents_with_context,
-            AgentTeam.INFORMATION_MANAGEMENT: create_information_management_agents_with_context,
-            AgentTeam.TENDER_RESPONSE: create_tender_response_agents_with_context,
-            AgentTeam.PROJECT_DELIVERY: create_project_delivery_agents_with_context,
-            AgentTeam.TECHNICAL_DOCUMENTATION: create_technical_documentation_agents_with_context
-        }
+    def __init__(self, max_concurrent_teams: int = DEFAULT_MAX_CONCURRENT_TEAMS):
+        self.max_concurrent_teams = max(1, max_concurrent_teams)
         
-        self.task_creators = {
-            AgentTeam.RESEARCH_ANALYSIS: create_research_analysis_tasks_with_data,
-            AgentTeam.DATA_STRATEGY: create_data_strategy_tasks_with_data,
-            AgentTeam.COMPLIANCE_RISK: create_compliance_risk_tasks_with_data,
-            AgentTeam.INFORMATION_MANAGEMENT: create_information_management_tasks_with_data,
-            AgentTeam.TENDER_RESPONSE: create_tender_response_tasks_with_data,
-            AgentTeam.PROJECT_DELIVERY: create_project_delivery_tasks_with_data,
-            AgentTeam.TECHNICAL_DOCUMENTATION: create_technical_documentation_tasks_with_data
-        }
+        self.engine = WorkflowEngine(self.max_concurrent_teams)
+    
+    def resolve_dependencies(self, teams_to_execute: List[AgentTeam]) -> Dict[AgentTeam, List[AgentTeam]]:
+        """
+        Map each selected team to the selected teams whose output it consumes
+        
+        Dependencies on teams that are not part of the run are replaced by that
+        team's own (selected) dependencies, so disabling a team never cuts a
+        downstream team off from the work that came before it.
+        
+        Args:
+            teams_to_execute: Teams selected for this run
+        
+        Returns:
+            Dictionary of team -> list of selected upstream teams
+        """
+        return agent_config.resolve_dependencies(teams_to_execute)
+    
+    def get_execution_stages(self, teams_to_execute: List[AgentTeam]) -> List[List[AgentTeam]]:
+        """
+        Group the selected teams into stages that can run concurrently
+        
+        Args:
+            teams_to_execute: Teams selected for this run
+        
+        Returns:
+            List of stages; every team only depends on teams in earlier stages
+        
+        Raises:
+            ValueError: If the team dependencies contain a cycle
+        """
+        dependencies = self.resolve_dependencies(teams_to_execute)
+        stages = []
+        placed = set()
+        remaining = list(teams_to_execute)
+        
+        while remaining:
+            stage = [team for team in remaining if all(dep in placed for dep in dependencies[team])]
+            if not stage:
+                raise ValueError(f"Cyclic team dependencies: {[team.value for team in remaining]}")
+            stages.append(stage)
+            placed.update(stage)
+            remaining = [team for team in remaining if team not in placed]
+        
+        return stages
+    
+    def build_workflow_spec(self, teams_to_execute: List[AgentTeam]) -> WorkflowSpec:
+        """
+        Describe a run of the selected teams as a workflow spec for the workflow engine
+        
+        Args:
+            teams_to_execute: Teams selected for this run
+        
+        Returns:
+            WorkflowSpec whose stages follow the teams' configured dependencies
+        """
+        dependencies = self.resolve_dependencies(teams_to_execute)
+        return WorkflowSpec(
+            name="dynamic_workflow",
+            label="dynamic workflow",
+            stages=[
+                StageSpec(
+                    team=team_enum.value,
+                    depends_on=[dependency.value for dependency in dependencies[team_enum]],
+                    title=agent_config.teams[team_enum].name
+                )
+                for team_enum in teams_to_execute
+            ],
+            save_memory=False
+        )
     
     def execute_dynamic_workflow(
         self, 
@@ -61,11 +99,15 @@ class DynamicWorkflowExecutor:
         conversation_history: Optional[List[Any]] = None,
         use_native_function_calling: bool = False,
         document_context: Optional[str] = None,
-        custom_team_selection: Optional[List[AgentTeam]] = None
+        custom_team_selection: Optional[List[AgentTeam]] = None,
+        use_llm_cache: bool = True
     ) -> str:
         """
         Execute a dynamic workflow based on selected teams
         
+        Teams run as soon as the teams they depend on have finished, so
+        independent teams execute concurrently.
+        
         Args:
             query: User query
             llm: Language model
@@ -73,14 +115,18 @@ class DynamicWorkflowExecutor:
             use_native_function_calling: Whether to use native function calling
             document_context: Document context
             custom_team_selection: Custom team selection (if None, uses enabled teams)
+            use_llm_cache: Set to False to force fresh LLM responses for this run
         
         Returns:
-            Workflow execution result
+            Workflow execution result (output of the last team in workflow order)
         """
         
         try:
             print(f"🚀 Starting dynamic workflow execution for: {query}")
             
+            if not use_llm_cache:
+                llm = bypass_llm_cache(llm)
+            
             # Determine which teams to use
             if custom_team_selection:
                 teams_to_execute = custom_team_selection
@@ -92,78 +138,27 @@ class DynamicWorkflowExecutor:
             
             print(f"📋 Executing teams: {[team.value for team in teams_to_execute]}")
             
-            # Perform pre-search
-            print("🔍 Pre-searching data...")
-            similar_conversations = search_memory(query, n_results=3)
-            if similar_conversations:
-                print(f"🧠 Found {len(similar_conversations)} similar past conversations")
+            spec = self.build_workflow_spec(teams_to_execute)
             
-            search_results = search_web.run(query)
-            print(f"✅ Search completed, {len(search_results)} characters retrieved")
+            # The engine pre-searches, checkpoints and runs each team once its upstream teams have finished
+            workflow_result = self.engine.execute(
+                spec, query, llm, conversation_history, use_native_function_calling, document_context
+            )
+            results = workflow_result.team_results
             
-            # Execute teams sequentially
-            previous_result = None
-            
-            for i, team_enum in enumerate(teams_to_execute):
-                print(f"\n🔧 Executing Team {i+1}/{len(teams_to_execute)}: {team_enum.value}")
-                
-                # Create agents for this team
-                if team_enum not in self.agent_creators:
-                    print(f"⚠️ No agent creator found for team: {team_enum.value}")
-                    continue
-                
-                agents_dict = self.agent_creators[team_enum](llm, conversation_history, use_tools=False)
-                agents_list = list(agents_dict.values())
-                
-                print(f"✅ Created {len(agents_list)} agents for {team_enum.value}")
-                
-                # Create tasks for this team
-                if team_enum not in self.task_creators:
-                    print(f"⚠️ No task creator found for team: {team_enum.value}")
-                    continue
-                
-                # Use previous result as input for subsequent teams
-                input_data = previous_result if previous_result else search_results
-                
-                tasks = self.task_creators[team_enum](
-                    *agents_list, 
-                    query, 
-                    str(input_data), 
-                    conversation_history,
-                    document_context
-                )
-                
-                print(f"✅ Created {len(tasks)} tasks for {team_enum.value}")
-                
-                # Create and execute crew
-                crew = Crew(
-                    agents=agents_list,
-                    tasks=tasks,
-                    process=Process.sequential,
-                    verbose=True,
-                    max_rpm=5,
-                    max_execution_time=240,  # 4 minute timeout per team
-                    memory=False,
-                    share_crew=False
-                )
-                
-                # Execute team
-                team_result = crew.kickoff()
-                previous_result = team_result
-                
-                print(f"✅ Team {team_enum.value} completed: {len(str(team_result))} characters")
-                
-                # Add delay between teams to avoid rate limiting
-                if i < len(teams_to_execute) - 1:
-                    print("⏳ Waiting 10 seconds before next team...")
-                    time.sleep(10)
+            # The answer is the last team's output; an earlier team's output is not a substitute
+            final_team = teams_to_execute[-1]
+            final_result = results.get(final_team.value)
+            if not final_result:
+                error_msg = f"❌ Workflow execution failed: {agent_config.teams[final_team].name} produced no result"
+                print(error_msg)
+                return error_msg
             
             # Save to memory
-            if previous_result:
-                add_to_memory(query, str(previous_result))
-                print("💾 Result saved to memory")
+            add_to_memory(query, str(final_result))
+            print("💾 Result saved to memory")
             
-            return str(previous_result) if previous_result else "❌ Workflow execution failed"
+            return str(final_result)
             
         except Exception as e:
             error_msg = f"❌ Dynamic workflow execution failed: {str(e)}"
@@ -186,10 +181,14 @@ class DynamicWorkflowExecutor:
         else:
             teams_to_execute = [team.team for team in agent_config.get_workflow_order()]
         
+        dependencies = self.resolve_dependencies(teams_to_execute)
+        stages = self.get_execution_stages(teams_to_execute)
+        
         preview = {
             "total_teams": len(teams_to_execute),
             "teams": [],
-            "estimated_duration": len(teams_to_execute) * 4,  # 4 minutes per team
+            "stages": [[team.value for team in stage] for stage in stages],
+            "estimated_duration": len(stages) * 4,  # 4 minutes per stage on the critical path
             "total_agents": 0
         }
         
@@ -201,7 +200,8 @@ class DynamicWorkflowExecutor:
                 "name": team_info.name,
                 "team": team_enum.value,
                 "agents": len(enabled_agents),
-                "agent_names": [agent.role for agent in enabled_agents]
+                "agent_names": [agent.role for agent in enabled_agents],
+                "depends_on": [team.value for team in dependencies[team_enum]]
             })
             
             preview["total_agents"] += len(enabled_agents)
@@ -218,12 +218,31 @@ def run_dynamic_workflow(
     conversation_history: Optional[List[Any]] = None,
     use_native_function_calling: bool = False,
     document_context: Optional[str] = None,
-    custom_team_selection: Optional[List[AgentTeam]] = None
+    custom_team_selection: Optional[List[AgentTeam]] = None,
+    use_llm_cache: bool = True
 ) -> str:
     """Run a dynamic workflow with selected agents"""
     return dynamic_executor.execute_dynamic_workflow(
         query, llm, conversation_history, use_native_function_calling, 
-        document_context, custom_team_selection
+        document_context, custom_team_selection, use_llm_cache
+    )
+
+def stream_dynamic_workflow(
+    query: str, 
+    llm, 
+    conversation_history: Optional[List[Any]] = None,
+    use_native_function_calling: bool = False,
+    document_context: Optional[str] = None,
+    custom_team_selection: Optional[List[AgentTeam]] = None,
+    use_llm_cache: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """Run a dynamic workflow in the background and yield its streaming LLM events"""
+    return stream_workflow(
+        llm,
+        lambda streaming_llm: dynamic_executor.execute_dynamic_workflow(
+            query, streaming_llm, conversation_history, use_native_function_calling, 
+            document_context, custom_team_selection, use_llm_cache
+        )
     )
 
 def get_workflow_preview(custom_team_selection: Optional[List[AgentTeam]] = None) -> Dict[str, Any]:
@@ -5,7 +5,7 @@ This module handles LLM initialization, configuration, and status checking.
 """
 
 import streamlit as st
-from crewai import LLM
+from agent_tools.rate_limiter import RateLimitedLLM
 import ollama
 
 
@@ -17,7 +17,7 @@ def initialize_llm(use_cloud=False, api_key=None, _cache_key=None):
         
         if use_cloud and api_key:
             # Create LLM for Ollama Cloud (original working configuration)
-            llm = LLM(
+            llm = RateLimitedLLM(
                 model="ollama/gpt-oss:20b",
                 base_url="https://ollama.com",
                 headers={'Authorization': f'Bearer {api_key}'},
@@ -28,7 +28,7 @@ def initialize_llm(use_cloud=False, api_key=None, _cache_key=None):
         else:
             # Create LLM for local Ollama
             ollama.list()
-            llm = LLM(
+            llm = RateLimitedLLM(
                 model="ollama/llama3.1:latest",
                 base_url="http://localhost:11434",
                 temperature=0.5,
@@ -50,9 +50,10 @@ def initialize_llm(use_cloud=False, api_key=None, _cache_key=None):
 def check_ollama_cloud_status():
     """Check Ollama Cloud service status"""
     try:
-        import requests
-        status_response = requests.get("https://ollama.com/api/tags", timeout=5)
-        if status_response.status_code == 200:
+        from agent_tools.http_session import http_get
+        with http_get("https://ollama.com/api/tags", timeout=5) as status_response:
+            status_ok = status_response.status_code == 200
+        if status_ok:
             return True, "🚀 **Using Ollama Cloud (Turbo)** - Access to 120B+ models with faster inference ✅"
         else:
             return False, "⚠️ **Ollama Cloud Status** - Service may be experiencing issues. Retry logic enabled."
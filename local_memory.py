@@ -10,6 +10,44 @@ from chromadb.config import Settings
 import os
 from typing import List, Dict, Any
 import json
+import threading
+import time
+
+# Crockford base32 alphabet used for ULID encoding
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ulid_lock = threading.Lock()
+_last_ulid_time = 0
+_last_ulid_random = 0
+
+
+def generate_ulid() -> str:
+    """
+    Generate a lexicographically sortable, collision-free ULID
+    
+    IDs created within the same millisecond in this process are made
+    monotonic by incrementing the random component.
+    
+    Returns:
+        26-character ULID string
+    """
+    global _last_ulid_time, _last_ulid_random
+    
+    with _ulid_lock:
+        timestamp = int(time.time() * 1000)
+        if timestamp <= _last_ulid_time:
+            timestamp = _last_ulid_time
+            randomness = (_last_ulid_random + 1) & ((1 << 80) - 1)
+        else:
+            randomness = int.from_bytes(os.urandom(10), "big")
+        _last_ulid_time = timestamp
+        _last_ulid_random = randomness
+    
+    value = (timestamp << 80) | randomness
+    encoded = []
+    for _ in range(26):
+        encoded.append(_ULID_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(encoded))
 
 
 class LocalMemoryManager:
@@ -44,34 +82,81 @@ class LocalMemoryManager:
             metadata={"description": "Stores conversation history and context"}
         )
     
-    def add_conversation(self, query: str, response: str, metadata: Dict[str, Any] = None):
+    def _build_conversation_record(self, query: str, response: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """
-        Add a conversation to memory
+        Build the ID, document and metadata stored for a conversation
         
         Args:
             query: The user's query
             response: The AI's response
             metadata: Additional metadata to store
+            
+        Returns:
+            Dictionary with the conversation ID, document and metadata
         """
         if metadata is None:
             metadata = {}
         
-        # Create a unique ID for this conversation
-        conversation_id = f"conv_{len(self.collection.get()['ids'])}"
-        
-        # Store the conversation
-        self.collection.add(
-            documents=[f"Query: {query}\nResponse: {response}"],
-            metadatas=[{
+        return {
+            "id": f"conv_{generate_ulid()}",
+            "document": f"Query: {query}\nResponse: {response}",
+            "metadata": {
                 "query": query,
                 "response": response,
                 "timestamp": metadata.get("timestamp", ""),
                 "type": "conversation"
-            }],
-            ids=[conversation_id]
+            }
+        }
+    
+    def add_conversation(self, query: str, response: str, metadata: Dict[str, Any] = None):
+        """
+        Add a conversation to memory
+        
+        Args:
+            query: The user's query
+            response: The AI's response
+            metadata: Additional metadata to store
+        """
+        record = self._build_conversation_record(query, response, metadata)
+        
+        # Store the conversation
+        self.collection.add(
+            documents=[record["document"]],
+            metadatas=[record["metadata"]],
+            ids=[record["id"]]
         )
         
-        return conversation_id
+        return record["id"]
+    
+    def add_conversations(self, conversations: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several conversations to memory with a single write
+        
+        Args:
+            conversations: List of dictionaries with 'query', 'response' and optional 'metadata'
+            
+        Returns:
+            List of conversation IDs in input order
+        """
+        if not conversations:
+            return []
+        
+        records = [
+            self._build_conversation_record(
+                conversation.get("query", ""),
+                conversation.get("response", ""),
+                conversation.get("metadata")
+            )
+            for conversation in conversations
+        ]
+        
+        self.collection.add(
+            documents=[record["document"] for record in records],
+            metadatas=[record["metadata"] for record in records],
+            ids=[record["id"] for record in records]
+        )
+        
+        return [record["id"] for record in records]
     
     def search_similar(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
         """
@@ -156,6 +241,11 @@ def add_to_memory(query: str, response: str, metadata: Dict[str, Any] = None):
     return memory_manager.add_conversation(query, response, metadata)
 
 
+def add_conversations_to_memory(conversations: List[Dict[str, Any]]) -> List[str]:
+    """Add several conversations to memory in one write"""
+    return memory_manager.add_conversations(conversations)
+
+
 def search_memory(query: str, n_results: int = 3) -> List[Dict[str, Any]]:
     """Search for similar past conversations"""
     return memory_manager.search_similar(query, n_results)
@@ -6,7 +6,7 @@ This package provides database connectivity and management utilities for Oracle
 
 from .database_config import config, DatabaseConfig
 from .database_manager import DatabaseManager, get_db_manager
-from .database_utils import DatabaseUtils, test_connection, get_connection_info
+from .database_utils import DatabaseUtils, test_connection, get_connection_info, get_pool_stats
 
 __all__ = [
     'config',
@@ -15,5 +15,6 @@ __all__ = [
     'get_db_manager',
     'DatabaseUtils',
     'test_connection',
-    'get_connection_info'
+    'get_connection_info',
+    'get_pool_stats'
 ]
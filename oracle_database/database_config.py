@@ -36,6 +36,16 @@ class DatabaseConfig:
     # Character set
     CHARACTER_SET = "AL32UTF8"
     
+    # Vector search settings (must match the embedding model, 384 for ChromaDB's default)
+    VECTOR_DIMENSIONS = int(os.getenv("ORACLE_VECTOR_DIMENSIONS", "384"))
+    VECTOR_INDEX_TYPE = os.getenv("ORACLE_VECTOR_INDEX_TYPE", "HNSW").upper()
+    VECTOR_TARGET_ACCURACY = int(os.getenv("ORACLE_VECTOR_TARGET_ACCURACY", "95"))
+    
+    # Query fetch settings (rows per round trip, rows returned with the execute, row cap for ad-hoc queries)
+    QUERY_ARRAYSIZE = int(os.getenv("ORACLE_QUERY_ARRAYSIZE", "1000"))
+    QUERY_PREFETCH_ROWS = int(os.getenv("ORACLE_QUERY_PREFETCH_ROWS", "1000"))
+    QUERY_MAX_ROWS = int(os.getenv("ORACLE_QUERY_MAX_ROWS", "10000"))
+    
     # Volume settings
     VOLUME_NAME = "oracle_data"
     VOLUME_PATH = "/opt/oracle/oradata"
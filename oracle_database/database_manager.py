@@ -3,17 +3,55 @@ Database Connection Utilities for Web Knowledge System
 Provides connection management and utility functions for Oracle Database 23ai
 """
 
+import os
+import time
+import array
+import atexit
+import threading
 import oracledb
 import logging
 import json
-from typing import Dict, Any, List, Optional, Union
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union, Iterator, Tuple
 from contextlib import contextmanager
 from .database_config import config
+from .database_utils import fetch_lobs_as_values
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Chunks inserted and committed per executemany batch
+CHUNK_INSERT_BATCH_SIZE = int(os.getenv('ORACLE_CHUNK_BATCH_SIZE', '500'))
+
+# Longest string bound as VARCHAR2; longer values in a batch are bound as CLOBs
+MAX_VARCHAR_BIND_BYTES = 4000
+
+# Read-through cache settings (a TTL of 0 disables the cache)
+CONFIG_CACHE_TTL_SECONDS = float(os.getenv('ORACLE_CONFIG_CACHE_TTL_SECONDS', '300'))
+MEMORY_CACHE_TTL_SECONDS = float(os.getenv('ORACLE_MEMORY_CACHE_TTL_SECONDS', '60'))
+CACHE_MAX_ENTRIES = int(os.getenv('ORACLE_CACHE_MAX_ENTRIES', '1000'))
+
+# Seconds between batched agent_memory access-count writes (0 writes on every read)
+MEMORY_ACCESS_FLUSH_SECONDS = float(os.getenv('ORACLE_MEMORY_ACCESS_FLUSH_SECONDS', '5'))
+
+def to_vector(embedding: Union[str, List[float], None]) -> Optional[array.array]:
+    """
+    Convert an embedding to the float32 array bound to a VECTOR column
+    
+    Args:
+        embedding: Sequence of floats, its JSON text, or None
+    
+    Returns:
+        array.array of float32 values, or None
+    """
+    if embedding is None:
+        return None
+    if isinstance(embedding, str):
+        embedding = json.loads(embedding)
+    return array.array('f', (float(value) for value in embedding))
+
 class DatabaseConnection:
     """Manages Oracle Database connections with connection pooling"""
     
@@ -49,18 +87,14 @@ class DatabaseConnection:
                 connection = self.pool.acquire()
             else:
                 # Fallback to direct connection
-                dsn = cx_Oracle.makedsn(
-                    self.config['host'],
-                    self.config['port'],
-                    service_name=self.config['service_name']
-                )
-                connection = cx_Oracle.connect(
-                    self.config['username'],
-                    self.config['password'],
-                    dsn
+                dsn = f"{self.config['host']}:{self.config['port']}/{self.config['service_name']}"
+                connection = oracledb.connect(
+                    user=self.config['username'],
+                    password=self.config['password'],
+                    dsn=dsn
                 )
             yield connection
-        except cx_Oracle.Error as e:
+        except oracledb.Error as e:
             logger.error(f"Database connection error: {e}")
             if connection:
                 connection.rollback()
@@ -71,28 +105,38 @@ class DatabaseConnection:
             elif connection:
                 connection.close()
     
-    def execute_query(self, sql: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Execute SELECT query and return results as list of dictionaries"""
+    def iter_query(self, sql: str, params: Dict[str, Any] = None,
+                   batch_size: int = config.QUERY_ARRAYSIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Execute SELECT query and yield its rows as lists of dictionaries, one fetch batch at a time"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(sql, params or {})
-                
-                # Get column names
-                columns = [desc[0] for desc in cursor.description]
-                
-                # Fetch all results
-                results = []
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
-                
-                cursor.close()
-                return results
-        except cx_Oracle.Error as e:
+                cursor.arraysize = max(1, batch_size)
+                cursor.prefetchrows = config.QUERY_PREFETCH_ROWS
+                # Rows outlive the pooled connection, so LOB columns are read with the row
+                cursor.outputtypehandler = fetch_lobs_as_values
+                try:
+                    cursor.execute(sql, params or {})
+                    
+                    # Get column names
+                    columns = [desc[0] for desc in cursor.description]
+                    
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        yield [dict(zip(columns, row)) for row in rows]
+                finally:
+                    cursor.close()
+        except oracledb.Error as e:
             logger.error(f"Query execution failed: {e}")
             logger.error(f"SQL: {sql}")
             raise
     
+    def execute_query(self, sql: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Execute SELECT query and return results as list of dictionaries"""
+        return [row for batch in self.iter_query(sql, params) for row in batch]
+    
     def execute_update(self, sql: str, params: Dict[str, Any] = None) -> int:
         """Execute INSERT/UPDATE/DELETE and return number of affected rows"""
         try:
@@ -103,7 +147,7 @@ class DatabaseConnection:
                 rowcount = cursor.rowcount
                 cursor.close()
                 return rowcount
-        except cx_Oracle.Error as e:
+        except oracledb.Error as e:
             logger.error(f"Update execution failed: {e}")
             logger.error(f"SQL: {sql}")
             raise
@@ -118,7 +162,7 @@ class DatabaseConnection:
                 rowcount = cursor.rowcount
                 cursor.close()
                 return rowcount
-        except cx_Oracle.Error as e:
+        except oracledb.Error as e:
             logger.error(f"Batch execution failed: {e}")
             logger.error(f"SQL: {sql}")
             raise
@@ -135,11 +179,223 @@ class DatabaseConnection:
             self.pool.close()
             logger.info("Connection pool closed")
 
+class TTLCache:
+    """
+    In-process LRU cache whose entries expire after a TTL
+    
+    Lookups that found nothing can be cached as None, so missing keys do not
+    reach the database on every call either. Each invalidation bumps a
+    generation counter; set() drops values read before the latest write.
+    """
+    
+    def __init__(self, ttl_seconds: float, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.generation = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+    
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        """
+        Look up a cached value
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            (found, value); found is False on a miss, an expired entry or a disabled cache
+        """
+        if self.ttl_seconds <= 0:
+            return False, None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics['misses'] += 1
+                return False, None
+            
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.metrics['expired'] += 1
+                self.metrics['misses'] += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            self.metrics['hits'] += 1
+            return True, value
+    
+    def set(self, key: Any, value: Any, ttl_seconds: Optional[float] = None, generation: Optional[int] = None):
+        """
+        Cache a value
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl_seconds: Shorter TTL for this entry (capped at the cache TTL)
+            generation: Generation read before the value was loaded; stale loads are dropped
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            self.metrics['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics['evictions'] += 1
+    
+    def invalidate(self, key: Any):
+        """Drop a cached value after its row was written"""
+        with self._lock:
+            self.generation += 1
+            if self._entries.pop(key, None) is not None:
+                self.metrics['invalidations'] += 1
+    
+    def clear(self) -> int:
+        """Drop every cached value and return how many were dropped"""
+        with self._lock:
+            self.generation += 1
+            cleared = len(self._entries)
+            self._entries.clear()
+            return cleared
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss metrics and the current size of the cache"""
+        with self._lock:
+            stats = dict(self.metrics)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['ttl_seconds'] = self.ttl_seconds
+        stats['max_entries'] = self.max_entries
+        return stats
+
+class AccessCountBuffer:
+    """
+    Batches agent_memory access-count updates
+    
+    Reads only bump an in-process counter; a background thread writes the
+    counters with one array UPDATE per flush interval, and close() writes
+    whatever is left. Counts that fail to write are kept for the next flush.
+    """
+    
+    UPDATE_SQL = """
+    UPDATE agent_memory 
+    SET last_accessed = :last_accessed, access_count = access_count + :accesses
+    WHERE agent_name = :agent_name 
+    AND memory_type = :memory_type 
+    AND memory_key = :memory_key
+    """
+    
+    def __init__(self, db: DatabaseConnection, flush_interval: float = MEMORY_ACCESS_FLUSH_SECONDS):
+        self.db = db
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[str, str, str], List[Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.metrics = {'recorded': 0, 'flushes': 0, 'rows_written': 0, 'failures': 0}
+    
+    def record(self, key: Tuple[str, str, str]):
+        """
+        Count one read of an agent memory entry
+        
+        Args:
+            key: (agent_name, memory_type, memory_key)
+        """
+        with self._lock:
+            entry = self._pending.setdefault(key, [0, None])
+            entry[0] += 1
+            entry[1] = datetime.now()
+            self.metrics['recorded'] += 1
+            
+            if self.flush_interval > 0 and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="memory-access-flush", daemon=True)
+                self._thread.start()
+        
+        if self.flush_interval <= 0:
+            self.flush()
+    
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write the pending access counts
+        
+        Returns:
+            Number of memory entries updated
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            
+            params_list = [
+                {
+                    'agent_name': agent_name,
+                    'memory_type': memory_type,
+                    'memory_key': memory_key,
+                    'accesses': accesses,
+                    'last_accessed': last_accessed
+                }
+                for (agent_name, memory_type, memory_key), (accesses, last_accessed) in pending.items()
+            ]
+            
+            try:
+                self.db.execute_batch(self.UPDATE_SQL, params_list)
+            except Exception as e:
+                logger.warning(f"Failed to write {len(params_list)} memory access counts, retrying on next flush: {e}")
+                with self._lock:
+                    for key, (accesses, last_accessed) in pending.items():
+                        entry = self._pending.setdefault(key, [0, last_accessed])
+                        entry[0] += accesses
+                        entry[1] = max(entry[1], last_accessed)
+                    self.metrics['failures'] += 1
+                return 0
+            
+            with self._lock:
+                self.metrics['flushes'] += 1
+                self.metrics['rows_written'] += len(params_list)
+            return len(params_list)
+    
+    def close(self):
+        """Stop the background thread and write the remaining counts"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get flush metrics and the number of entries waiting to be written"""
+        with self._lock:
+            stats = dict(self.metrics)
+            stats['pending'] = len(self._pending)
+        stats['flush_interval'] = self.flush_interval
+        return stats
+
 class DatabaseManager:
     """High-level database operations for the Web Knowledge System"""
     
     def __init__(self, connection_config: Dict[str, Any] = None):
         self.db = DatabaseConnection(connection_config)
+        self.last_chunk_insert_stats: Dict[str, Any] = {}
+        
+        # Config and agent memory are read far more often than written
+        self.config_cache = TTLCache(CONFIG_CACHE_TTL_SECONDS)
+        self.memory_cache = TTLCache(MEMORY_CACHE_TTL_SECONDS)
+        self.access_counts = AccessCountBuffer(self.db)
+        atexit.register(self.access_counts.close)
     
     # Document operations
     def save_document(self, filename: str, file_path: str, file_type: str, 
@@ -166,7 +422,7 @@ class DatabaseManager:
         
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            doc_id = cursor.var(cx_Oracle.NUMBER)
+            doc_id = cursor.var(oracledb.DB_TYPE_NUMBER)
             params['doc_id'] = doc_id
             cursor.execute(sql, params)
             conn.commit()
@@ -193,33 +449,101 @@ class DatabaseManager:
             return False
     
     def save_document_chunk(self, document_id: int, chunk_text: str, 
-                           chunk_index: int, embedding_vector: str = None,
+                           chunk_index: int, embedding_vector: Union[str, List[float]] = None,
                            metadata: Dict[str, Any] = None) -> int:
         """Save document chunk"""
+        return self.save_document_chunks(document_id, [{
+            'chunk_text': chunk_text,
+            'chunk_index': chunk_index,
+            'embedding_vector': embedding_vector,
+            'metadata': metadata
+        }])[0]
+    
+    def save_document_chunks(self, document_id: int, chunks: List[Union[str, Dict[str, Any]]],
+                             batch_size: int = CHUNK_INSERT_BATCH_SIZE) -> List[int]:
+        """
+        Save many document chunks with array DML
+        
+        Each batch is inserted with one executemany round trip, its chunk IDs
+        come back in a RETURNING array, and it is committed before the next
+        batch starts. Throughput is logged and kept in last_chunk_insert_stats.
+        
+        Args:
+            document_id: Document the chunks belong to
+            chunks: Chunk texts, or dicts with 'chunk_text' and optional 'chunk_index'
+                (defaults to the position in the list), 'embedding_vector' (list of
+                floats or its JSON text) and 'metadata'
+            batch_size: Chunks inserted and committed per batch
+        
+        Returns:
+            Chunk IDs in the order of the chunks
+        """
         sql = """
         INSERT INTO document_chunks (document_id, chunk_text, chunk_index, 
                                     chunk_size, embedding_vector, metadata)
-        VALUES (:doc_id, :chunk_text, :chunk_index, :chunk_size, 
-                :embedding_vector, :metadata)
-        RETURNING chunk_id INTO :chunk_id
+        VALUES (:1, :2, :3, :4, :5, :6)
+        RETURNING chunk_id INTO :7
         """
         
-        params = {
-            'doc_id': document_id,
-            'chunk_text': chunk_text,
-            'chunk_index': chunk_index,
-            'chunk_size': len(chunk_text),
-            'embedding_vector': embedding_vector,
-            'metadata': json.dumps(metadata) if metadata else None
-        }
+        rows = []
+        for position, chunk in enumerate(chunks):
+            if isinstance(chunk, str):
+                chunk = {'chunk_text': chunk}
+            chunk_text = chunk['chunk_text']
+            metadata = chunk.get('metadata')
+            rows.append((
+                document_id,
+                chunk_text,
+                chunk.get('chunk_index', position),
+                len(chunk_text),
+                to_vector(chunk.get('embedding_vector')),
+                json.dumps(metadata) if metadata else None
+            ))
+        
+        if not rows:
+            return []
+        
+        batch_size = max(1, batch_size)
+        chunk_ids = []
+        start_time = time.perf_counter()
         
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            chunk_id = cursor.var(cx_Oracle.NUMBER)
-            params['chunk_id'] = chunk_id
-            cursor.execute(sql, params)
-            conn.commit()
-            return int(chunk_id.getvalue()[0])
+            try:
+                for offset in range(0, len(rows), batch_size):
+                    batch = rows[offset:offset + batch_size]
+                    chunk_id_var = cursor.var(oracledb.DB_TYPE_NUMBER, arraysize=len(batch))
+                    
+                    # Text columns are CLOBs; values too long for a VARCHAR2 bind are sent as LOBs
+                    input_sizes = [None] * 4 + [oracledb.DB_TYPE_VECTOR, None, chunk_id_var]
+                    for column in (1, 5):
+                        if any(row[column] and len(row[column].encode()) > MAX_VARCHAR_BIND_BYTES for row in batch):
+                            input_sizes[column] = oracledb.DB_TYPE_CLOB
+                    cursor.setinputsizes(*input_sizes)
+                    
+                    cursor.executemany(sql, batch)
+                    conn.commit()
+                    chunk_ids.extend(int(chunk_id_var.getvalue(i)[0]) for i in range(len(batch)))
+            except oracledb.Error as e:
+                logger.error(f"Chunk insert for document {document_id} failed after {len(chunk_ids)} of {len(rows)} chunks were committed: {e}")
+                raise
+            finally:
+                cursor.close()
+        
+        elapsed = time.perf_counter() - start_time
+        self.last_chunk_insert_stats = {
+            'document_id': document_id,
+            'rows': len(chunk_ids),
+            'batches': (len(rows) + batch_size - 1) // batch_size,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(len(chunk_ids) / elapsed, 1) if elapsed > 0 else float(len(chunk_ids))
+        }
+        logger.info(
+            f"Saved {len(chunk_ids)} chunks for document {document_id} in {elapsed:.2f}s "
+            f"({self.last_chunk_insert_stats['rows_per_second']:.0f} rows/sec, "
+            f"{self.last_chunk_insert_stats['batches']} batches)"
+        )
+        return chunk_ids
     
     # Agent task operations
     def create_task(self, task_name: str, task_type: str, description: str = None,
@@ -242,7 +566,7 @@ class DatabaseManager:
         
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            task_id = cursor.var(cx_Oracle.NUMBER)
+            task_id = cursor.var(oracledb.DB_TYPE_NUMBER)
             params['task_id'] = task_id
             cursor.execute(sql, params)
             conn.commit()
@@ -309,47 +633,67 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to save memory: {e}")
             return False
+        finally:
+            self.memory_cache.invalidate((agent_name, memory_type, memory_key))
     
     def get_memory(self, agent_name: str, memory_type: str, memory_key: str) -> Optional[Any]:
-        """Get agent memory"""
-        sql = """
-        SELECT memory_value FROM agent_memory 
-        WHERE agent_name = :agent_name 
-        AND memory_type = :memory_type 
-        AND memory_key = :memory_key
-        AND (expires_date IS NULL OR expires_date > CURRENT_TIMESTAMP)
         """
+        Get agent memory
         
-        params = {
-            'agent_name': agent_name,
-            'memory_type': memory_type,
-            'memory_key': memory_key
-        }
+        Values are served from the memory cache for up to MEMORY_CACHE_TTL_SECONDS
+        (never past their expires_date), and access counts are written in batches.
+        """
+        key = (agent_name, memory_type, memory_key)
+        found, memory_value = self.memory_cache.get(key)
         
-        try:
-            results = self.db.execute_query(sql, params)
-            if results:
-                # Update access count
-                update_sql = """
-                UPDATE agent_memory 
-                SET last_accessed = CURRENT_TIMESTAMP, access_count = access_count + 1
-                WHERE agent_name = :agent_name 
-                AND memory_type = :memory_type 
-                AND memory_key = :memory_key
-                """
-                self.db.execute_update(update_sql, params)
-                return json.loads(results[0]['memory_value'])
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get memory: {e}")
+        if not found:
+            sql = """
+            SELECT memory_value, expires_date FROM agent_memory 
+            WHERE agent_name = :agent_name 
+            AND memory_type = :memory_type 
+            AND memory_key = :memory_key
+            AND (expires_date IS NULL OR expires_date > CURRENT_TIMESTAMP)
+            """
+            
+            params = {
+                'agent_name': agent_name,
+                'memory_type': memory_type,
+                'memory_key': memory_key
+            }
+            
+            try:
+                generation = self.memory_cache.generation
+                results = self.db.execute_query(sql, params)
+            except Exception as e:
+                logger.error(f"Failed to get memory: {e}")
+                return None
+            
+            memory_value = results[0]['MEMORY_VALUE'] if results else None
+            expires_date = results[0]['EXPIRES_DATE'] if results else None
+            ttl = (expires_date - datetime.now()).total_seconds() if expires_date else None
+            self.memory_cache.set(key, memory_value, ttl, generation)
+        
+        if memory_value is None:
             return None
+        
+        self.access_counts.record(key)
+        # The cache keeps the JSON text so callers never share a mutable value
+        return json.loads(memory_value)
     
     # Configuration operations
     def get_config(self, config_key: str) -> Optional[str]:
-        """Get system configuration value"""
+        """Get system configuration value (cached for CONFIG_CACHE_TTL_SECONDS)"""
+        found, config_value = self.config_cache.get(config_key)
+        if found:
+            return config_value
+        
+        generation = self.config_cache.generation
         sql = "SELECT config_value FROM system_config WHERE config_key = :key AND is_active = 'Y'"
         results = self.db.execute_query(sql, {'key': config_key})
-        return results[0]['config_value'] if results else None
+        config_value = results[0]['CONFIG_VALUE'] if results else None
+        
+        self.config_cache.set(config_key, config_value, generation=generation)
+        return config_value
     
     def set_config(self, config_key: str, config_value: str, 
                    config_type: str = 'STRING', description: str = None) -> bool:
@@ -381,9 +725,25 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to set config: {e}")
             return False
+        finally:
+            self.config_cache.invalidate(config_key)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get metrics for the config and memory caches and the pending access-count writes"""
+        return {
+            'config': self.config_cache.get_stats(),
+            'memory': self.memory_cache.get_stats(),
+            'access_counts': self.access_counts.get_stats()
+        }
+    
+    def clear_caches(self):
+        """Drop all cached config and memory values"""
+        self.config_cache.clear()
+        self.memory_cache.clear()
     
     def close(self):
         """Close database connections"""
+        self.access_counts.close()
         self.db.close_pool()
 
 # Global database manager instance
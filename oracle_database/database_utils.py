@@ -2,46 +2,345 @@
 Database Utilities for Web Knowledge System
 
 This module provides utility functions for database operations and management.
+All DatabaseUtils instances borrow connections from one process-wide pool, so
+Streamlit reruns reuse logged-in sessions instead of connecting every time.
 """
 
+import os
+import time
+import logging
+import threading
 import oracledb
 import pandas as pd
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator
 from oracle_database.database_config import config
 from datetime import datetime
 import json
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool settings
+POOL_MIN = int(os.getenv('ORACLE_POOL_MIN', '1'))
+POOL_MAX = int(os.getenv('ORACLE_POOL_MAX', '8'))
+POOL_INCREMENT = int(os.getenv('ORACLE_POOL_INCREMENT', '1'))
+POOL_PING_INTERVAL = int(os.getenv('ORACLE_POOL_PING_INTERVAL', '60'))        # Seconds idle before a connection is pinged on acquire
+POOL_IDLE_TIMEOUT = int(os.getenv('ORACLE_POOL_IDLE_TIMEOUT', '300'))         # Seconds before idle connections above POOL_MIN are closed
+POOL_WAIT_TIMEOUT = int(os.getenv('ORACLE_POOL_WAIT_TIMEOUT', '5000'))        # Milliseconds to wait for a free connection
+STATEMENT_CACHE_SIZE = int(os.getenv('ORACLE_STATEMENT_CACHE_SIZE', '50'))    # Prepared statements cached per connection
+
+# Number of recent checkouts used for latency percentiles
+LATENCY_WINDOW = 500
+
+
+class PoolMetrics:
+    """Thread-safe connection checkout counters and latencies"""
+    
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.failed = 0
+        self.dropped = 0
+        self.acquire_ms = deque(maxlen=window)
+        self.hold_ms = deque(maxlen=window)
+    
+    def record_checkout(self, acquire_ms: float, hold_ms: float):
+        with self._lock:
+            self.acquired += 1
+            self.acquire_ms.append(acquire_ms)
+            self.hold_ms.append(hold_ms)
+    
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+    
+    def record_drop(self):
+        with self._lock:
+            self.dropped += 1
+    
+    @staticmethod
+    def _summary(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(values)
+        return {
+            'avg': round(sum(ordered) / len(ordered), 2),
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            'max': round(ordered[-1], 2)
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkouts': self.acquired,
+                'failed_checkouts': self.failed,
+                'dropped_connections': self.dropped,
+                'acquire_ms': self._summary(list(self.acquire_ms)),
+                'hold_ms': self._summary(list(self.hold_ms))
+            }
+
+
+# Process-wide pools by (dsn, user), created on first use
+_pools: Dict[tuple, Any] = {}
+_pool_lock = threading.Lock()
+pool_metrics = PoolMetrics()
+
+
+def get_pool(connection_config: Dict[str, Any] = None):
+    """
+    Get the shared connection pool for a connection configuration
+    
+    Args:
+        connection_config: Connection settings (defaults to the application connection)
+    
+    Returns:
+        oracledb ConnectionPool
+    
+    Raises:
+        oracledb.Error: If the pool cannot be created
+    """
+    conn_config = connection_config or config.get_app_connection_config()
+    dsn = f"{conn_config['host']}:{conn_config['port']}/{conn_config['service_name']}"
+    key = (dsn, conn_config['username'])
+    
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = oracledb.create_pool(
+                user=conn_config['username'],
+                password=conn_config['password'],
+                dsn=dsn,
+                min=POOL_MIN,
+                max=POOL_MAX,
+                increment=POOL_INCREMENT,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=POOL_WAIT_TIMEOUT,
+                timeout=POOL_IDLE_TIMEOUT,
+                ping_interval=POOL_PING_INTERVAL,
+                stmtcachesize=STATEMENT_CACHE_SIZE
+            )
+            _pools[key] = pool
+            logger.info(f"Database connection pool created for {dsn} (min {POOL_MIN}, max {POOL_MAX})")
+        return pool
+
+
+def close_pools():
+    """Close every shared connection pool"""
+    with _pool_lock:
+        for pool in _pools.values():
+            try:
+                pool.close(force=True)
+            except oracledb.Error as e:
+                logger.warning(f"Failed to close connection pool: {e}")
+        _pools.clear()
+
+
+def get_pool_stats(connection_config: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Get pool size and checkout latency metrics
+    
+    Args:
+        connection_config: Connection settings (defaults to the application connection)
+    
+    Returns:
+        Dictionary with pool sizes, statement cache size and checkout latencies
+    """
+    stats = pool_metrics.snapshot()
+    conn_config = connection_config or config.get_app_connection_config()
+    key = (f"{conn_config['host']}:{conn_config['port']}/{conn_config['service_name']}", conn_config['username'])
+    pool = _pools.get(key)
+    
+    stats['pool_created'] = pool is not None
+    if pool is not None:
+        stats.update({
+            'opened': pool.opened,
+            'busy': pool.busy,
+            'min': pool.min,
+            'max': pool.max,
+            'statement_cache_size': pool.stmtcachesize,
+            'ping_interval': pool.ping_interval
+        })
+    return stats
+
+
+def fetch_lobs_as_values(cursor, metadata):
+    """Output type handler that fetches CLOBs and BLOBs as str and bytes"""
+    if metadata.type_code is oracledb.DB_TYPE_CLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    if metadata.type_code is oracledb.DB_TYPE_BLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+
+
+class QueryStream:
+    """
+    Iterates over a query's result set one fetch batch at a time
+    
+    A pooled connection is held only while iterating and is returned once the
+    result set is exhausted, the row cap is reached or the consumer stops.
+    columns, rows and truncated are filled in as batches are produced.
+    """
+    
+    def __init__(self, utils: 'DatabaseUtils', query: str, params: Dict = None,
+                 batch_size: int = config.QUERY_ARRAYSIZE, prefetch_rows: int = config.QUERY_PREFETCH_ROWS,
+                 max_rows: Optional[int] = None, as_arrow: bool = False):
+        """
+        Initialize the stream (the query runs when iteration starts)
+        
+        Args:
+            utils: DatabaseUtils providing pooled connections
+            query: SELECT statement
+            params: Bind variables
+            batch_size: Rows per fetch round trip and per yielded batch (cursor.arraysize)
+            prefetch_rows: Rows returned together with the execute (cursor.prefetchrows)
+            max_rows: Stop after this many rows and set truncated if more remain
+            as_arrow: Yield pyarrow RecordBatches instead of DataFrames
+        """
+        self.utils = utils
+        self.query = query
+        self.params = params
+        self.batch_size = max(1, batch_size)
+        self.prefetch_rows = max(0, prefetch_rows)
+        self.max_rows = max_rows
+        self.as_arrow = as_arrow
+        
+        self.columns: List[str] = []
+        self.rows = 0
+        self.batches = 0
+        self.truncated = False
+    
+    def _to_batch(self, rows: List[tuple]):
+        """Convert fetched rows to a DataFrame or Arrow record batch"""
+        df = pd.DataFrame(rows, columns=self.columns)
+        if self.as_arrow:
+            import pyarrow as pa
+            return pa.RecordBatch.from_pandas(df, preserve_index=False)
+        return df
+    
+    def __iter__(self) -> Iterator[Any]:
+        self.columns = []
+        self.rows = 0
+        self.batches = 0
+        self.truncated = False
+        
+        with self.utils.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = self.batch_size
+            cursor.prefetchrows = self.prefetch_rows
+            # LOB locators die with the connection, so LOBs are fetched as values
+            cursor.outputtypehandler = fetch_lobs_as_values
+            try:
+                cursor.execute(self.query, self.params or {})
+                if cursor.description is None:
+                    return
+                self.columns = [desc[0] for desc in cursor.description]
+                
+                while True:
+                    limit = self.batch_size
+                    if self.max_rows is not None:
+                        limit = min(limit, self.max_rows - self.rows)
+                        if limit <= 0:
+                            # One extra row tells a capped result set from one that fits exactly
+                            self.truncated = cursor.fetchone() is not None
+                            break
+                    
+                    rows = cursor.fetchmany(limit)
+                    if not rows:
+                        break
+                    self.rows += len(rows)
+                    self.batches += 1
+                    yield self._to_batch(rows)
+            finally:
+                cursor.close()
+
+
 class DatabaseUtils:
     """Utility class for database operations"""
     
-    def __init__(self):
-        self.config = config.get_app_connection_config()
+    def __init__(self, connection_config: Dict[str, Any] = None):
+        self.config = connection_config or config.get_app_connection_config()
         self.dsn = f"{self.config['host']}:{self.config['port']}/{self.config['service_name']}"
     
+    @contextmanager
     def get_connection(self):
-        """Get database connection"""
-        return oracledb.connect(
-            user=self.config['username'],
-            password=self.config['password'],
-            dsn=self.dsn
-        )
-    
-    def execute_query(self, query: str, params: Dict = None) -> pd.DataFrame:
-        """Execute SELECT query and return DataFrame"""
+        """Borrow a connection from the shared pool (returned to the pool on exit)"""
+        start = time.perf_counter()
+        try:
+            connection = get_pool(self.config).acquire()
+        except oracledb.Error:
+            pool_metrics.record_failure()
+            raise
+        acquired = time.perf_counter()
+        
+        try:
+            yield connection
+        except oracledb.Error:
+            # Connections that died mid-query are dropped rather than handed out again
+            is_healthy = getattr(connection, 'is_healthy', None)
+            if is_healthy is not None and not is_healthy():
+                get_pool(self.config).drop(connection)
+                pool_metrics.record_drop()
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                get_pool(self.config).release(connection)
+            pool_metrics.record_checkout((acquired - start) * 1000, (time.perf_counter() - acquired) * 1000)
+    
+    def check_health(self) -> Dict[str, Any]:
+        """
+        Ping the database over a pooled connection
+        
+        Returns:
+            Dictionary with 'healthy', 'latency_ms' and, on failure, 'error'
+        """
+        start = time.perf_counter()
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                
-                results = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                cursor.close()
-                
-                return pd.DataFrame(results, columns=columns)
+                conn.ping()
+            return {'healthy': True, 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+        except oracledb.Error as e:
+            return {'healthy': False, 'latency_ms': round((time.perf_counter() - start) * 1000, 2), 'error': str(e)}
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get pool size and checkout latency metrics for this connection"""
+        return get_pool_stats(self.config)
+    
+    def stream_query(self, query: str, params: Dict = None,
+                     batch_size: int = config.QUERY_ARRAYSIZE, prefetch_rows: int = config.QUERY_PREFETCH_ROWS,
+                     max_rows: Optional[int] = None, as_arrow: bool = False) -> QueryStream:
+        """
+        Stream a SELECT query's results in DataFrame (or Arrow record batch) batches
+        
+        Args:
+            query: SELECT statement
+            params: Bind variables
+            batch_size: Rows per fetch round trip and per batch
+            prefetch_rows: Rows returned together with the execute
+            max_rows: Optional row cap; the stream's truncated flag is set if rows were left unread
+            as_arrow: Yield pyarrow RecordBatches instead of DataFrames
+        
+        Returns:
+            QueryStream to iterate over; it exposes columns, rows and truncated
+        """
+        return QueryStream(self, query, params, batch_size, prefetch_rows, max_rows, as_arrow)
+    
+    def execute_query(self, query: str, params: Dict = None, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Execute SELECT query and return DataFrame
+        
+        Rows are fetched in batches; df.attrs['truncated'] is True when max_rows cut the result short.
+        """
+        try:
+            stream = self.stream_query(query, params, max_rows=max_rows)
+            batches = list(stream)
+            
+            df = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=stream.columns)
+            df.attrs['truncated'] = stream.truncated
+            return df
         except Exception as e:
             st.error(f"Query execution failed: {e}")
             return pd.DataFrame()
@@ -69,12 +368,12 @@ class DatabaseUtils:
                 cursor = conn.cursor()
                 
                 # Get column information
-                cursor.execute(f"""
+                cursor.execute("""
                     SELECT column_name, data_type, data_length, nullable, data_default
                     FROM user_tab_columns
-                    WHERE table_name = '{table_name.upper()}'
+                    WHERE table_name = :table_name
                     ORDER BY column_id
-                """)
+                """, table_name=table_name.upper())
                 columns = cursor.fetchall()
                 
                 # Get row count
@@ -82,11 +381,11 @@ class DatabaseUtils:
                 row_count = cursor.fetchone()[0]
                 
                 # Get constraints
-                cursor.execute(f"""
+                cursor.execute("""
                     SELECT constraint_name, constraint_type, status
                     FROM user_constraints
-                    WHERE table_name = '{table_name.upper()}'
-                """)
+                    WHERE table_name = :table_name
+                """, table_name=table_name.upper())
                 constraints = cursor.fetchall()
                 
                 cursor.close()
@@ -106,30 +405,28 @@ class DatabaseUtils:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                stats = {}
-                
-                # Table count
-                cursor.execute("SELECT COUNT(*) FROM user_tables")
-                stats['table_count'] = cursor.fetchone()[0]
-                
-                # View count
-                cursor.execute("SELECT COUNT(*) FROM user_views")
-                stats['view_count'] = cursor.fetchone()[0]
-                
-                # Index count
-                cursor.execute("SELECT COUNT(*) FROM user_indexes")
-                stats['index_count'] = cursor.fetchone()[0]
-                
-                # Sequence count
-                cursor.execute("SELECT COUNT(*) FROM user_sequences")
-                stats['sequence_count'] = cursor.fetchone()[0]
-                
-                # Database version
-                cursor.execute("SELECT banner FROM v$version WHERE banner LIKE '%Oracle%'")
-                stats['version'] = cursor.fetchone()[0]
+                # All counts in one round trip
+                cursor.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM user_tables),
+                        (SELECT COUNT(*) FROM user_views),
+                        (SELECT COUNT(*) FROM user_indexes),
+                        (SELECT COUNT(*) FROM user_sequences),
+                        (SELECT NVL(SUM(num_rows), 0) FROM user_tables WHERE num_rows IS NOT NULL),
+                        (SELECT banner FROM v$version WHERE banner LIKE '%Oracle%' AND ROWNUM = 1)
+                    FROM DUAL
+                """)
+                table_count, view_count, index_count, sequence_count, total_rows, version = cursor.fetchone()
                 
                 cursor.close()
-                return stats
+                return {
+                    'table_count': table_count,
+                    'view_count': view_count,
+                    'index_count': index_count,
+                    'sequence_count': sequence_count,
+                    'total_rows': total_rows,
+                    'version': version
+                }
         except Exception as e:
             st.error(f"Failed to get database stats: {e}")
             return {}
@@ -162,13 +459,7 @@ def get_database_utils() -> DatabaseUtils:
 def test_connection() -> bool:
     """Test database connection"""
     try:
-        utils = DatabaseUtils()
-        with utils.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM DUAL")
-            cursor.fetchone()
-            cursor.close()
-        return True
+        return DatabaseUtils().check_health()['healthy']
     except Exception:
         return False
 
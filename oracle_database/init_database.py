@@ -95,14 +95,14 @@ class DatabaseInitializer:
             """,
             
             # Document chunks for vector storage
-            """
+            f"""
             CREATE TABLE document_chunks (
                 chunk_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
                 document_id NUMBER NOT NULL,
                 chunk_text CLOB NOT NULL,
                 chunk_index NUMBER NOT NULL,
                 chunk_size NUMBER,
-                embedding_vector CLOB,
+                embedding_vector VECTOR({config.VECTOR_DIMENSIONS}, FLOAT32),
                 metadata CLOB,
                 created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 CONSTRAINT fk_chunk_doc FOREIGN KEY (document_id) REFERENCES documents(document_id) ON DELETE CASCADE
@@ -237,6 +237,7 @@ class DatabaseInitializer:
             "CREATE INDEX idx_documents_upload_date ON documents(upload_date)",
             "CREATE INDEX idx_documents_file_type ON documents(file_type)",
             "CREATE INDEX idx_document_chunks_doc_id ON document_chunks(document_id)",
+            "CREATE INDEX idx_documents_memory_id ON documents(JSON_VALUE(metadata, '$.document_id' RETURNING VARCHAR2(64)))",
             "CREATE INDEX idx_agent_tasks_status ON agent_tasks(status)",
             "CREATE INDEX idx_agent_tasks_agent ON agent_tasks(assigned_agent)",
             "CREATE INDEX idx_agent_tasks_created_date ON agent_tasks(created_date)",
@@ -263,6 +264,88 @@ class DatabaseInitializer:
         logger.info("Index creation completed")
         return True
     
+    def migrate_embedding_column(self) -> bool:
+        """Convert a CLOB embedding_vector column from older schemas to a VECTOR column"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT data_type 
+                FROM user_tab_columns 
+                WHERE table_name = 'DOCUMENT_CHUNKS' AND column_name = 'EMBEDDING_VECTOR'
+            """)
+            row = cursor.fetchone()
+            cursor.close()
+        except oracledb.Error as e:
+            logger.error(f"Error checking embedding_vector column: {e}")
+            return False
+        
+        if not row or row[0] != 'CLOB':
+            return True
+        
+        logger.info("Migrating document_chunks.embedding_vector from CLOB to VECTOR...")
+        migration_sql = [
+            "ALTER TABLE document_chunks RENAME COLUMN embedding_vector TO embedding_vector_json",
+            f"ALTER TABLE document_chunks ADD (embedding_vector VECTOR({config.VECTOR_DIMENSIONS}, FLOAT32))",
+            """
+            UPDATE document_chunks 
+            SET embedding_vector = TO_VECTOR(embedding_vector_json) 
+            WHERE embedding_vector_json IS NOT NULL
+            """,
+            "ALTER TABLE document_chunks DROP COLUMN embedding_vector_json"
+        ]
+        
+        for sql in migration_sql:
+            if not self.execute_sql(sql):
+                logger.error("Embedding column migration failed - old embeddings remain in embedding_vector_json")
+                return False
+        
+        logger.info("Embedding column migrated to VECTOR")
+        return True
+    
+    def create_vector_index(self) -> bool:
+        """Create the approximate nearest-neighbour index on document chunk embeddings"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) 
+                FROM user_indexes 
+                WHERE index_name = 'IDX_DOCUMENT_CHUNKS_VECTOR'
+            """)
+            exists = cursor.fetchone()[0] > 0
+            cursor.close()
+        except oracledb.Error as e:
+            logger.error(f"Error checking vector index: {e}")
+            return False
+        
+        if exists:
+            logger.info("Vector index idx_document_chunks_vector already exists - skipping")
+            return True
+        
+        organizations = {
+            "HNSW": "INMEMORY NEIGHBOR GRAPH",
+            "IVF": "NEIGHBOR PARTITIONS"
+        }
+        
+        # HNSW needs VECTOR_MEMORY_SIZE configured, so IVF is the fallback
+        index_types = [config.VECTOR_INDEX_TYPE] + [t for t in organizations if t != config.VECTOR_INDEX_TYPE]
+        for index_type in index_types:
+            if index_type not in organizations:
+                logger.warning(f"Unknown vector index type {index_type} - skipping")
+                continue
+            
+            logger.info(f"Creating {index_type} vector index on document_chunks.embedding_vector")
+            sql = f"""
+            CREATE VECTOR INDEX idx_document_chunks_vector ON document_chunks (embedding_vector)
+            ORGANIZATION {organizations[index_type]}
+            DISTANCE COSINE
+            WITH TARGET ACCURACY {config.VECTOR_TARGET_ACCURACY}
+            """
+            if self.execute_sql(sql):
+                return True
+        
+        logger.error("Failed to create vector index - searches will use exact scans")
+        return False
+    
     def insert_initial_data(self) -> bool:
         """Insert initial configuration data"""
         
@@ -340,6 +423,12 @@ class DatabaseInitializer:
             if not self.create_indexes():
                 logger.warning("Some indexes failed to create, but continuing...")
             
+            # Store embeddings as VECTOR and index them for similarity search
+            if not self.migrate_embedding_column():
+                logger.warning("Embedding column migration failed, but continuing...")
+            if not self.create_vector_index():
+                logger.warning("Vector index failed to create, but continuing...")
+            
             # Create sequences
             if not self.create_sequences():
                 logger.warning("Some sequences failed to create, but continuing...")
@@ -0,0 +1,280 @@
+"""
+Test script for the database manager, its caches and access-count buffer, run against fakes of oracledb
+"""
+
+import json
+import time
+
+import oracledb
+
+from oracle_database.database_manager import DatabaseManager, TTLCache, AccessCountBuffer, MAX_VARCHAR_BIND_BYTES
+
+
+class FakeVar:
+    """Output bind array filled by a RETURNING INTO clause"""
+    
+    def __init__(self, arraysize: int):
+        self.values = [None] * arraysize
+    
+    def getvalue(self, position: int = 0):
+        return self.values[position]
+
+
+class FakeCursor:
+    """Cursor that records array inserts and returns sequential chunk IDs"""
+    
+    def __init__(self, connection: 'FakeConnection'):
+        self.connection = connection
+        self.input_sizes = None
+    
+    def var(self, type_code, arraysize: int = 1):
+        return FakeVar(arraysize)
+    
+    def setinputsizes(self, *sizes):
+        self.input_sizes = sizes
+    
+    def executemany(self, sql, rows):
+        if len(self.connection.batches) == self.connection.fail_on_batch:
+            raise oracledb.DatabaseError("ORA-01653: unable to extend table")
+        self.connection.batches.append((list(rows), self.input_sizes))
+        chunk_id_var = self.input_sizes[-1]
+        for position in range(len(rows)):
+            self.connection.next_id += 1
+            chunk_id_var.values[position] = [self.connection.next_id]
+    
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection that counts commits"""
+    
+    def __init__(self):
+        self.batches = []
+        self.commits = 0
+        self.next_id = 100
+        self.fail_on_batch = None
+    
+    def cursor(self):
+        return FakeCursor(self)
+    
+    def commit(self):
+        self.commits += 1
+    
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """Pool handing out one shared fake connection"""
+    
+    def __init__(self, **kwargs):
+        self.connection = FakeConnection()
+    
+    def acquire(self):
+        return self.connection
+    
+    def release(self, connection):
+        pass
+
+
+def make_manager() -> DatabaseManager:
+    """Create a DatabaseManager whose pool is a FakePool"""
+    original_create_pool = oracledb.create_pool
+    oracledb.create_pool = FakePool
+    try:
+        return DatabaseManager({'host': 'db.test', 'port': 1521, 'service_name': 'FREEPDB1',
+                                'username': 'app_user', 'password': 'secret'})
+    finally:
+        oracledb.create_pool = original_create_pool
+
+
+def test_chunk_batches():
+    """Test that chunks are inserted and committed one array batch at a time with their IDs returned"""
+    print("🧪 Testing batched chunk inserts...")
+    
+    manager = make_manager()
+    connection = manager.db.pool.connection
+    chunks = [
+        {'chunk_text': f"chunk {i}", 'embedding_vector': [0.5, i], 'metadata': {'chunk_hash': f"h{i}"}}
+        for i in range(6)
+    ] + ["plain text chunk"]
+    
+    chunk_ids = manager.save_document_chunks(42, chunks, batch_size=3)
+    
+    assert chunk_ids == list(range(101, 108))
+    assert [len(rows) for rows, _ in connection.batches] == [3, 3, 1]
+    assert connection.commits == 3
+    
+    first_row = connection.batches[0][0][0]
+    assert first_row[:4] == (42, "chunk 0", 0, len("chunk 0"))
+    assert first_row[4].typecode == 'f' and list(first_row[4]) == [0.5, 0.0]
+    assert json.loads(first_row[5]) == {'chunk_hash': "h0"}
+    assert connection.batches[2][0][0] == (42, "plain text chunk", 6, 16, None, None)
+    
+    stats = manager.last_chunk_insert_stats
+    assert stats['rows'] == 7 and stats['batches'] == 3
+    
+    print(f"✅ {stats['rows']} chunks in {stats['batches']} batches")
+
+
+def test_long_text_bound_as_clob():
+    """Test that only batches holding values longer than a VARCHAR2 bind switch those columns to CLOB"""
+    print("\n🧪 Testing CLOB binds for long chunks...")
+    
+    manager = make_manager()
+    connection = manager.db.pool.connection
+    long_text = "é" * (MAX_VARCHAR_BIND_BYTES // 2 + 1)
+    chunks = ["short", "short", {'chunk_text': long_text}, "short"]
+    
+    manager.save_document_chunks(7, chunks, batch_size=2)
+    
+    first_sizes, second_sizes = connection.batches[0][1], connection.batches[1][1]
+    assert first_sizes[1] is None and first_sizes[5] is None
+    assert second_sizes[1] is oracledb.DB_TYPE_CLOB and second_sizes[5] is None
+    assert first_sizes[4] is oracledb.DB_TYPE_VECTOR
+    
+    print(f"✅ {len(long_text.encode())}-byte chunk bound as a CLOB")
+
+
+def test_failed_batch_keeps_earlier_commits():
+    """Test that a failing batch raises after the batches before it were committed"""
+    print("\n🧪 Testing a failing chunk batch...")
+    
+    manager = make_manager()
+    connection = manager.db.pool.connection
+    connection.fail_on_batch = 1
+    
+    try:
+        manager.save_document_chunks(9, [f"chunk {i}" for i in range(5)], batch_size=2)
+    except oracledb.DatabaseError:
+        pass
+    else:
+        raise AssertionError("The failed batch was not reported")
+    
+    assert connection.commits == 1 and len(connection.batches) == 1
+    
+    print("✅ First batch committed, failure raised")
+
+
+class FakeBatchDB:
+    """DatabaseConnection stand-in whose batch writes can be made to fail"""
+    
+    def __init__(self):
+        self.fail = False
+        self.batches = []
+    
+    def execute_batch(self, sql, params_list):
+        if self.fail:
+            raise oracledb.DatabaseError("ORA-03113: end-of-file on communication channel")
+        self.batches.append(params_list)
+        return len(params_list)
+
+
+def test_ttl_cache():
+    """Test hits, cached misses, expiry, LRU eviction and the disabled cache"""
+    print("\n🧪 Testing the TTL cache...")
+    
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    assert cache.get("a") == (False, None)
+    cache.set("a", None)
+    assert cache.get("a") == (True, None)
+    
+    cache.set("b", "value b")
+    cache.get("a")
+    cache.set("c", "value c")
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, None) and cache.get("c") == (True, "value c")
+    
+    cache.set("short", "value", ttl_seconds=0.05)
+    time.sleep(0.1)
+    assert cache.get("short") == (False, None)
+    
+    stats = cache.get_stats()
+    assert stats['evictions'] == 2 and stats['expired'] == 1
+    assert stats['hits'] == 4 and stats['misses'] == 3
+    
+    disabled = TTLCache(ttl_seconds=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") == (False, None) and disabled.get_stats()['entries'] == 0
+    
+    print(f"✅ Hit rate {stats['hit_rate']} with {stats['evictions']} evictions")
+
+
+def test_ttl_cache_generation():
+    """Test that a value loaded before an invalidation is not cached after it"""
+    print("\n🧪 Testing cache generations...")
+    
+    cache = TTLCache(ttl_seconds=60)
+    cache.set("key", "old")
+    
+    # A reader loads the row, then a writer updates it before the reader caches its value
+    generation = cache.generation
+    cache.invalidate("key")
+    cache.set("key", "stale", generation=generation)
+    assert cache.get("key") == (False, None)
+    
+    generation = cache.generation
+    cache.set("key", "fresh", generation=generation)
+    assert cache.get("key") == (True, "fresh")
+    
+    # Invalidating another key or clearing also makes earlier loads stale
+    generation = cache.generation
+    cache.invalidate("other")
+    cache.set("late", "value", generation=generation)
+    assert cache.get("late") == (False, None)
+    assert cache.clear() == 1 and cache.get("key") == (False, None)
+    assert cache.get_stats()['invalidations'] == 1
+    
+    print(f"✅ Stale loads dropped at generation {cache.generation}")
+
+
+def test_access_count_requeue():
+    """Test that counts from a failed flush are kept and merged into the next one"""
+    print("\n🧪 Testing access-count re-queueing...")
+    
+    db = FakeBatchDB()
+    buffer = AccessCountBuffer(db, flush_interval=3600)
+    try:
+        for _ in range(3):
+            buffer.record(("researcher", "fact", "a"))
+        buffer.record(("researcher", "fact", "b"))
+        
+        db.fail = True
+        assert buffer.flush() == 0
+        stats = buffer.get_stats()
+        assert stats['failures'] == 1 and stats['pending'] == 2 and stats['rows_written'] == 0
+        
+        buffer.record(("researcher", "fact", "a"))
+        db.fail = False
+        assert buffer.flush() == 2
+        
+        written = {params['memory_key']: params for params in db.batches[-1]}
+        assert written["a"]['accesses'] == 4 and written["b"]['accesses'] == 1
+        assert written["a"]['last_accessed'] >= written["b"]['last_accessed']
+        assert buffer.get_stats()['pending'] == 0 and buffer.flush() == 0
+    finally:
+        buffer.close()
+    
+    assert buffer.get_stats()['recorded'] == 5 and len(db.batches) == 1
+    
+    print("✅ Failed counts written with the next flush")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting database manager tests...")
+    
+    try:
+        test_chunk_batches()
+        test_long_text_bound_as_clob()
+        test_failed_batch_keeps_earlier_commits()
+        test_ttl_cache()
+        test_ttl_cache_generation()
+        test_access_count_requeue()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,242 @@
+"""
+Test script for the shared connection pool and streamed queries, run against fake oracledb objects
+"""
+
+from contextlib import contextmanager
+
+import oracledb
+
+from oracle_database import database_utils
+from oracle_database.database_utils import DatabaseUtils, PoolMetrics, QueryStream, get_pool
+
+
+CONNECTION_CONFIG = {
+    'host': 'db.test', 'port': 1521, 'service_name': 'FREEPDB1',
+    'username': 'app_user', 'password': 'secret', 'dsn': 'db.test:1521/FREEPDB1'
+}
+
+
+class FakeConnection:
+    """Pooled connection whose health can be switched off"""
+    
+    def __init__(self):
+        self.healthy = True
+    
+    def is_healthy(self):
+        return self.healthy
+    
+    def ping(self):
+        if not self.healthy:
+            raise oracledb.DatabaseError("DPY-4011: the database or network closed the connection")
+
+
+class FakePool:
+    """Pool that records acquires, releases and drops"""
+    
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.acquired = []
+        self.released = []
+        self.dropped = []
+        self.fail_acquire = False
+    
+    def acquire(self):
+        if self.fail_acquire:
+            raise oracledb.DatabaseError("DPY-4005: timed out waiting for the connection pool")
+        connection = FakeConnection()
+        self.acquired.append(connection)
+        return connection
+    
+    def release(self, connection):
+        self.released.append(connection)
+    
+    def drop(self, connection):
+        self.dropped.append(connection)
+    
+    def close(self, force=False):
+        pass
+
+
+class FakeQueryCursor:
+    """Cursor over a fixed result set that counts fetch round trips"""
+    
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.position = 0
+        self.fetches = 0
+        self.arraysize = None
+        self.prefetchrows = None
+        self.outputtypehandler = None
+        self.description = None
+    
+    def execute(self, query, params):
+        self.description = [("ID", None), ("NAME", None)]
+    
+    def fetchmany(self, size):
+        self.fetches += 1
+        batch = self.rows[self.position:self.position + size]
+        self.position += len(batch)
+        return batch
+    
+    def fetchone(self):
+        batch = self.fetchmany(1)
+        return batch[0] if batch else None
+    
+    def close(self):
+        pass
+
+
+class FakeQueryUtils:
+    """DatabaseUtils stand-in whose connection serves one FakeQueryCursor"""
+    
+    def __init__(self, row_count: int):
+        self.query_cursor = FakeQueryCursor([(i, f"row {i}") for i in range(row_count)])
+        self.checked_out = False
+    
+    @contextmanager
+    def get_connection(self):
+        self.checked_out = True
+        try:
+            yield self
+        finally:
+            self.checked_out = False
+    
+    def cursor(self):
+        return self.query_cursor
+
+
+def test_pool_metrics_percentiles():
+    """Test checkout latency averages, 95th percentiles and maxima over the recent window"""
+    print("🧪 Testing pool metrics percentiles...")
+    
+    metrics = PoolMetrics()
+    assert metrics.snapshot()['acquire_ms'] == {'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+    
+    # Record 1..100 ms out of order
+    for value in list(range(100, 50, -1)) + list(range(1, 51)):
+        metrics.record_checkout(acquire_ms=value, hold_ms=value / 10)
+    metrics.record_failure()
+    metrics.record_drop()
+    
+    snapshot = metrics.snapshot()
+    assert snapshot['checkouts'] == 100
+    assert snapshot['failed_checkouts'] == 1 and snapshot['dropped_connections'] == 1
+    assert snapshot['acquire_ms'] == {'avg': 50.5, 'p95': 96, 'max': 100}
+    assert snapshot['hold_ms'] == {'avg': 5.05, 'p95': 9.6, 'max': 10.0}
+    
+    # Only the most recent checkouts count towards the latencies
+    metrics = PoolMetrics(window=10)
+    for value in range(1, 101):
+        metrics.record_checkout(acquire_ms=value, hold_ms=0)
+    assert metrics.snapshot()['acquire_ms'] == {'avg': 95.5, 'p95': 100, 'max': 100}
+    assert metrics.snapshot()['checkouts'] == 100
+    
+    print(f"✅ p95 of 1..100 ms is {snapshot['acquire_ms']['p95']} ms")
+
+
+def test_shared_pool_checkout():
+    """Test that instances share one pool, release healthy connections and drop dead ones"""
+    print("\n🧪 Testing shared pool checkouts...")
+    
+    original_create_pool, original_metrics = oracledb.create_pool, database_utils.pool_metrics
+    created = []
+    oracledb.create_pool = lambda **kwargs: created.append(FakePool(**kwargs)) or created[-1]
+    database_utils.pool_metrics = PoolMetrics()
+    try:
+        first, second = DatabaseUtils(CONNECTION_CONFIG), DatabaseUtils(CONNECTION_CONFIG)
+        assert get_pool(first.config) is get_pool(second.config)
+        assert len(created) == 1 and created[0].kwargs['dsn'] == "db.test:1521/FREEPDB1"
+        pool = created[0]
+        
+        assert first.check_health()['healthy']
+        with second.get_connection() as conn:
+            assert conn is pool.acquired[-1]
+        assert pool.released == pool.acquired and not pool.dropped
+        
+        # A connection that died mid-query is dropped instead of released
+        try:
+            with first.get_connection() as conn:
+                conn.healthy = False
+                conn.ping()
+        except oracledb.DatabaseError:
+            pass
+        else:
+            raise AssertionError("The error was swallowed")
+        assert pool.dropped == [pool.acquired[-1]] and len(pool.released) == 2
+        
+        pool.fail_acquire = True
+        health = first.check_health()
+        assert not health['healthy'] and "DPY-4005" in health['error']
+        
+        stats = database_utils.pool_metrics.snapshot()
+        assert stats['checkouts'] == 3 and stats['dropped_connections'] == 1 and stats['failed_checkouts'] == 1
+    finally:
+        oracledb.create_pool = original_create_pool
+        database_utils.pool_metrics = original_metrics
+        database_utils.close_pools()
+    
+    print(f"✅ {stats['checkouts']} checkouts over one pool, dead connection dropped")
+
+
+def test_query_stream_row_cap():
+    """Test batch sizes and the truncated flag, including caps that fit the result set exactly"""
+    print("\n🧪 Testing query stream row caps...")
+    
+    cases = [
+        # (rows in the table, max_rows, expected batch sizes, truncated)
+        (10, None, [4, 4, 2], False),
+        (10, 10, [4, 4, 2], False),
+        (8, 8, [4, 4], False),
+        (11, 10, [4, 4, 2], True),
+        (9, 8, [4, 4], True),
+        (10, 20, [4, 4, 2], False),
+        (0, 5, [], False),
+        (3, 0, [], True),
+    ]
+    
+    for row_count, max_rows, batch_sizes, truncated in cases:
+        utils = FakeQueryUtils(row_count)
+        stream = QueryStream(utils, "SELECT id, name FROM items", batch_size=4, prefetch_rows=4, max_rows=max_rows)
+        batches = list(stream)
+        
+        assert [len(batch) for batch in batches] == batch_sizes, (row_count, max_rows)
+        assert stream.truncated is truncated, (row_count, max_rows)
+        assert stream.rows == sum(batch_sizes) and stream.columns == ["ID", "NAME"]
+        assert utils.query_cursor.arraysize == 4 and utils.query_cursor.prefetchrows == 4
+        assert not utils.checked_out
+    
+    print(f"✅ {len(cases)} row caps reported correctly")
+
+
+def test_query_stream_early_stop():
+    """Test that a consumer stopping early returns the connection after one fetch"""
+    print("\n🧪 Testing an early stop...")
+    
+    utils = FakeQueryUtils(1_000)
+    stream = QueryStream(utils, "SELECT id, name FROM items", batch_size=100)
+    
+    batches = iter(stream)
+    assert len(next(batches)) == 100 and utils.checked_out
+    batches.close()
+    
+    assert utils.query_cursor.fetches == 1 and stream.rows == 100
+    assert not utils.checked_out
+    
+    print(f"✅ Stopped after {utils.query_cursor.fetches} fetch of {stream.rows} rows")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting database utils tests...")
+    
+    try:
+        test_pool_metrics_percentiles()
+        test_shared_pool_checkout()
+        test_query_stream_row_cap()
+        test_query_stream_early_stop()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
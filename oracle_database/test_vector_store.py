@@ -0,0 +1,309 @@
+"""
+Test script for the Oracle vector store, run against an in-memory stand-in for the database
+"""
+
+import json
+
+import numpy as np
+import oracledb
+
+from oracle_database.vector_store import OracleVectorStore
+
+
+def letter_embeddings(texts):
+    """Embed texts by letter frequency so tests need no embedding model"""
+    vectors = []
+    for text in texts:
+        vector = [0.0] * 26
+        for char in text.lower():
+            if 'a' <= char <= 'z':
+                vector[ord(char) - ord('a')] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+class FakeLOB(oracledb.LOB):
+    """CLOB value that has to be read like the ones python-oracledb returns"""
+    
+    def __init__(self, value: str):
+        self.value = value
+    
+    def read(self, offset: int = 1, amount: int = None):
+        return self.value
+
+
+class FakeOracle:
+    """
+    In-memory documents and document_chunks tables
+    
+    Recognises the statements the vector store issues, records them with
+    their binds and returns CLOB columns as LOBs.
+    """
+    
+    def __init__(self):
+        self.documents = {}
+        self.chunks = []
+        self.statements = []
+        self.executemany_rows = {}
+    
+    def get_connection(self):
+        return FakeConnection(self)
+    
+    def memory_row(self, document_id):
+        for row_id, document in self.documents.items():
+            if document['metadata'].get('document_id') == document_id:
+                return row_id
+        return None
+    
+    def memory_chunks(self, document_id):
+        row_id = self.memory_row(document_id)
+        return [chunk for chunk in self.chunks if chunk['document_id'] == row_id]
+    
+    def execute_update(self, sql, params):
+        self.statements.append((sql, params))
+        row_id = self.memory_row(params['document_id'])
+        if row_id is None:
+            return 0
+        del self.documents[row_id]
+        self.chunks = [chunk for chunk in self.chunks if chunk['document_id'] != row_id]
+        return 1
+    
+    def query(self, sql, params):
+        """Answer a SELECT issued by the vector store"""
+        if "FETCH APPROX FIRST" in sql:
+            query_vector = np.asarray(params['query_vector'], dtype=np.float64)
+            file_types = [value for key, value in params.items() if key.startswith('file_type_')]
+            rows = []
+            for chunk in self.chunks:
+                metadata = json.loads(chunk['metadata'])
+                if chunk['embedding'] is None or metadata.get('type') != 'document_chunk':
+                    continue
+                if file_types and metadata.get('file_type') not in file_types:
+                    continue
+                vector = np.asarray(chunk['embedding'], dtype=np.float64)
+                distance = 1 - vector @ query_vector / (np.linalg.norm(vector) * np.linalg.norm(query_vector))
+                rows.append((FakeLOB(chunk['chunk_text']), FakeLOB(chunk['metadata']), distance))
+            return sorted(rows, key=lambda row: row[2])[:params['n_results']]
+        
+        if "SELECT d.document_id FROM documents d" in sql:
+            row_id = self.memory_row(params['document_id'])
+            return [] if row_id is None else [(row_id,)]
+        
+        if "ORDER BY c.chunk_index" in sql:
+            chunks = sorted(self.memory_chunks(params['document_id']), key=lambda chunk: chunk['chunk_index'])
+            return [(FakeLOB(chunk['chunk_text']), FakeLOB(chunk['metadata'])) for chunk in chunks]
+        
+        if "SELECT c.metadata" in sql:
+            return [(FakeLOB(chunk['metadata']),) for chunk in self.memory_chunks(params['document_id'])]
+        
+        if "GROUP BY" in sql:
+            rows = []
+            for row_id, document in self.documents.items():
+                count = sum(1 for chunk in self.chunks if chunk['document_id'] == row_id)
+                if count:
+                    rows.append((document['metadata']['document_id'], document['filename'], document['file_type'], count))
+            return rows
+        
+        if "COUNT(DISTINCT d.document_id)" in sql:
+            return [(len(self.chunks), len({chunk['document_id'] for chunk in self.chunks}))]
+        
+        raise AssertionError(f"Unexpected query: {sql}")
+    
+    def execute_many(self, sql, rows):
+        """Apply an array UPDATE or DELETE of document chunks"""
+        affected = 0
+        for row in rows:
+            if sql.strip().startswith("UPDATE document_chunks"):
+                chunk_index, metadata_json, document_id, chunk_hash = row
+            elif sql.strip().startswith("DELETE FROM document_chunks"):
+                document_id, chunk_hash = row
+            else:
+                raise AssertionError(f"Unexpected statement: {sql}")
+            
+            self.executemany_rows.setdefault(sql.split()[0], []).append(row)
+            for chunk in self.memory_chunks(document_id):
+                if json.loads(chunk['metadata'])['chunk_hash'] == chunk_hash:
+                    affected += 1
+                    if sql.strip().startswith("UPDATE"):
+                        chunk['chunk_index'], chunk['metadata'] = chunk_index, metadata_json
+                    else:
+                        self.chunks.remove(chunk)
+        return affected
+
+
+class FakeCursor:
+    """Cursor over the in-memory tables"""
+    
+    def __init__(self, database: FakeOracle):
+        self.database = database
+        self.rows = []
+        self.rowcount = 0
+    
+    def execute(self, sql, params=None):
+        self.database.statements.append((sql, params))
+        self.rows = self.database.query(sql, params)
+    
+    def executemany(self, sql, rows):
+        self.database.statements.append((sql, rows))
+        self.rowcount = self.database.execute_many(sql, rows)
+    
+    def fetchall(self):
+        return self.rows
+    
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection context manager handed out by the fake pool"""
+    
+    def __init__(self, database: FakeOracle):
+        self.database = database
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def cursor(self):
+        return FakeCursor(self.database)
+    
+    def commit(self):
+        pass
+
+
+class FakeDatabaseManager:
+    """The DatabaseManager methods the vector store relies on"""
+    
+    def __init__(self):
+        self.db = FakeOracle()
+    
+    def save_document(self, filename, file_path, file_type, file_size, metadata=None, content_hash=None, created_by=None):
+        row_id = len(self.db.documents) + 1
+        while row_id in self.db.documents:
+            row_id += 1
+        self.db.documents[row_id] = {'filename': filename, 'file_type': file_type, 'metadata': metadata or {}}
+        return row_id
+    
+    def save_document_chunks(self, document_id, chunks, batch_size=None):
+        for chunk in chunks:
+            self.db.chunks.append({
+                'document_id': document_id,
+                'chunk_text': chunk['chunk_text'],
+                'chunk_index': chunk['chunk_index'],
+                'embedding': chunk['embedding_vector'],
+                'metadata': json.dumps(chunk['metadata'])
+            })
+        return list(range(len(chunks)))
+
+
+def make_sections(count: int, topic: str = "governance") -> list:
+    """Build sections of about one chunk each, ending in sentence breaks"""
+    return [
+        f"Section {i} covers {topic} policy {i}. " + f"Detail sentence {i} about data stewardship and quality. " * 17
+        for i in range(count)
+    ]
+
+
+def make_document(content: str, filename: str = "policy.txt", file_type: str = "unstructured") -> dict:
+    """Build a processed document as the document processor returns it"""
+    return {
+        'type': file_type,
+        'content': content,
+        'metadata': {'filename': filename, 'source_path': f"/uploads/{filename}"}
+    }
+
+
+def test_store_and_reingest():
+    """Test storing a document and re-ingesting an edited version of it"""
+    print("🧪 Testing store, update and delete of chunks...")
+    
+    db_manager = FakeDatabaseManager()
+    store = OracleVectorStore(db_manager=db_manager, embedding_function=letter_embeddings)
+    original = make_sections(8)
+    
+    report = store.store_documents({"policy.txt": make_document("".join(original))})
+    document_id = report['document_ids']["policy.txt"]
+    old_chunks = set(store.chunk_document("".join(original)))
+    assert report['errors'] == {}
+    assert report['chunks_added'] == len(old_chunks) == len(db_manager.db.chunks)
+    assert all(chunk['embedding'].typecode == 'f' for chunk in db_manager.db.chunks)
+    
+    # Storing the same content again touches nothing
+    report = store.store_documents({"policy.txt": make_document("".join(original))})
+    assert report['documents_unchanged'] == 1 and report['chunks_added'] == 0
+    
+    edited = list(original)
+    edited[3] = make_sections(4, topic="retention")[3]
+    edited = edited[:6] + make_sections(1, topic="lineage")
+    new_chunks = set(store.chunk_document("".join(edited)))
+    report = store.store_documents({"policy.txt": make_document("".join(edited))})
+    
+    assert report['document_ids']["policy.txt"] == document_id
+    assert report['chunks_added'] == len(new_chunks - old_chunks) > 0
+    assert report['chunks_updated'] == len(new_chunks & old_chunks) > 0
+    assert report['chunks_deleted'] == len(old_chunks - new_chunks) > 0
+    
+    # The document ID contains an underscore; chunk IDs split on the last one
+    assert "_" in document_id
+    deleted_rows = db_manager.db.executemany_rows['DELETE']
+    assert all(row[0] == document_id and len(row[1]) == 16 for row in deleted_rows)
+    
+    stored = store.get_document_by_id(document_id)
+    assert sorted(chunk['content'] for chunk in stored) == sorted(new_chunks)
+    assert [chunk['metadata']['chunk_index'] for chunk in stored] == list(range(len(stored)))
+    assert len({chunk['metadata']['content_hash'] for chunk in stored}) == 1
+    
+    print(f"✅ Re-upload added {report['chunks_added']}, updated {report['chunks_updated']}, "
+          f"deleted {report['chunks_deleted']} chunks")
+
+
+def test_search():
+    """Test that search binds the query vector and row limit and reads LOB columns"""
+    print("\n🧪 Testing vector search...")
+    
+    db_manager = FakeDatabaseManager()
+    store = OracleVectorStore(db_manager=db_manager, embedding_function=letter_embeddings)
+    store.store_documents({
+        "policy.txt": make_document("".join(make_sections(3))),
+        "zebra.csv": make_document("Zebra zoo quiz jazz fizz buzz. " * 10, "zebra.csv", "structured")
+    })
+    
+    results = store.search_documents("zebra jazz quiz", n_results=2)
+    sql, params = db_manager.db.statements[-1]
+    assert "FETCH APPROX FIRST :n_results ROWS ONLY" in sql
+    assert params['n_results'] == 2
+    assert params['query_vector'].typecode == 'f'
+    
+    assert len(results) == 2
+    assert results[0]['metadata']['filename'] == "zebra.csv"
+    assert isinstance(results[0]['content'], str) and results[0]['content'].startswith("Zebra")
+    assert results[0]['distance'] <= results[1]['distance']
+    
+    results = store.search_documents("zebra jazz quiz", n_results=5, file_types=["unstructured"])
+    sql, params = db_manager.db.statements[-1]
+    assert "IN (:file_type_0)" in sql and params['file_type_0'] == "unstructured"
+    assert results and all(result['metadata']['file_type'] == "unstructured" for result in results)
+    
+    assert store.get_memory_stats()['total_documents'] == 2
+    assert sorted(document['filename'] for document in store.list_documents()) == ["policy.txt", "zebra.csv"]
+    assert store.delete_document(results[0]['metadata']['document_id'])
+    assert store.get_memory_stats()['total_documents'] == 1
+    
+    print(f"✅ Nearest chunk came from {results[0]['metadata']['filename']} with the file type filter")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting Oracle vector store tests...")
+    
+    try:
+        test_store_and_reingest()
+        test_search()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,409 @@
+"""
+Oracle Vector Store for Web Knowledge System
+Stores document chunk embeddings in Oracle Database 23ai VECTOR columns and
+searches them through the approximate nearest-neighbour vector index
+"""
+
+import json
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import oracledb
+from chromadb.utils import embedding_functions
+
+from agent_tools.document_memory_manager import DocumentMemoryManager, DEFAULT_BATCH_SIZE
+from .database_config import config
+from .database_manager import DatabaseManager, get_db_manager, to_vector
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Expression matching the function-based index idx_documents_memory_id
+MEMORY_ID_EXPR = "JSON_VALUE({alias}.metadata, '$.document_id' RETURNING VARCHAR2(64))"
+
+class OracleVectorStore(DocumentMemoryManager):
+    """
+    Document memory backed by Oracle Database 23ai vector search
+    
+    Chunking, content-addressed chunk IDs and incremental re-uploads are
+    inherited from DocumentMemoryManager; chunks, embeddings and metadata
+    live in the documents and document_chunks tables, so every app node
+    shares one index. Embeddings come from ChromaDB's default embedding
+    model so results match the local ChromaDB backend.
+    """
+    
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, embedding_function=None):
+        """
+        Initialize the Oracle vector store
+        
+        Args:
+            db_manager: Database manager to use (defaults to the shared instance)
+            embedding_function: Callable mapping a list of texts to embeddings
+                (defaults to ChromaDB's default embedding function)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.embedding_function = embedding_function or embedding_functions.DefaultEmbeddingFunction()
+        self.persist_directory = None
+        self.client = None
+    
+    def _embed(self, texts: List[str]) -> List[Any]:
+        """Embed texts as float32 arrays ready to bind to a VECTOR column"""
+        return [to_vector(embedding) for embedding in self.embedding_function(texts)]
+    
+    def _fetch(self, sql: str, params: Any = None) -> List[Tuple]:
+        """Run a query and return its rows with LOBs read into strings"""
+        with self.db_manager.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params or {})
+                return [
+                    tuple(value.read() if isinstance(value, oracledb.LOB) else value for value in row)
+                    for row in cursor.fetchall()
+                ]
+            finally:
+                cursor.close()
+    
+    def _execute_many(self, sql: str, rows: List[Tuple], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Run a DML statement once per row with array DML and return the affected row count"""
+        if not rows:
+            return 0
+        
+        step = self._get_batch_size(batch_size)
+        affected = 0
+        with self.db_manager.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for start in range(0, len(rows), step):
+                    cursor.executemany(sql, rows[start:start + step])
+                    affected += cursor.rowcount
+                conn.commit()
+            finally:
+                cursor.close()
+        return affected
+    
+    def _get_batch_size(self, batch_size: int) -> int:
+        """Oracle array DML has no client-imposed batch limit"""
+        return max(1, batch_size)
+    
+    def _get_document_row_id(self, metadata: Dict[str, Any]) -> int:
+        """
+        Get the documents row of a memory document, creating it on first use
+        
+        Args:
+            metadata: Chunk metadata carrying the document ID, filename and file type
+        
+        Returns:
+            documents.document_id of the memory document
+        """
+        rows = self._fetch(
+            f"SELECT d.document_id FROM documents d WHERE {MEMORY_ID_EXPR.format(alias='d')} = :document_id",
+            {'document_id': metadata['document_id']}
+        )
+        if rows:
+            return int(rows[0][0])
+        
+        return self.db_manager.save_document(
+            filename=metadata.get('filename', 'unknown'),
+            file_path=metadata.get('filename', 'unknown'),
+            file_type=metadata.get('file_type', 'unknown'),
+            file_size=None,
+            metadata={'document_id': metadata['document_id']},
+            content_hash=metadata.get('content_hash') or None,
+            created_by='document_memory'
+        )
+    
+    def _get_stored_chunks(self, document_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the IDs and metadata of the chunks already stored for a document
+        
+        Args:
+            document_id: The document ID to look up
+        
+        Returns:
+            Mapping of chunk ID to chunk metadata
+        """
+        rows = self._fetch(f"""
+            SELECT c.metadata
+            FROM documents d JOIN document_chunks c ON c.document_id = d.document_id
+            WHERE {MEMORY_ID_EXPR.format(alias='d')} = :document_id
+        """, {'document_id': document_id})
+        
+        stored = {}
+        for (metadata_json,) in rows:
+            metadata = json.loads(metadata_json) if metadata_json else {}
+            stored[f"{document_id}_{metadata.get('chunk_hash')}"] = metadata
+        return stored
+    
+    def _add_in_batches(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Embed chunks and insert them with one array insert per batch
+        
+        Each document's insert commits on its own, so a failure only marks the
+        chunks of that document (or the whole batch, if embedding failed) as
+        failed and the remaining inserts still run.
+        
+        Args:
+            ids: Chunk IDs
+            documents: Chunk texts
+            metadatas: Chunk metadata
+            batch_size: Maximum number of chunks embedded and inserted per batch
+        
+        Returns:
+            List of per-batch timings; failed batches carry 'error' and 'failed_ids'
+        """
+        batch_size = self._get_batch_size(batch_size)
+        row_ids = {}
+        
+        timings = []
+        for batch_index, start in enumerate(range(0, len(ids), batch_size)):
+            end = start + batch_size
+            started = time.perf_counter()
+            batch_ids = ids[start:end]
+            batch_texts = documents[start:end]
+            batch_metadatas = metadatas[start:end]
+            timing = {"batch": batch_index, "chunks": len(batch_texts)}
+            failed_ids = []
+            
+            try:
+                embeddings = self._embed(batch_texts)
+            except Exception as e:
+                logger.error(f"Failed to embed batch {batch_index} ({len(batch_texts)} chunks): {e}")
+                timing["error"] = str(e)
+                failed_ids = list(batch_ids)
+                embeddings = []
+            
+            # Chunks of several documents can share a batch; insert them per document
+            by_document = {}
+            for chunk_id, text, metadata, embedding in zip(batch_ids, batch_texts, batch_metadatas, embeddings):
+                by_document.setdefault(metadata['document_id'], []).append({
+                    'chunk_id': chunk_id,
+                    'chunk_text': text,
+                    'chunk_index': metadata.get('chunk_index', 0),
+                    'embedding_vector': embedding,
+                    'metadata': metadata
+                })
+            
+            for document_id, chunks in by_document.items():
+                try:
+                    if document_id not in row_ids:
+                        row_ids[document_id] = self._get_document_row_id(chunks[0]['metadata'])
+                    self.db_manager.save_document_chunks(row_ids[document_id], chunks, batch_size)
+                except Exception as e:
+                    logger.error(f"Failed to store {len(chunks)} chunks of document {document_id} in Oracle: {e}")
+                    timing["error"] = str(e)
+                    failed_ids.extend(chunk['chunk_id'] for chunk in chunks)
+            
+            elapsed = time.perf_counter() - started
+            timing["seconds"] = round(elapsed, 4)
+            if failed_ids:
+                timing["failed_ids"] = failed_ids
+            else:
+                logger.info(f"Stored batch {batch_index} ({len(batch_texts)} chunks) in Oracle in {elapsed:.2f}s")
+            timings.append(timing)
+        
+        return timings
+    
+    def _update_chunk_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]],
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Replace the metadata and position of stored chunks without re-embedding them
+        
+        Args:
+            ids: Chunk IDs
+            metadatas: New metadata for each chunk
+            batch_size: Maximum number of chunks per array update
+        """
+        sql = f"""
+        UPDATE document_chunks c
+        SET c.chunk_index = :1, c.metadata = :2
+        WHERE c.document_id = (
+            SELECT d.document_id FROM documents d WHERE {MEMORY_ID_EXPR.format(alias='d')} = :3
+        )
+        AND JSON_VALUE(c.metadata, '$.chunk_hash') = :4
+        """
+        rows = [
+            (metadata.get('chunk_index', 0), json.dumps(metadata), metadata['document_id'], metadata['chunk_hash'])
+            for metadata in metadatas
+        ]
+        self._execute_many(sql, rows, batch_size)
+    
+    def _delete_chunks(self, ids: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Delete stored chunks
+        
+        Args:
+            ids: Chunk IDs
+            batch_size: Maximum number of chunks per array delete
+        """
+        sql = f"""
+        DELETE FROM document_chunks c
+        WHERE c.document_id = (
+            SELECT d.document_id FROM documents d WHERE {MEMORY_ID_EXPR.format(alias='d')} = :1
+        )
+        AND JSON_VALUE(c.metadata, '$.chunk_hash') = :2
+        """
+        self._execute_many(sql, [tuple(chunk_id.rsplit('_', 1)) for chunk_id in ids], batch_size)
+    
+    def search_documents(self, query: str, n_results: int = 5, file_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search for relevant document chunks using the approximate vector index
+        
+        Args:
+            query: The search query
+            n_results: Number of results to return
+            file_types: Optional filter by file types
+        
+        Returns:
+            List of relevant document chunks with metadata and cosine distance
+        """
+        try:
+            params = {
+                'query_vector': self._embed([query])[0],
+                'n_results': n_results
+            }
+            
+            file_type_filter = ""
+            if file_types:
+                binds = []
+                for i, file_type in enumerate(file_types):
+                    params[f'file_type_{i}'] = file_type
+                    binds.append(f":file_type_{i}")
+                file_type_filter = f"AND JSON_VALUE(c.metadata, '$.file_type') IN ({', '.join(binds)})"
+            
+            rows = self._fetch(f"""
+                SELECT c.chunk_text, c.metadata,
+                       VECTOR_DISTANCE(c.embedding_vector, :query_vector, COSINE) AS distance
+                FROM document_chunks c
+                WHERE c.embedding_vector IS NOT NULL
+                AND JSON_VALUE(c.metadata, '$.type') = 'document_chunk'
+                {file_type_filter}
+                ORDER BY distance
+                FETCH APPROX FIRST :n_results ROWS ONLY WITH TARGET ACCURACY {config.VECTOR_TARGET_ACCURACY}
+            """, params)
+            
+            return [
+                {
+                    "content": chunk_text,
+                    "metadata": json.loads(metadata_json) if metadata_json else {},
+                    "distance": float(distance) if distance is not None else None
+                }
+                for chunk_text, metadata_json, distance in rows
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error searching documents: {e}")
+            return []
+    
+    def get_document_by_id(self, document_id: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve all chunks of a specific document
+        
+        Args:
+            document_id: The document ID to retrieve
+        
+        Returns:
+            List of document chunks ordered by chunk index
+        """
+        try:
+            rows = self._fetch(f"""
+                SELECT c.chunk_text, c.metadata
+                FROM documents d JOIN document_chunks c ON c.document_id = d.document_id
+                WHERE {MEMORY_ID_EXPR.format(alias='d')} = :document_id
+                ORDER BY c.chunk_index
+            """, {'document_id': document_id})
+            
+            return [
+                {"content": chunk_text, "metadata": json.loads(metadata_json) if metadata_json else {}}
+                for chunk_text, metadata_json in rows
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error retrieving document {document_id}: {e}")
+            return []
+    
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """
+        List all stored documents
+        
+        Returns:
+            List of document summaries
+        """
+        try:
+            rows = self._fetch(f"""
+                SELECT {MEMORY_ID_EXPR.format(alias='d')}, d.filename, d.file_type, COUNT(c.chunk_id)
+                FROM documents d JOIN document_chunks c ON c.document_id = d.document_id
+                WHERE {MEMORY_ID_EXPR.format(alias='d')} IS NOT NULL
+                GROUP BY {MEMORY_ID_EXPR.format(alias='d')}, d.filename, d.file_type
+            """)
+            
+            return [
+                {
+                    "document_id": doc_id,
+                    "filename": filename or 'unknown',
+                    "file_type": file_type or 'unknown',
+                    "total_chunks": int(total_chunks)
+                }
+                for doc_id, filename, file_type, total_chunks in rows
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error listing documents: {e}")
+            return []
+    
+    def delete_document(self, document_id: str) -> bool:
+        """
+        Delete a document and all its chunks
+        
+        Args:
+            document_id: The document ID to delete
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # Chunks are removed by the ON DELETE CASCADE foreign key
+            deleted = self.db_manager.db.execute_update(
+                f"DELETE FROM documents d WHERE {MEMORY_ID_EXPR.format(alias='d')} = :document_id",
+                {'document_id': document_id}
+            )
+            
+            if deleted:
+                logger.info(f"Deleted document {document_id} from Oracle")
+                return True
+            else:
+                logger.warning(f"No chunks found for document {document_id}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error deleting document {document_id}: {e}")
+            return False
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the document memory
+        
+        Returns:
+            Dictionary with memory statistics
+        """
+        try:
+            rows = self._fetch(f"""
+                SELECT COUNT(c.chunk_id), COUNT(DISTINCT d.document_id)
+                FROM documents d JOIN document_chunks c ON c.document_id = d.document_id
+                WHERE {MEMORY_ID_EXPR.format(alias='d')} IS NOT NULL
+            """)
+            total_chunks, total_documents = rows[0]
+            
+            return {
+                "total_chunks": int(total_chunks),
+                "total_documents": int(total_documents),
+                "persist_directory": None,
+                "collection_name": "document_chunks",
+                "backend": "oracle"
+            }
+        
+        except Exception as e:
+            logger.error(f"Error getting memory stats: {e}")
+            return {"error": str(e)}
@@ -11,7 +11,10 @@ from shared.components import create_header, create_footer, create_sidebar_info
 from shared.utils import get_memory_stats, initialize_llm
 from local_memory import add_to_memory, search_memory, clear_memory
 from presearch import PreSearchManager
-from workflows import run_crew_workflow
+from workflows import stream_crew_workflow
+
+# Minimum seconds between redraws of a streaming response
+STREAM_RENDER_INTERVAL = 0.1
 
 def main():
     """Main function for the Chat page"""
@@ -168,23 +171,33 @@ def main():
                     if search_data.get('memory_results'):
                         st.write("✅ Found relevant memory context")
                 
-                # Run workflow
-                with st.expander("🤖 Processing with AI Agents", expanded=False):
-                    st.write("• 🔍 Research Specialist: Gathering information...")
-                    time.sleep(1)
-                    st.write("• 📊 Data Analyst: Analyzing findings...")
-                    time.sleep(1)
-                    st.write("• ✍️ Content Writer: Preparing response...")
-                    time.sleep(1)
+                # Execute workflow, showing each agent's output as it is generated
+                status_placeholder = st.empty()
+                workflow_result = ""
+                live_text = ""
+                last_render = 0.0
+                
+                for event in stream_crew_workflow(
+                    prompt, 
+                    llm, 
+                    st.session_state.messages, 
+                    use_native_function_calling=False
+                ):
+                    if event['type'] == 'start':
+                        live_text = ""
+                        status_placeholder.caption(f"✍️ {event.get('source') or 'AI agent'} is writing...")
+                    elif event['type'] == 'token':
+                        live_text += event['text']
+                        # Throttle redraws so long responses don't flood the browser
+                        if time.time() - last_render >= STREAM_RENDER_INTERVAL:
+                            response_placeholder.markdown(live_text + "▌")
+                            last_render = time.time()
+                    elif event['type'] == 'result':
+                        workflow_result = event['text']
+                    elif event['type'] == 'error':
+                        raise Exception(event['text'])
                 
-                # Execute workflow
-                with st.spinner("Running AI workflow..."):
-                    workflow_result = run_crew_workflow(
-                        prompt, 
-                        llm, 
-                        st.session_state.messages, 
-                        use_native_function_calling=False
-                    )
+                status_placeholder.empty()
                 
                 if not workflow_result or workflow_result.strip() == "":
                     workflow_result = "I apologize, but I couldn't generate a response. Please try rephrasing your question or check your API key."
@@ -6,7 +6,6 @@ This page provides a web-based interface for managing and querying the Oracle da
 
 import streamlit as st
 import pandas as pd
-import oracledb
 from oracle_database.database_config import config
 from oracle_database.database_manager import get_db_manager
 from oracle_database.database_utils import DatabaseUtils, test_connection, get_connection_info
@@ -110,11 +109,35 @@ def execute_sql_query(query):
     
     # Check if it's a SELECT query
     if query.strip().upper().startswith('SELECT'):
-        df = utils.execute_query(query)
+        # Rows are rendered batch by batch and capped, so large results never load all at once
+        stream = utils.stream_query(query, max_rows=config.QUERY_MAX_ROWS)
+        status = st.empty()
+        table = st.empty()
+        table_el = None
+        batches = []
+        try:
+            for batch in stream:
+                # Number rows across batches so the streamed table's index continues
+                batch.index = pd.RangeIndex(stream.rows - len(batch), stream.rows)
+                batches.append(batch)
+                status.info(f"⏳ Fetched {stream.rows:,} rows...")
+                # Later batches are appended to the rendered table instead of re-rendering every row
+                if table_el is None:
+                    table_el = table.dataframe(batch, use_container_width=True)
+                else:
+                    table_el.add_rows(batch)
+        except Exception as e:
+            status.error(f"Query execution failed: {e}")
+            utils.save_query_to_history(query)
+            return
+        
+        df = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
         
         if not df.empty:
-            st.success(f"✅ Query executed successfully! Found {len(df)} rows.")
-            st.dataframe(df, use_container_width=True)
+            if stream.truncated:
+                status.warning(f"⚠️ Showing the first {len(df):,} rows; the result was truncated at the {config.QUERY_MAX_ROWS:,} row limit.")
+            else:
+                status.success(f"✅ Query executed successfully! Found {len(df)} rows.")
             
             # Download option
             csv = df.to_csv(index=False)
@@ -125,7 +148,7 @@ def execute_sql_query(query):
                 mime="text/csv"
             )
         else:
-            st.info("Query executed successfully but returned no results.")
+            status.info("Query executed successfully but returned no results.")
     else:
         # Non-SELECT query
         success = utils.execute_non_query(query)
@@ -141,14 +164,8 @@ def schema_browser():
     st.markdown("Browse database schema and objects.")
     
     try:
-        conn_config = config.get_app_connection_config()
-        dsn = f"{conn_config['host']}:{conn_config['port']}/{conn_config['service_name']}"
-        
-        with oracledb.connect(
-            user=conn_config['username'],
-            password=conn_config['password'],
-            dsn=dsn
-        ) as conn:
+        # Connections come from the process-wide pool, so reruns skip the Oracle login
+        with DatabaseUtils().get_connection() as conn:
             cursor = conn.cursor()
             
             # Get tables
@@ -206,14 +223,8 @@ def table_data_viewer():
     st.markdown("View and explore table data.")
     
     try:
-        conn_config = config.get_app_connection_config()
-        dsn = f"{conn_config['host']}:{conn_config['port']}/{conn_config['service_name']}"
-        
-        with oracledb.connect(
-            user=conn_config['username'],
-            password=conn_config['password'],
-            dsn=dsn
-        ) as conn:
+        # Connections come from the process-wide pool, so reruns skip the Oracle login
+        with DatabaseUtils().get_connection() as conn:
             cursor = conn.cursor()
             
             # Get available tables
@@ -265,24 +276,21 @@ def database_statistics():
     
     try:
         conn_config = config.get_app_connection_config()
-        dsn = f"{conn_config['host']}:{conn_config['port']}/{conn_config['service_name']}"
+        utils = DatabaseUtils()
+        
+        # Version and object counts in a single round trip
+        stats = utils.get_database_stats()
+        if not stats:
+            return
         
-        with oracledb.connect(
-            user=conn_config['username'],
-            password=conn_config['password'],
-            dsn=dsn
-        ) as conn:
+        with utils.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Database info
-            cursor.execute("SELECT * FROM v$version WHERE banner LIKE '%Oracle%'")
-            version = cursor.fetchone()[0]
-            
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("#### 🗄️ Database Information")
-                st.info(f"**Version:** {version}")
+                st.info(f"**Version:** {stats['version']}")
                 st.info(f"**Host:** {conn_config['host']}")
                 st.info(f"**Port:** {conn_config['port']}")
                 st.info(f"**Service:** {conn_config['service_name']}")
@@ -291,32 +299,11 @@ def database_statistics():
             with col2:
                 st.markdown("#### 📊 Object Statistics")
                 
-                # Table counts
-                cursor.execute("SELECT COUNT(*) FROM user_tables")
-                table_count = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM user_views")
-                view_count = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM user_indexes")
-                index_count = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM user_sequences")
-                sequence_count = cursor.fetchone()[0]
-                
-                # Get total row count across all tables
-                cursor.execute("""
-                    SELECT SUM(num_rows) 
-                    FROM user_tables 
-                    WHERE num_rows IS NOT NULL
-                """)
-                total_rows = cursor.fetchone()[0] or 0
-                
-                st.metric("Tables", table_count)
-                st.metric("Views", view_count)
-                st.metric("Indexes", index_count)
-                st.metric("Sequences", sequence_count)
-                st.metric("Total Rows", f"{total_rows:,}")
+                st.metric("Tables", stats['table_count'])
+                st.metric("Views", stats['view_count'])
+                st.metric("Indexes", stats['index_count'])
+                st.metric("Sequences", stats['sequence_count'])
+                st.metric("Total Rows", f"{stats['total_rows']:,}")
             
             # Space usage
             st.markdown("#### 💾 Space Usage")
@@ -378,6 +365,21 @@ def database_statistics():
             
             cursor.close()
             
+        # Connection pool
+        st.markdown("#### 🔌 Connection Pool")
+        pool_stats = utils.get_pool_stats()
+        if pool_stats['pool_created']:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Open / Max", f"{pool_stats['opened']} / {pool_stats['max']}")
+            col2.metric("Busy", pool_stats['busy'])
+            col3.metric("Acquire p95", f"{pool_stats['acquire_ms']['p95']:.1f} ms")
+            col4.metric("Checkout p95", f"{pool_stats['hold_ms']['p95']:.1f} ms")
+            st.caption(
+                f"{pool_stats['checkouts']} checkouts, {pool_stats['failed_checkouts']} failed, "
+                f"{pool_stats['dropped_connections']} dead connections dropped; "
+                f"statement cache {pool_stats['statement_cache_size']} per connection"
+            )
+    
     except Exception as e:
         st.error(f"❌ Statistics retrieval failed: {str(e)}")
     
@@ -3,29 +3,103 @@ Pre-search Manager for CrewAI Multi-Agent Workflow
 
 This module handles pre-searching data before agent teams process it.
 It combines web search results with conversation memory for comprehensive context.
+Memory, document memory and several web query variants are searched concurrently.
 """
 
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from typing import List, Any, Optional, Dict
 from agent_tools import search_web
+from agent_tools.search_tool import search_web_results, format_search_results
+from agent_tools.search_cache import normalize_query
+from agent_tools.document_memory_manager import search_documents_in_memory
 from local_memory import search_memory
 
+# Number of web queries issued per pre-search (the query itself plus expansions)
+DEFAULT_MAX_WEB_QUERIES = 3
+
+# Words dropped when deriving keyword expansions of a query
+QUERY_STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'could', 'do', 'does', 'for', 'from',
+    'how', 'i', 'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'our', 'please', 'should', 'that',
+    'the', 'this', 'to', 'we', 'what', 'when', 'which', 'who', 'why', 'with', 'would', 'you', 'your'
+}
+
+
+def expand_query(query: str, max_queries: int = DEFAULT_MAX_WEB_QUERIES) -> List[str]:
+    """
+    Derive web search variants of a query for wider coverage
+    
+    Args:
+        query: The user's query
+        max_queries: Maximum number of queries to return (including the query itself)
+        
+    Returns:
+        List of distinct queries, starting with the original
+    """
+    keywords = [word for word in re.findall(r"[\w'-]+", query) if word.lower() not in QUERY_STOPWORDS]
+    core = " ".join(keywords) or query.strip()
+    
+    candidates = [
+        query.strip(),
+        core,
+        f"{core} best practices",
+        f"{core} case study",
+        f"{core} latest research {time.strftime('%Y')}"
+    ]
+    
+    queries = []
+    seen = set()
+    for candidate in candidates:
+        normalized = normalize_query(candidate)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            queries.append(candidate)
+    
+    return queries[:max(1, max_queries)]
+
+
+def _url_key(url: str) -> str:
+    """Normalize a URL for deduplication (scheme, www., fragment and trailing slash ignored)"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
 
 class PreSearchManager:
     """
     Manages pre-search functionality for gathering context before agent processing.
     """
     
-    def __init__(self, memory_enabled: bool = True, max_memory_results: int = 3):
+    def __init__(
+        self, 
+        memory_enabled: bool = True, 
+        max_memory_results: int = 3,
+        document_memory_enabled: bool = True,
+        max_document_results: int = 3,
+        max_web_queries: int = DEFAULT_MAX_WEB_QUERIES
+    ):
         """
         Initialize the PreSearchManager.
         
         Args:
             memory_enabled: Whether to search conversation memory
             max_memory_results: Maximum number of memory results to retrieve
+            document_memory_enabled: Whether to search uploaded documents in memory and
+                add their excerpts to the combined context
+            max_document_results: Maximum number of document chunks to retrieve
+            max_web_queries: Number of web queries (the query plus expansions) to run
         """
         self.memory_enabled = memory_enabled
         self.max_memory_results = max_memory_results
+        self.document_memory_enabled = document_memory_enabled
+        self.max_document_results = max_document_results
+        self.max_web_queries = max_web_queries
     
     def search_and_combine_context(
         self, 
@@ -46,34 +120,39 @@ class PreSearchManager:
         
         print(f"🔍 Pre-searching data for query: {query}")
         
-        # Search conversation memory
-        memory_results = None
+        web_queries = expand_query(query, self.max_web_queries)
+        print(f"🔍 Web queries: {web_queries}")
+        
+        # Fan out all searches at once; total time is that of the slowest call
+        with ThreadPoolExecutor(max_workers=len(web_queries) + 2) as executor:
+            memory_future = executor.submit(self.get_memory_results_only, query) if self.memory_enabled else None
+            document_future = executor.submit(self._search_document_memory, query) if self.document_memory_enabled else None
+            web_futures = [executor.submit(self._search_web_raw, web_query) for web_query in web_queries]
+            
+            memory_results = memory_future.result() if memory_future else None
+            document_results = document_future.result() if document_future else None
+            web_result_lists = [future.result() for future in web_futures]
+        
         if self.memory_enabled:
-            try:
-                memory_results = search_memory(query, n_results=self.max_memory_results)
-                if memory_results:
-                    print(f"🧠 Found {len(memory_results)} similar past conversations")
-                else:
-                    print("🧠 No similar past conversations found")
-            except Exception as e:
-                print(f"⚠️ Memory search failed: {e}")
-                memory_results = None
-        
-        # Search web for current information
-        web_results = None
-        try:
-            web_results = search_web.run(query)
-            if web_results:
-                print(f"🔍 Found {len(web_results)} web search results")
+            if memory_results:
+                print(f"🧠 Found {len(memory_results)} similar past conversations")
             else:
-                print("🔍 No web search results found")
-        except Exception as e:
-            print(f"⚠️ Web search failed: {e}")
-            web_results = None
+                print("🧠 No similar past conversations found")
+        
+        if document_results:
+            print(f"📄 Found {len(document_results)} relevant document chunks")
+        
+        # Merge web results from all queries, keeping the first occurrence of each URL
+        web_sources = self._merge_web_results(web_result_lists)
+        web_results = format_search_results(query, web_sources) if web_sources else None
+        if web_sources:
+            print(f"🔍 Found {len(web_sources)} unique web sources from {len(web_queries)} queries")
+        else:
+            print("🔍 No web search results found")
         
         # Combine all context sources
         combined_context = self._combine_context_sources(
-            query, memory_results, web_results, conversation_history
+            query, memory_results, web_results, conversation_history, document_results
         )
         
         # Log performance metrics
@@ -83,18 +162,63 @@ class PreSearchManager:
         return {
             'query': query,
             'memory_results': memory_results,
+            'document_results': document_results,
             'web_results': web_results,
+            'web_sources': web_sources,
+            'web_queries': web_queries,
             'combined_context': combined_context,
             'search_time': elapsed_time,
             'conversation_history': conversation_history
         }
     
+    def _search_web_raw(self, query: str) -> List[Dict[str, Any]]:
+        """Run one web query, returning raw results (empty on failure)"""
+        try:
+            return search_web_results(query)
+        except Exception as e:
+            print(f"⚠️ Web search failed for '{query}': {e}")
+            return []
+    
+    def _search_document_memory(self, query: str) -> List[Dict[str, Any]]:
+        """Search uploaded documents stored in memory (empty on failure)"""
+        try:
+            return search_documents_in_memory(query, n_results=self.max_document_results)
+        except Exception as e:
+            print(f"⚠️ Document memory search failed: {e}")
+            return []
+    
+    def _merge_web_results(self, result_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Merge web results from several queries, deduplicated by URL.
+        
+        Args:
+            result_lists: Raw results per query, original query first
+            
+        Returns:
+            Unique results in query order
+        """
+        merged = []
+        seen_urls = set()
+        
+        for results in result_lists:
+            for result in results or []:
+                url = result.get('href')
+                key = _url_key(url) if url else None
+                if key in seen_urls:
+                    continue
+                if key:
+                    seen_urls.add(key)
+                merged.append(result)
+        
+        return merged
+    
     def _combine_context_sources(
         self, 
         query: str, 
         memory_results: Optional[str], 
         web_results: Optional[str], 
-        conversation_history: Optional[List[Any]] = None
+        conversation_history: Optional[List[Any]] = None,
+        document_results: Optional[List[Dict[str, Any]]] = None
     ) -> str:
         """
         Combine all context sources into a single string.
@@ -104,6 +228,7 @@ class PreSearchManager:
             memory_results: Results from conversation memory search
             web_results: Results from web search
             conversation_history: Previous conversation context
+            document_results: Relevant chunks from uploaded documents
             
         Returns:
             Combined context string
@@ -114,6 +239,13 @@ class PreSearchManager:
         if memory_results:
             combined_context += f"Similar past conversations:\n{memory_results}\n\n"
         
+        # Add uploaded document excerpts if available
+        if document_results:
+            combined_context += "Relevant uploaded document excerpts:\n"
+            for chunk in document_results:
+                filename = chunk.get('metadata', {}).get('filename', 'Unknown document')
+                combined_context += f"[{filename}] {chunk.get('content', '')}\n\n"
+        
         # Add web search results if available
         if web_results:
             combined_context += f"Current search results:\n{web_results}\n\n"
@@ -0,0 +1,90 @@
+"""
+Test script for pre-search query expansion and context combination
+"""
+
+from presearch import presearch_manager
+from presearch.presearch_manager import PreSearchManager, expand_query
+
+
+def test_expand_query_variants():
+    """Test that expansions start with the original query and drop stopwords"""
+    print("🧪 Testing query expansion...")
+    
+    queries = expand_query("What is the best data governance framework?", max_queries=5)
+    
+    assert queries[0] == "What is the best data governance framework?"
+    assert queries[1] == "best data governance framework"
+    assert "best data governance framework case study" in queries
+    assert len(queries) == len(set(queries))
+    
+    print(f"✅ Expanded into {len(queries)} queries: {queries}")
+
+
+def test_expand_query_limits():
+    """Test the query limit and deduplication of variants that normalize to the same text"""
+    print("\n🧪 Testing query expansion limits...")
+    
+    assert expand_query("data governance", max_queries=1) == ["data governance"]
+    assert expand_query("data governance", max_queries=0) == ["data governance"]
+    
+    # Without stopwords the keyword variant equals the query and is skipped
+    queries = expand_query("data governance", max_queries=3)
+    assert queries == ["data governance", "data governance best practices", "data governance case study"]
+    
+    print("✅ Limits and deduplication respected")
+
+
+def test_default_presearch_fans_out():
+    """Test that a default pre-search runs the query expansions and searches uploaded documents"""
+    print("\n🧪 Testing default pre-search...")
+    
+    web_queries = []
+    document_searches = []
+    
+    def fake_web_results(query):
+        web_queries.append(query)
+        return [{'title': 'Result', 'href': 'https://example.com/a', 'body': 'Body'}]
+    
+    def fake_document_search(query, n_results=3):
+        document_searches.append(query)
+        return [{'content': 'Document excerpt', 'metadata': {'filename': 'doc.pdf'}}]
+    
+    original_web, original_documents = presearch_manager.search_web_results, presearch_manager.search_documents_in_memory
+    presearch_manager.search_web_results = fake_web_results
+    presearch_manager.search_documents_in_memory = fake_document_search
+    try:
+        result = PreSearchManager(memory_enabled=False).search_and_combine_context("data governance")
+        assert sorted(web_queries) == sorted(expand_query("data governance", max_queries=3))
+        assert len(web_queries) == 3
+        assert document_searches == ["data governance"]
+        assert "[doc.pdf] Document excerpt" in result['combined_context']
+        
+        web_queries.clear()
+        document_searches.clear()
+        result = PreSearchManager(
+            memory_enabled=False, document_memory_enabled=False, max_web_queries=1
+        ).search_and_combine_context("data governance")
+        assert web_queries == ["data governance"]
+        assert document_searches == []
+        assert "Relevant uploaded document excerpts" not in result['combined_context']
+    finally:
+        presearch_manager.search_web_results = original_web
+        presearch_manager.search_documents_in_memory = original_documents
+    
+    print("✅ Default pre-search ran three web queries and included document excerpts")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting pre-search tests...")
+    
+    try:
+        test_expand_query_variants()
+        test_expand_query_limits()
+        test_default_presearch_fans_out()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -116,9 +116,10 @@ def main():
     
     # Check Ollama Cloud status
     try:
-        import requests
-        status_response = requests.get("https://ollama.com/api/tags", timeout=5)
-        if status_response.status_code == 200:
+        from agent_tools.http_session import http_get
+        with http_get("https://ollama.com/api/tags", timeout=5) as status_response:
+            status_ok = status_response.status_code == 200
+        if status_ok:
             st.info("🚀 **Using Ollama Cloud (Turbo)** - Access to 120B+ models with faster inference ✅")
         else:
             st.warning("⚠️ **Ollama Cloud Status** - Service may be experiencing issues. Retry logic enabled.")
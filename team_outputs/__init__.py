@@ -5,6 +5,6 @@ This module provides functionality to save and organize team outputs
 from the CrewAI multi-agent workflows.
 """
 
-from .output_manager import TeamOutputManager
+from .output_manager import TeamOutputManager, WorkflowCheckpointer
 
-__all__ = ['TeamOutputManager']
+__all__ = ['TeamOutputManager', 'WorkflowCheckpointer']
@@ -7,9 +7,20 @@ into structured markdown files.
 
 import os
 import json
+import time
+import uuid
+import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
+
+# Team checkpoints are kept in this subdirectory of the output directory
+CHECKPOINT_DIR_NAME = "checkpoints"
+
+# Checkpoints older than this are not reused when a workflow is rerun
+CHECKPOINT_MAX_AGE_SECONDS = int(os.getenv('WORKFLOW_CHECKPOINT_MAX_AGE_HOURS', '24')) * 60 * 60
+
+CHECKPOINTS_ENABLED = os.getenv('WORKFLOW_CHECKPOINTS_ENABLED', 'true').lower() == 'true'
 
 
 class TeamOutputManager:
@@ -196,6 +207,201 @@ class TeamOutputManager:
         with open(index_file, 'w', encoding='utf-8') as f:
             f.write(content)
     
+    @staticmethod
+    def make_query_hash(query: str, *context: Any) -> str:
+        """
+        Hash a query together with any context that changes the teams' outputs.
+        
+        Args:
+            query: Original user query
+            *context: Further inputs, e.g. conversation history, document context,
+                models or the team selection (values that are not JSON are hashed
+                by their string form)
+        
+        Returns:
+            Hex digest identifying the query
+        """
+        payload = json.dumps(
+            [" ".join(query.split())] + [item if item is not None else "" for item in context],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def make_run_id(workflow_type: str, query_hash: str) -> str:
+        """
+        Build the run ID under which a workflow's checkpoints are stored.
+        
+        Reruns of the same workflow with the same query and context share a run
+        ID, so they find the checkpoints of an earlier, incomplete run.
+        
+        Args:
+            workflow_type: Type of workflow
+            query_hash: Hash from make_query_hash over the query and its context
+        
+        Returns:
+            Run ID
+        """
+        return f"{workflow_type}_{query_hash[:16]}"
+    
+    @staticmethod
+    def _checkpoint_name(team_key: str) -> str:
+        """File name stem of a team's checkpoints."""
+        return team_key.lower().replace(" ", "_").replace("&", "and")
+    
+    def _checkpoint_path(self, run_id: str, team_key: str, token: Optional[str] = None) -> Path:
+        """Path of a team's checkpoint file, written by the run holding token."""
+        suffix = f".{token}.json" if token else ".json"
+        return self.base_dir / CHECKPOINT_DIR_NAME / run_id / f"{self._checkpoint_name(team_key)}{suffix}"
+    
+    def save_checkpoint(
+        self, 
+        run_id: str, 
+        team_key: str, 
+        team_output: str,
+        query_hash: str,
+        token: Optional[str] = None
+    ) -> str:
+        """
+        Save a completed team's output as a checkpoint.
+        
+        Args:
+            run_id: Workflow run ID
+            team_key: Team identifier within the workflow
+            team_output: Team's output content
+            query_hash: Hash of the query the output answers
+            token: Token of the run writing the checkpoint; concurrent runs of
+                the same query each write their own file
+        
+        Returns:
+            Path to the checkpoint file
+        """
+        file_path = self._checkpoint_path(run_id, team_key, token)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        checkpoint = {
+            "run_id": run_id,
+            "team": team_key,
+            "token": token,
+            "query_hash": query_hash,
+            "completed_at": time.time(),
+            "output": team_output
+        }
+        
+        # Write to a temporary file first so a crash never leaves a partial checkpoint
+        temp_path = file_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, file_path)
+        
+        return str(file_path)
+    
+    def find_checkpoint(
+        self, 
+        run_id: str, 
+        team_key: str, 
+        query_hash: str,
+        max_age_seconds: int = CHECKPOINT_MAX_AGE_SECONDS
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the newest usable checkpoint of a team, whichever run wrote it.
+        
+        Args:
+            run_id: Workflow run ID
+            team_key: Team identifier within the workflow
+            query_hash: Hash of the current query (checkpoints for other queries are ignored)
+            max_age_seconds: Maximum age of a usable checkpoint
+        
+        Returns:
+            Checkpoint dictionary with its file under 'path', or None if there is no usable checkpoint
+        """
+        run_dir = self.base_dir / CHECKPOINT_DIR_NAME / run_id
+        name = self._checkpoint_name(team_key)
+        candidates = [run_dir / f"{name}.json"] + sorted(run_dir.glob(f"{name}.*.json"))
+        newest = None
+        
+        for file_path in candidates:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable checkpoint {file_path}: {e}")
+                continue
+            
+            if checkpoint.get("team") != team_key or checkpoint.get("query_hash") != query_hash:
+                continue
+            if time.time() - checkpoint.get("completed_at", 0) > max_age_seconds:
+                continue
+            if newest is None or checkpoint.get("completed_at", 0) > newest.get("completed_at", 0):
+                newest = dict(checkpoint, path=str(file_path))
+        
+        return newest
+    
+    def load_checkpoint(
+        self, 
+        run_id: str, 
+        team_key: str, 
+        query_hash: str,
+        max_age_seconds: int = CHECKPOINT_MAX_AGE_SECONDS
+    ) -> Optional[str]:
+        """
+        Load a team's checkpointed output.
+        
+        Args:
+            run_id: Workflow run ID
+            team_key: Team identifier within the workflow
+            query_hash: Hash of the current query (checkpoints for other queries are ignored)
+            max_age_seconds: Maximum age of a usable checkpoint
+        
+        Returns:
+            Checkpointed output, or None if there is no usable checkpoint
+        """
+        checkpoint = self.find_checkpoint(run_id, team_key, query_hash, max_age_seconds)
+        return checkpoint.get("output") if checkpoint else None
+    
+    def clear_checkpoints(
+        self, 
+        run_id: str, 
+        token: Optional[str] = None, 
+        extra_paths: Optional[List[str]] = None
+    ) -> int:
+        """
+        Remove the checkpoints of a workflow run.
+        
+        Args:
+            run_id: Workflow run ID
+            token: Only remove the checkpoints written by the run holding this
+                token (None removes every checkpoint of the run ID)
+            extra_paths: Further checkpoint files to remove, e.g. those the run resumed from
+        
+        Returns:
+            Number of checkpoints removed
+        """
+        run_dir = self.base_dir / CHECKPOINT_DIR_NAME / run_id
+        if not run_dir.exists():
+            return 0
+        
+        pattern = f"*.{token}.json" if token else "*"
+        targets = set(run_dir.glob(pattern)) | {Path(path) for path in extra_paths or []}
+        
+        removed = 0
+        for file_path in targets:
+            try:
+                file_path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        
+        # Another run of the same query may still be writing checkpoints here
+        try:
+            run_dir.rmdir()
+        except OSError:
+            pass
+        
+        return removed
+    
     def list_workflow_outputs(self, workflow_type: Optional[str] = None) -> List[str]:
         """
         List available workflow outputs.
@@ -212,7 +418,7 @@ class TeamOutputManager:
                 return [str(f) for f in workflow_dir.iterdir() if f.is_dir()]
             return []
         else:
-            return [str(f) for f in self.base_dir.iterdir() if f.is_dir()]
+            return [str(f) for f in self.base_dir.iterdir() if f.is_dir() and f.name != CHECKPOINT_DIR_NAME]
     
     def get_output_summary(self) -> Dict[str, Any]:
         """
@@ -229,7 +435,7 @@ class TeamOutputManager:
         }
         
         for workflow_dir in self.base_dir.iterdir():
-            if workflow_dir.is_dir():
+            if workflow_dir.is_dir() and workflow_dir.name != CHECKPOINT_DIR_NAME:
                 summary["total_workflows"] += 1
                 workflow_type = workflow_dir.name
                 
@@ -249,6 +455,87 @@ class TeamOutputManager:
         return summary
 
 
+class WorkflowCheckpointer:
+    """
+    Checkpoints each team's output during a workflow run.
+    
+    A rerun of the same workflow and query restores the teams that already
+    completed and resumes with the first incomplete one. Each run writes its
+    checkpoints under its own token, so when one of several concurrent runs
+    of the same query completes it only removes its own checkpoints and the
+    ones it resumed from.
+    """
+    
+    def __init__(
+        self, 
+        workflow_type: str, 
+        query: str, 
+        *context: Any,
+        run_id: Optional[str] = None,
+        output_manager: Optional[TeamOutputManager] = None,
+        enabled: bool = CHECKPOINTS_ENABLED
+    ):
+        """
+        Initialize the WorkflowCheckpointer.
+        
+        Args:
+            workflow_type: Type of workflow (e.g., "seven_team_workflow")
+            query: Original user query
+            *context: Further inputs that change the teams' outputs (e.g. conversation
+                history, document context, models)
+            run_id: Explicit run ID (defaults to one derived from the workflow, query and context)
+            output_manager: Manager storing the checkpoints
+            enabled: Set to False to always run every team
+        """
+        self.output_manager = output_manager or TeamOutputManager()
+        self.query_hash = TeamOutputManager.make_query_hash(query, *context)
+        self.run_id = run_id or TeamOutputManager.make_run_id(workflow_type, self.query_hash)
+        self.enabled = enabled
+        self.token = uuid.uuid4().hex[:12]
+        self.resumed_teams: List[str] = []
+        self._resumed_paths: List[str] = []
+    
+    def run_team(self, team_key: str, run: Callable[[], Any]) -> Optional[str]:
+        """
+        Return a team's checkpointed output, or run the team and checkpoint it.
+        
+        Args:
+            team_key: Team identifier within the workflow
+            run: Callable executing the team (e.g. crew.kickoff)
+        
+        Returns:
+            Team output, or None if the team produced no result
+        """
+        if self.enabled:
+            checkpoint = self.output_manager.find_checkpoint(self.run_id, team_key, self.query_hash)
+            if checkpoint is not None and checkpoint.get("output") is not None:
+                print(f"♻️ {team_key} restored from checkpoint (run {self.run_id})")
+                self.resumed_teams.append(team_key)
+                self._resumed_paths.append(checkpoint["path"])
+                return checkpoint["output"]
+        
+        result = run()
+        if result is None:
+            return None
+        
+        team_output = str(result)
+        if self.enabled:
+            try:
+                self.output_manager.save_checkpoint(self.run_id, team_key, team_output, self.query_hash, self.token)
+            except OSError as e:
+                print(f"⚠️ Checkpoint save failed for {team_key}: {e}")
+        
+        return team_output
+    
+    def complete(self) -> None:
+        """Remove this run's checkpoints, and those it resumed from, once the workflow has finished successfully."""
+        if self.enabled:
+            try:
+                self.output_manager.clear_checkpoints(self.run_id, self.token, self._resumed_paths)
+            except OSError as e:
+                print(f"⚠️ Checkpoint cleanup failed for run {self.run_id}: {e}")
+
+
 # Convenience function for backward compatibility
 def save_team_outputs(
     workflow_type: str, 
@@ -2,7 +2,9 @@
 Test script for team output saving functionality
 """
 
-from output_manager import TeamOutputManager, save_team_outputs
+import tempfile
+
+from output_manager import TeamOutputManager, WorkflowCheckpointer, save_team_outputs
 
 
 def test_output_manager():
@@ -79,6 +81,42 @@ def test_convenience_function():
     return output_path
 
 
+def test_checkpoints():
+    """Test checkpoint run IDs and that concurrent runs keep each other's checkpoints"""
+    print("\n🧪 Testing workflow checkpoints...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = TeamOutputManager(base_dir=temp_dir)
+        history = [{"role": "user", "content": "Earlier question"}]
+        models = {"research_analysis": "ollama/model-a"}
+        
+        first = WorkflowCheckpointer("test_workflow", "Query", history, "Docs", models, output_manager=manager)
+        second = WorkflowCheckpointer("test_workflow", "Query", history, "Docs", models, output_manager=manager)
+        assert first.run_id == second.run_id
+        
+        # Conversation history, documents and models all change the run ID
+        for context in ([], "Docs", models), (history, "Other docs", models), (history, "Docs", {"research_analysis": "ollama/model-b"}):
+            other = WorkflowCheckpointer("test_workflow", "Query", *context, output_manager=manager)
+            assert other.run_id != first.run_id
+        
+        assert first.run_team("research_analysis", lambda: "first output") == "first output"
+        assert second.run_team("data_strategy", lambda: "second output") == "second output"
+        
+        # Completing the first run leaves the concurrent second run's checkpoint in place
+        first.complete()
+        assert manager.load_checkpoint(first.run_id, "research_analysis", first.query_hash) is None
+        assert manager.load_checkpoint(second.run_id, "data_strategy", second.query_hash) == "second output"
+        
+        # A rerun resumes from the checkpoint and removes it once complete
+        rerun = WorkflowCheckpointer("test_workflow", "Query", history, "Docs", models, output_manager=manager)
+        assert rerun.run_team("data_strategy", lambda: "not called") == "second output"
+        assert rerun.resumed_teams == ["data_strategy"]
+        rerun.complete()
+        assert manager.load_checkpoint(rerun.run_id, "data_strategy", rerun.query_hash) is None
+    
+    print("✅ Checkpoints scoped to their run")
+
+
 if __name__ == "__main__":
     print("🚀 Starting team output saving tests...")
     
@@ -89,8 +127,11 @@ if __name__ == "__main__":
         # Test convenience function
         test_convenience_function()
         
-        print("\n✅ All tests completed successfully!")
+        # Test checkpoints
+        test_checkpoints()
         
+        print("\n✅ All tests completed successfully!")
+    
     except Exception as e:
         print(f"\n❌ Test failed: {e}")
         import traceback
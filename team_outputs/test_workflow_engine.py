@@ -0,0 +1,231 @@
+"""
+Test script for workflow stage ordering, the routing of team results and resuming reruns
+"""
+
+import tempfile
+
+from team_outputs.output_manager import TeamOutputManager
+from workflows import workflow_engine
+from workflows.workflow_engine import (
+    WorkflowEngine,
+    WorkflowSpec,
+    StageSpec,
+    TeamDefinition,
+    configured_stages,
+    THREE_TEAM_WORKFLOW,
+    SEVEN_TEAM_WORKFLOW,
+)
+
+
+def make_team(name: str, received: dict, native_tools: bool = False) -> TeamDefinition:
+    """Define a team whose single task records the input it was given"""
+    def create_agents(llm, conversation_history, use_tools=False):
+        return {'agent': name}
+    
+    def create_tasks(agents, query, input_data, conversation_history, document_context):
+        received[name] = input_data
+        return [name]
+    
+    return TeamDefinition(name=name, create_agents=create_agents, agent_keys=['agent'], create_tasks=create_tasks,
+                          native_tools=native_tools)
+
+
+class FakeCrew:
+    """Crew whose result names the team that ran it"""
+    
+    def __init__(self, agents, tasks, **kwargs):
+        self.tasks = tasks
+    
+    def kickoff(self):
+        return f"{self.tasks[0]} output"
+
+
+def test_configured_stage_ordering():
+    """Test that the fixed workflows follow the configured dependency chain"""
+    print("🧪 Testing configured stage ordering...")
+    
+    engine = WorkflowEngine()
+    
+    assert engine.get_execution_stages(THREE_TEAM_WORKFLOW) == [
+        ["research_analysis"], ["data_strategy"], ["compliance_risk"]
+    ]
+    assert engine.get_execution_stages(SEVEN_TEAM_WORKFLOW) == [
+        ["research_analysis"], ["data_strategy"], ["compliance_risk"], ["information_management"],
+        ["tender_response", "project_delivery"], ["technical_documentation"]
+    ]
+    
+    # Dependencies on teams left out are replaced by their own dependencies
+    stages = {stage.team: stage.depends_on for stage in configured_stages("research_analysis", "information_management")}
+    assert stages == {"research_analysis": [], "information_management": ["research_analysis"]}
+    
+    print("✅ Fixed workflows follow Data Strategy → Compliance & Risk → Information Management")
+
+
+def test_invalid_specs():
+    """Test that unknown teams, missing dependencies and cycles are rejected"""
+    print("\n🧪 Testing invalid workflow specs...")
+    
+    engine = WorkflowEngine()
+    invalid_specs = [
+        [StageSpec("unknown_team")],
+        [StageSpec("data_strategy", depends_on=["research_analysis"])],
+        [StageSpec("data_strategy", depends_on=["compliance_risk"]),
+         StageSpec("compliance_risk", depends_on=["data_strategy"])],
+    ]
+    
+    for stages in invalid_specs:
+        try:
+            engine.get_execution_stages(WorkflowSpec(name="invalid_workflow", label="invalid workflow", stages=stages))
+        except ValueError as e:
+            print(f"✅ Rejected: {e}")
+        else:
+            raise AssertionError(f"Spec was accepted: {stages}")
+
+
+def test_result_routing():
+    """Test that each team receives the outputs of exactly the teams it depends on"""
+    print("\n🧪 Testing result routing...")
+    
+    received = {}
+    engine = WorkflowEngine(team_definitions={
+        team: make_team(team, received) for team in ["first", "second", "third", "fourth"]
+    })
+    spec = WorkflowSpec(
+        name="routing_workflow",
+        label="routing workflow",
+        heading="Routing Results",
+        stages=[
+            StageSpec("first"),
+            StageSpec("second", depends_on=["first"]),
+            StageSpec("third", depends_on=["second"]),
+            StageSpec("fourth", depends_on=["first", "third"]),
+        ],
+        save_memory=False,
+        checkpoint=False
+    )
+    
+    original_crew, original_presearch = workflow_engine.Crew, workflow_engine.perform_workflow_presearch
+    workflow_engine.Crew = FakeCrew
+    workflow_engine.perform_workflow_presearch = lambda query, name, history=None: {'web_results': "pre-search results"}
+    try:
+        result = engine.execute(spec, "query", llm=object())
+    finally:
+        workflow_engine.Crew = original_crew
+        workflow_engine.perform_workflow_presearch = original_presearch
+    
+    assert received["first"] == "pre-search results"
+    assert received["second"] == "first output"
+    assert received["third"] == "second output"
+    assert received["fourth"] == "=== first Output ===\nfirst output\n\n=== third Output ===\nthird output"
+    assert result.team_results == {team: f"{team} output" for team in ["first", "second", "third", "fourth"]}
+    assert result.metrics['stages'] == [["first"], ["second"], ["third"], ["fourth"]]
+    
+    print(f"✅ Results routed along {result.metrics['stages']}")
+
+
+def test_native_function_calling_inputs():
+    """Test that with native function calling only root teams with native tools skip pre-search"""
+    print("\n🧪 Testing root team inputs with native function calling...")
+    
+    received = {}
+    engine = WorkflowEngine(team_definitions={
+        "searcher": make_team("searcher", received, native_tools=True),
+        "strategist": make_team("strategist", received)
+    })
+    spec = WorkflowSpec(
+        name="native_workflow",
+        label="native workflow",
+        heading="Native Results",
+        stages=[StageSpec("searcher"), StageSpec("strategist")],
+        save_memory=False,
+        checkpoint=False
+    )
+    
+    original_crew, original_presearch = workflow_engine.Crew, workflow_engine.perform_workflow_presearch
+    workflow_engine.Crew = FakeCrew
+    workflow_engine.perform_workflow_presearch = lambda query, name, history=None: {'web_results': "pre-search results"}
+    try:
+        engine.execute(spec, "query", llm=object(), use_native_function_calling=True)
+    finally:
+        workflow_engine.Crew = original_crew
+        workflow_engine.perform_workflow_presearch = original_presearch
+    
+    assert received == {"searcher": "", "strategist": "pre-search results"}
+    
+    print("✅ Root team without native tools received the pre-search results")
+
+
+def test_rerun_resumes_after_failure():
+    """Test that rerunning a failed query from the chat page resumes from the first incomplete team"""
+    print("\n🧪 Testing rerun after a failure...")
+    
+    received = {}
+    definitions = {team: make_team(team, received) for team in ["first", "second"]}
+    failing_create_tasks = definitions["second"].create_tasks
+    
+    def fail_once(*args):
+        definitions["second"].create_tasks = failing_create_tasks
+        raise RuntimeError("second team failed")
+    
+    definitions["second"].create_tasks = fail_once
+    engine = WorkflowEngine(team_definitions=definitions)
+    spec = WorkflowSpec(
+        name="resume_workflow",
+        label="resume workflow",
+        heading="Resume Results",
+        stages=[StageSpec("first"), StageSpec("second", depends_on=["first"])],
+        save_memory=False
+    )
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_manager = TeamOutputManager(base_dir=temp_dir)
+        original_crew, original_checkpointer = workflow_engine.Crew, workflow_engine.WorkflowCheckpointer
+        original_presearch = workflow_engine.perform_workflow_presearch
+        workflow_engine.Crew = FakeCrew
+        workflow_engine.perform_workflow_presearch = lambda query, name, history=None: {'web_results': "pre-search results"}
+        workflow_engine.WorkflowCheckpointer = lambda *args, **kwargs: original_checkpointer(
+            *args, output_manager=output_manager, **kwargs
+        )
+        try:
+            # The chat page appends the prompt before a run and the result or error after it
+            messages = [{"role": "user", "content": "earlier question"}, {"role": "assistant", "content": "earlier answer"}]
+            messages.append({"role": "user", "content": "query"})
+            try:
+                engine.execute(spec, "query", object(), messages)
+            except RuntimeError as e:
+                messages.append({"role": "assistant", "content": f"❌ Workflow execution failed: {e}"})
+            else:
+                raise AssertionError("The first run did not fail")
+            
+            received.clear()
+            messages.append({"role": "user", "content": "query"})
+            result = engine.execute(spec, "query", object(), messages)
+        finally:
+            workflow_engine.Crew = original_crew
+            workflow_engine.WorkflowCheckpointer = original_checkpointer
+            workflow_engine.perform_workflow_presearch = original_presearch
+    
+    assert result.metrics['resumed_teams'] == ["first"]
+    assert "first" not in received
+    assert received["second"] == "first output"
+    assert result.team_results == {"first": "first output", "second": "second output"}
+    
+    print("✅ Rerun restored the first team and ran only the second")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting workflow engine tests...")
+    
+    try:
+        test_configured_stage_ordering()
+        test_invalid_specs()
+        test_result_routing()
+        test_native_function_calling_inputs()
+        test_rerun_resumes_after_failure()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -0,0 +1,82 @@
+"""
+Test script for conversation ID allocation in local memory
+"""
+
+import threading
+import time
+
+from local_memory import generate_ulid, _ULID_ALPHABET
+
+
+def decode_ulid_timestamp(ulid: str) -> int:
+    """Decode the millisecond timestamp held in the first 10 characters of a ULID"""
+    value = 0
+    for char in ulid[:10]:
+        value = value * 32 + _ULID_ALPHABET.index(char)
+    return value
+
+
+def test_ulid_format():
+    """Test that ULIDs are 26 Crockford base32 characters with a current timestamp"""
+    print("🧪 Testing ULID format...")
+    
+    before = int(time.time() * 1000)
+    ulid = generate_ulid()
+    after = int(time.time() * 1000)
+    
+    assert len(ulid) == 26
+    assert all(char in _ULID_ALPHABET for char in ulid)
+    assert before <= decode_ulid_timestamp(ulid) <= after + 1
+    
+    print(f"✅ Generated ULID: {ulid}")
+
+
+def test_ulid_monotonic():
+    """Test that ULIDs created in a tight loop are unique and sort in creation order"""
+    print("\n🧪 Testing ULID ordering...")
+    
+    ulids = [generate_ulid() for _ in range(10000)]
+    
+    assert len(set(ulids)) == len(ulids)
+    assert ulids == sorted(ulids)
+    
+    print(f"✅ {len(ulids)} ULIDs are unique and sorted")
+
+
+def test_ulid_threads():
+    """Test that ULIDs generated from several threads never collide"""
+    print("\n🧪 Testing ULIDs across threads...")
+    
+    results = []
+    results_lock = threading.Lock()
+    
+    def worker():
+        generated = [generate_ulid() for _ in range(2000)]
+        with results_lock:
+            results.extend(generated)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(set(results)) == len(results) == 16000
+    
+    print(f"✅ {len(results)} ULIDs from 8 threads are unique")
+
+
+if __name__ == "__main__":
+    print("🚀 Starting local memory tests...")
+    
+    try:
+        test_ulid_format()
+        test_ulid_monotonic()
+        test_ulid_threads()
+        
+        print("\n✅ All tests completed successfully!")
+    
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
@@ -4,13 +4,14 @@ Document Upload UI Component for Digital Twins Management System
 This module provides Streamlit UI components for file upload and document management.
 """
 
+import os
 import streamlit as st
 import pandas as pd
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import json
 from agent_tools.document_processor import DocumentProcessor
-from agent_tools.document_memory_manager import store_document_in_memory, get_document_memory_stats
+from agent_tools.document_memory_manager import store_documents_in_memory, get_document_memory_stats
 
 class DocumentUploadUI:
     """
@@ -124,10 +125,29 @@ class DocumentUploadUI:
         )
         
         if directory_path and Path(directory_path).exists():
+            max_workers = st.number_input(
+                "Parallel workers:",
+                min_value=1,
+                max_value=os.cpu_count() or 1,
+                value=os.cpu_count() or 1,
+                help="Number of processes used to parse files in parallel"
+            )
+            
             if st.button("Process Directory"):
+                progress_bar = st.progress(0)
+                progress_text = st.empty()
+                
+                def show_progress(completed: int, total: int, file_path: str) -> None:
+                    progress_bar.progress(completed / total)
+                    progress_text.text(f"Processed {completed}/{total}: {Path(file_path).name}")
+                
                 with st.spinner("Processing directory..."):
                     try:
-                        processed_files = self.processor.process_directory(directory_path)
+                        processed_files = self.processor.process_directory(
+                            directory_path,
+                            max_workers=int(max_workers),
+                            progress_callback=show_progress
+                        )
                         
                         st.write(f"**Processed {len(processed_files)} files from directory:**")
                         
@@ -446,19 +466,25 @@ class DocumentUploadUI:
         Store documents in ChromaDB memory for semantic search
         """
         try:
-            stored_count = 0
-            for doc_name, doc_data in documents.items():
-                if 'error' not in doc_data:
-                    try:
-                        # Store document in memory
-                        doc_id = store_document_in_memory(doc_data)
-                        st.session_state[f"doc_memory_id_{doc_name}"] = doc_id
-                        stored_count += 1
-                    except Exception as e:
-                        st.warning(f"Could not store {doc_name} in memory: {e}")
+            # Embed and write all chunks of the upload in batches
+            report = store_documents_in_memory(documents)
+            
+            for doc_name, doc_id in report['document_ids'].items():
+                st.session_state[f"doc_memory_id_{doc_name}"] = doc_id
+            
+            for doc_name, error in report['errors'].items():
+                st.warning(f"Could not store {doc_name} in memory: {error}")
+            
+            stored_count = len(report['document_ids'])
             
             if stored_count > 0:
                 st.success(f"✅ Stored {stored_count} documents in semantic memory!")
+                st.caption(
+                    f"⏱️ {report['chunks_added']} chunks embedded in {len(report['batches'])} batches, "
+                    f"{report['chunks_unchanged']} unchanged, {report['chunks_failed']} failed, "
+                    f"{report['chunks_deleted']} removed, {report['documents_duplicate']} duplicates skipped "
+                    f"({report['elapsed_seconds']:.2f}s)"
+                )
                 
                 # Show memory stats
                 stats = get_document_memory_stats()
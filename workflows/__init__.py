@@ -2,20 +2,24 @@
 Workflows Package
 
 This package contains all workflow execution functions for the CrewAI multi-agent system.
-Each workflow function handles a specific number of teams working sequentially.
+Each workflow function runs a declarative WorkflowSpec on the workflow engine, which
+builds each team only when it runs and executes independent teams concurrently.
 
 Available Workflows:
 - run_crew_workflow: Single team (Research, Analysis, Writing)
+- stream_crew_workflow: Single team, yielding LLM output as it is generated
 - run_two_team_workflow: Research → Data Strategy
 - run_three_team_workflow: Research → Data Strategy → Compliance & Risk
 - run_four_team_workflow: Research → Data Strategy → Compliance & Risk → Information Management
 - run_five_team_workflow: Research → Data Strategy → Compliance & Risk → Information Management → Tender Response
-- run_six_team_workflow: Research → Data Strategy → Compliance & Risk → Information Management → Tender Response → Project Delivery
-- run_seven_team_workflow: Research → Data Strategy → Compliance & Risk → Information Management → Tender Response → Project Delivery → Technical Documentation
+- run_six_team_workflow: Research → Data Strategy → Compliance & Risk → Information Management → Tender Response + Project Delivery
+- run_seven_team_workflow: Research → Data Strategy → Compliance & Risk → Information Management → Tender Response + Project Delivery → Technical Documentation
+- run_workflow: Any WorkflowSpec (e.g. a custom list of StageSpecs)
 """
 
 from .workflow_executor import (
     run_crew_workflow,
+    stream_crew_workflow,
     run_two_team_workflow,
     run_three_team_workflow,
     run_four_team_workflow,
@@ -24,14 +28,29 @@ from .workflow_executor import (
     run_seven_team_workflow,
     perform_workflow_presearch
 )
+from .workflow_engine import (
+    WorkflowSpec,
+    StageSpec,
+    WorkflowEngine,
+    configured_stages,
+    run_workflow,
+    get_workflow_metrics
+)
 
 __all__ = [
     'run_crew_workflow',
+    'stream_crew_workflow',
     'run_two_team_workflow',
     'run_three_team_workflow',
     'run_four_team_workflow',
     'run_five_team_workflow',
     'run_six_team_workflow',
     'run_seven_team_workflow',
-    'perform_workflow_presearch'
+    'perform_workflow_presearch',
+    'WorkflowSpec',
+    'StageSpec',
+    'WorkflowEngine',
+    'configured_stages',
+    'run_workflow',
+    'get_workflow_metrics'
 ]
@@ -0,0 +1,814 @@
+"""
+Workflow Engine
+
+This module runs every multi-team workflow from a declarative WorkflowSpec:
+the team stages, the stages whose output each one consumes, and per-stage
+timeouts and models. Each team's agents and tasks are built only when its
+stage runs (and not at all when the stage is restored from a checkpoint),
+stages whose inputs are ready run concurrently, and every run records the
+same timing metrics.
+"""
+
+import os
+import copy
+import time
+import threading
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Any, Dict, Optional, Callable
+from crewai import Crew, Process
+from agent_tools.rate_limiter import RateLimitedLLM
+from agent_configuration import agent_config, AgentTeam
+
+# Import agent and task creation functions
+from agent_teams.research_analysis import (
+    create_research_analysis_agents_with_context,
+    create_research_analysis_tasks_with_data,
+    create_research_analysis_tasks
+)
+from agent_teams.data_strategy import create_data_strategy_agents_with_context, create_data_strategy_tasks_with_data
+from agent_teams.compliance_risk import create_compliance_risk_agents_with_context, create_compliance_risk_tasks_with_data
+from agent_teams.information_management import create_information_management_agents_with_context, create_information_management_tasks_with_data
+from agent_teams.tender_response import create_tender_response_agents_with_context, create_tender_response_tasks_with_data
+from agent_teams.project_delivery import create_project_delivery_agents_with_context, create_project_delivery_tasks_with_data
+from agent_teams.technical_documentation import create_technical_documentation_agents_with_context, create_technical_documentation_tasks_with_data
+from agent_teams.research_validation.agents import create_research_validation_agents_with_context
+from agent_teams.research_validation.tasks import create_research_validation_tasks_with_data
+from agent_teams.geospatial_metadata import create_geospatial_metadata_agents_with_context, create_geospatial_metadata_tasks_with_data
+
+# Import utility functions
+from presearch.presearch_manager import PreSearchManager
+from team_outputs.output_manager import TeamOutputManager, WorkflowCheckpointer
+from local_memory import add_to_memory
+
+# Engine settings
+WORKFLOW_MAX_CONCURRENT_TEAMS = int(os.getenv('WORKFLOW_MAX_CONCURRENT_TEAMS', '3'))
+WORKFLOW_METRICS_HISTORY = int(os.getenv('WORKFLOW_METRICS_HISTORY', '50'))
+
+DEFAULT_SYSTEM_MESSAGE = "You are an expert business consultant and writer. When asked to write reports, you must provide complete, detailed content - never summaries or placeholders. Write comprehensive, actionable content that executives can use immediately for decision-making. NEVER use ellipsis (...), continuation phrases, or placeholders like '[Insert content here]' or '[The actual content would continue here]'. Always write the complete, final content for every section. ONLY use references from the actual research data provided - NEVER make up citations, author names, or publication details."
+
+ORDINALS = ["First", "Second", "Third", "Fourth", "Fifth", "Sixth", "Seventh", "Eighth", "Ninth", "Tenth"]
+
+
+def perform_workflow_presearch(query: str, workflow_name: str, conversation_history: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """
+    Perform pre-search for any workflow using the PreSearchManager.
+    
+    Args:
+        query: The user's query
+        workflow_name: Name of the workflow for logging
+        conversation_history: Previous conversation context
+    
+    Returns:
+        Dict containing search results and context
+    """
+    print(f"🔍 Pre-searching data for {workflow_name}: {query}")
+    
+    # Initialize pre-search manager
+    presearch_manager = PreSearchManager(memory_enabled=True, max_memory_results=3)
+    
+    # Perform comprehensive pre-search
+    search_data = presearch_manager.search_and_combine_context(query, conversation_history)
+    
+    return search_data
+
+
+def create_default_llm(system_message: str = DEFAULT_SYSTEM_MESSAGE) -> RateLimitedLLM:
+    """
+    Create the workflow LLM used when the caller does not provide one
+    
+    Args:
+        system_message: System prompt for every agent
+    
+    Returns:
+        Rate-limited Ollama Cloud LLM
+    """
+    api_key = os.getenv('OLLAMA_API_KEY')
+    return RateLimitedLLM(
+        model="ollama/gpt-oss:20b",
+        base_url="https://ollama.com",
+        headers={'Authorization': f'Bearer {api_key}'},
+        temperature=0.5,
+        max_tokens=8000,
+        system_message=system_message
+    )
+
+
+def with_model(llm, model: Optional[str]):
+    """
+    Return a copy of an LLM that calls a different model
+    
+    Args:
+        llm: LLM instance (CrewAI LLM, or a wrapper holding one in base_llm)
+        model: Model name, or None to keep the LLM's own model
+    
+    Returns:
+        The LLM itself if the model is unchanged, otherwise a shallow copy
+    """
+    if not model or getattr(llm, 'model', None) == model:
+        return llm
+    
+    llm_copy = copy.copy(llm)
+    if hasattr(llm_copy, 'base_llm'):
+        llm_copy.base_llm = with_model(llm_copy.base_llm, model)
+    else:
+        llm_copy.model = model
+    return llm_copy
+
+
+def history_before_query(conversation_history: Optional[List[Any]], query: str) -> List[Any]:
+    """
+    Get the conversation that precedes the current query and any earlier attempts at it
+    
+    The chat pages append the query before a run and the result or error after
+    it, so a rerun of a failed query sees the failed attempt in its history. It
+    is dropped here so the rerun gets the same checkpoint run ID and resumes.
+    
+    Args:
+        conversation_history: Chat messages, oldest first
+        query: Current user query
+    
+    Returns:
+        Messages before the first of the trailing attempts at the query
+    """
+    history = list(conversation_history or [])
+    normalized_query = " ".join(query.split())
+    cut = len(history)
+    
+    for index in range(len(history) - 1, -1, -1):
+        message = history[index]
+        if not isinstance(message, dict) or message.get("role") != "user":
+            continue
+        if " ".join(str(message.get("content", "")).split()) != normalized_query:
+            break
+        cut = index
+    
+    return history[:cut]
+
+
+# Task creators use three argument orders; adapters give them all the signature
+# (agents, query, input_data, conversation_history, document_context)
+
+def _research_tasks(agents, query, input_data, conversation_history, document_context):
+    return create_research_analysis_tasks_with_data(*agents, query, input_data, conversation_history, document_context)
+
+
+def _research_native_tasks(agents, query, input_data, conversation_history, document_context):
+    return create_research_analysis_tasks(*agents, query, conversation_history)
+
+
+def _query_first_tasks(create_tasks: Callable) -> Callable:
+    def build(agents, query, input_data, conversation_history, document_context):
+        return create_tasks(*agents, query, input_data, conversation_history)
+    return build
+
+
+def _data_first_tasks(create_tasks: Callable) -> Callable:
+    def build(agents, query, input_data, conversation_history, document_context):
+        return create_tasks(*agents, input_data, query, conversation_history)
+    return build
+
+
+def _specialist_tasks(create_tasks: Callable) -> Callable:
+    def build(agents, query, input_data, conversation_history, document_context):
+        return create_tasks(agents[0], query, input_data, conversation_history, document_context)
+    return build
+
+
+@dataclass
+class TeamDefinition:
+    """How to build the agents and tasks of one agent team"""
+    name: str
+    create_agents: Callable
+    agent_keys: List[str]
+    create_tasks: Callable
+    timeout: int = 240
+    native_tools: bool = False                       # Agents get tools with native function calling
+    create_native_tasks: Optional[Callable] = None   # Tasks with native function calling, if different
+
+
+TEAM_DEFINITIONS: Dict[str, TeamDefinition] = {
+    "research_analysis": TeamDefinition(
+        name="Research & Analysis",
+        create_agents=create_research_analysis_agents_with_context,
+        agent_keys=['researcher', 'analyst', 'writer'],
+        create_tasks=_research_tasks,
+        timeout=180,
+        native_tools=True,
+        create_native_tasks=_research_native_tasks
+    ),
+    "data_strategy": TeamDefinition(
+        name="Data Strategy & DAMA Implementation",
+        create_agents=create_data_strategy_agents_with_context,
+        agent_keys=['data_governance_specialist', 'dcam_template_specialist', 'tranch_guidance_specialist'],
+        create_tasks=_query_first_tasks(create_data_strategy_tasks_with_data),
+        timeout=240
+    ),
+    "compliance_risk": TeamDefinition(
+        name="Compliance & Risk Management",
+        create_agents=create_compliance_risk_agents_with_context,
+        agent_keys=['compliance_specialist', 'risk_management_specialist', 'audit_governance_specialist'],
+        create_tasks=_data_first_tasks(create_compliance_risk_tasks_with_data),
+        timeout=300
+    ),
+    "information_management": TeamDefinition(
+        name="Information Management",
+        create_agents=create_information_management_agents_with_context,
+        agent_keys=['information_governance_specialist', 'metadata_management_specialist', 'data_quality_specialist'],
+        create_tasks=_data_first_tasks(create_information_management_tasks_with_data),
+        timeout=360
+    ),
+    "tender_response": TeamDefinition(
+        name="Tender Response",
+        create_agents=create_tender_response_agents_with_context,
+        agent_keys=['tender_specialist', 'proposal_writer', 'compliance_expert'],
+        create_tasks=_data_first_tasks(create_tender_response_tasks_with_data),
+        timeout=420
+    ),
+    "project_delivery": TeamDefinition(
+        name="Project Delivery",
+        create_agents=create_project_delivery_agents_with_context,
+        agent_keys=['data_engineer', 'data_scientist', 'data_architect', 'devops_engineer', 'project_manager'],
+        create_tasks=_data_first_tasks(create_project_delivery_tasks_with_data),
+        timeout=480
+    ),
+    "technical_documentation": TeamDefinition(
+        name="Technical Documentation",
+        create_agents=create_technical_documentation_agents_with_context,
+        agent_keys=['data_modeling_specialist', 'python_code_specialist', 'sql_code_specialist',
+                    'pyspark_code_specialist', 'technical_writer'],
+        create_tasks=_data_first_tasks(create_technical_documentation_tasks_with_data),
+        timeout=540
+    ),
+    "research_validation": TeamDefinition(
+        name="Research Validation & Quality Assurance",
+        create_agents=create_research_validation_agents_with_context,
+        agent_keys=['research_validation_specialist'],
+        create_tasks=_specialist_tasks(create_research_validation_tasks_with_data),
+        timeout=240,
+        native_tools=True
+    ),
+    "geospatial_metadata": TeamDefinition(
+        name="Geospatial Metadata & ISO 19115 Compliance",
+        create_agents=create_geospatial_metadata_agents_with_context,
+        agent_keys=['geospatial_metadata_specialist'],
+        create_tasks=_specialist_tasks(create_geospatial_metadata_tasks_with_data),
+        timeout=240,
+        native_tools=True
+    )
+}
+
+
+@dataclass
+class StageSpec:
+    """One team in a workflow and the stages whose output it consumes"""
+    team: str                                            # Key in TEAM_DEFINITIONS, also the checkpoint key
+    depends_on: List[str] = field(default_factory=list)  # Teams whose output this team consumes
+    timeout: Optional[int] = None                        # Defaults to the team's timeout
+    model: Optional[str] = None                          # Defaults to the workflow LLM's model
+    title: Optional[str] = None                          # Defaults to the team's name
+
+
+@dataclass
+class WorkflowSpec:
+    """Declarative description of a multi-team workflow"""
+    name: str                       # Workflow type used for outputs, memory and checkpoints
+    label: str                      # Name used in log and error messages (e.g. "seven-team workflow")
+    stages: List[StageSpec]
+    heading: Optional[str] = None   # Heading of the combined result; None returns a single team's output as is
+    numbered_sections: bool = True  # Prefix section titles with "First Team:", "Second Team:", ...
+    footer: Optional[str] = None    # Closing "Final Output" section
+    system_message: str = DEFAULT_SYSTEM_MESSAGE
+    save_outputs: bool = False      # Save each team's output with the TeamOutputManager
+    save_memory: bool = True        # Save the combined result to local memory
+    checkpoint: bool = True         # Checkpoint completed teams so a rerun resumes
+    memory_metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class WorkflowResult:
+    """Output of a workflow run"""
+    output: str
+    team_results: Dict[str, Optional[str]]
+    metrics: Dict[str, Any]
+
+
+class _LazyPresearch:
+    """Pre-search results, fetched once by the first stage that needs them"""
+    
+    def __init__(self, query: str, workflow_name: str, conversation_history: Optional[List[Any]]):
+        self.query = query
+        self.workflow_name = workflow_name
+        self.conversation_history = conversation_history
+        self.seconds = 0.0
+        self._results = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> str:
+        with self._lock:
+            if self._results is None:
+                start_time = time.time()
+                search_data = perform_workflow_presearch(self.query, self.workflow_name, self.conversation_history)
+                self._results = str(search_data.get('web_results') or "")
+                self.seconds = time.time() - start_time
+            return self._results
+
+
+class WorkflowEngine:
+    """Executes WorkflowSpecs, running stages as soon as their inputs are ready"""
+    
+    def __init__(self, max_concurrent_teams: int = WORKFLOW_MAX_CONCURRENT_TEAMS,
+                 team_definitions: Optional[Dict[str, TeamDefinition]] = None):
+        self.max_concurrent_teams = max(1, max_concurrent_teams)
+        self.team_definitions = team_definitions or TEAM_DEFINITIONS
+        self._history = deque(maxlen=WORKFLOW_METRICS_HISTORY)
+        self._history_lock = threading.Lock()
+    
+    def get_execution_stages(self, spec: WorkflowSpec) -> List[List[str]]:
+        """
+        Group a workflow's teams into stages that can run concurrently
+        
+        Args:
+            spec: Workflow to plan
+        
+        Returns:
+            List of stages; every team only depends on teams in earlier stages
+        
+        Raises:
+            ValueError: If a team is unknown, a dependency is not part of the
+                workflow, or the dependencies contain a cycle
+        """
+        teams = [stage.team for stage in spec.stages]
+        for stage in spec.stages:
+            if stage.team not in self.team_definitions:
+                raise ValueError(f"Unknown team in {spec.name}: {stage.team}")
+            missing = [dep for dep in stage.depends_on if dep not in teams]
+            if missing:
+                raise ValueError(f"Team {stage.team} in {spec.name} depends on teams outside the workflow: {missing}")
+        
+        stages = []
+        placed = set()
+        remaining = list(spec.stages)
+        
+        while remaining:
+            ready = [stage for stage in remaining if all(dep in placed for dep in stage.depends_on)]
+            if not ready:
+                raise ValueError(f"Cyclic team dependencies in {spec.name}: {[stage.team for stage in remaining]}")
+            stages.append([stage.team for stage in ready])
+            placed.update(stage.team for stage in ready)
+            remaining = [stage for stage in remaining if stage.team not in placed]
+        
+        return stages
+    
+    def _stage_title(self, spec: WorkflowSpec, stage: StageSpec) -> str:
+        return stage.title or self.team_definitions[stage.team].name
+    
+    def _build_stage_input(self, spec: WorkflowSpec, stage: StageSpec, upstream: Dict[str, Optional[str]],
+                           presearch: _LazyPresearch, use_native_function_calling: bool) -> str:
+        """Combine upstream team outputs into a team's input (pre-search results for root teams)"""
+        outputs = [(team, result) for team, result in upstream.items() if result]
+        
+        if not outputs:
+            # With native function calling, root teams that have search tools search for themselves
+            if use_native_function_calling and self.team_definitions[stage.team].native_tools:
+                return ""
+            return presearch.get()
+        if len(outputs) == 1:
+            return outputs[0][1]
+        
+        titles = {s.team: self._stage_title(spec, s) for s in spec.stages}
+        return "\n\n".join(f"=== {titles[team]} Output ===\n{result}" for team, result in outputs)
+    
+    def _run_stage(
+        self,
+        spec: WorkflowSpec,
+        stage: StageSpec,
+        query: str,
+        llm,
+        conversation_history: Optional[List[Any]],
+        use_native_function_calling: bool,
+        document_context: Optional[str],
+        upstream: Dict[str, Optional[str]],
+        presearch: _LazyPresearch,
+        checkpointer: WorkflowCheckpointer,
+        model: Optional[str],
+        timing: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Run one team, building its agents, tasks and crew only if it is not restored from a checkpoint
+        
+        Returns:
+            Team output, or None if the team produced no result
+        """
+        definition = self.team_definitions[stage.team]
+        timeout = stage.timeout or definition.timeout
+        
+        def build_and_run():
+            build_start = time.time()
+            input_data = self._build_stage_input(spec, stage, upstream, presearch, use_native_function_calling)
+            
+            stage_llm = with_model(llm, model)
+            use_tools = use_native_function_calling and definition.native_tools
+            agents_dict = definition.create_agents(stage_llm, conversation_history, use_tools=use_tools)
+            agents = [agents_dict[key] for key in definition.agent_keys]
+            
+            create_tasks = definition.create_tasks
+            if use_native_function_calling and definition.create_native_tasks:
+                create_tasks = definition.create_native_tasks
+            tasks = create_tasks(agents, query, input_data, conversation_history, document_context)
+            print(f"✅ {definition.name}: {len(agents)} agents, {len(tasks)} tasks")
+            
+            crew = Crew(
+                agents=agents,
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=True,
+                max_execution_time=timeout,
+                memory=False,
+                share_crew=False
+            )
+            
+            crew_start = time.time()
+            timing['build_seconds'] = crew_start - build_start
+            result = crew.kickoff()
+            timing['crew_seconds'] = time.time() - crew_start
+            return result
+        
+        timing['started'] = time.time()
+        team_result = checkpointer.run_team(stage.team, build_and_run)
+        timing['finished'] = time.time()
+        timing['restored'] = 'crew_seconds' not in timing
+        timing['output_chars'] = len(team_result or "")
+        
+        print(f"✅ {definition.name} completed in {timing['finished'] - timing['started']:.1f}s: {timing['output_chars']} characters")
+        return team_result
+    
+    def _combine_results(self, spec: WorkflowSpec, results: Dict[str, Optional[str]]) -> str:
+        """Combine team outputs into the workflow result"""
+        if spec.heading is None and len(spec.stages) == 1:
+            return str(results.get(spec.stages[0].team) or "")
+        
+        sections = []
+        for index, stage in enumerate(spec.stages):
+            title = self._stage_title(spec, stage)
+            if spec.numbered_sections:
+                title = f"{ORDINALS[index]} Team: {title}"
+            sections.append(f"## {title}\n{results.get(stage.team) or ''}")
+        
+        if spec.footer:
+            sections.append(f"## Final Output\n{spec.footer}")
+        
+        heading = f"# {spec.heading}\n\n" if spec.heading else ""
+        return f"\n{heading}" + "\n\n---\n\n".join(sections) + "\n"
+    
+    def _collect_metrics(self, spec: WorkflowSpec, plan: List[List[str]], start_time: float,
+                         timings: Dict[str, Dict[str, Any]], presearch: _LazyPresearch,
+                         models: Dict[str, Optional[str]], resumed_teams: List[str]) -> Dict[str, Any]:
+        """Build the timing metrics of a run"""
+        teams = {}
+        for team, timing in timings.items():
+            teams[team] = {
+                'start_offset_seconds': round(timing['started'] - start_time, 2),
+                'duration_seconds': round(timing['finished'] - timing['started'], 2),
+                'build_seconds': round(timing.get('build_seconds', 0.0), 2),
+                'crew_seconds': round(timing.get('crew_seconds', 0.0), 2),
+                'restored': timing['restored'],
+                'output_chars': timing['output_chars'],
+                'model': models.get(team)
+            }
+        
+        total_seconds = time.time() - start_time
+        team_seconds = sum(team['duration_seconds'] for team in teams.values())
+        return {
+            'workflow': spec.name,
+            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'total_seconds': round(total_seconds, 2),
+            'presearch_seconds': round(presearch.seconds, 2),
+            'team_seconds': round(team_seconds, 2),
+            'concurrency_saved_seconds': round(max(team_seconds + presearch.seconds - total_seconds, 0.0), 2),
+            'stages': plan,
+            'teams': teams,
+            'resumed_teams': list(resumed_teams)
+        }
+    
+    def execute(
+        self,
+        spec: WorkflowSpec,
+        query: str,
+        llm,
+        conversation_history: Optional[List[Any]] = None,
+        use_native_function_calling: bool = False,
+        document_context: Optional[str] = None,
+        team_models: Optional[Dict[str, str]] = None
+    ) -> WorkflowResult:
+        """
+        Execute a workflow spec
+        
+        Args:
+            spec: Workflow to run
+            query: User query
+            llm: Language model (None creates the default workflow LLM)
+            conversation_history: Previous conversation context
+            use_native_function_calling: Whether root teams with native tools search with them instead of pre-search
+            document_context: Document context from uploaded files
+            team_models: Model overrides by team key (WORKFLOW_MODEL_<TEAM> environment
+                variables and the spec's stage models apply otherwise)
+        
+        Returns:
+            WorkflowResult with the combined output, each team's output and timing metrics
+        
+        Raises:
+            ValueError: If the spec is invalid
+            Exception: Any error raised by a team
+        """
+        start_time = time.time()
+        team_models = team_models or {}
+        
+        if llm is None:
+            print(f"🔧 Creating LLM for {spec.label}...")
+            llm = create_default_llm(spec.system_message)
+            print(f"✅ LLM created: {type(llm)}")
+        
+        plan = self.get_execution_stages(spec)
+        print(f"🗺️ {spec.label} plan: {plan}")
+        
+        models = {
+            stage.team: team_models.get(stage.team) or os.getenv(f"WORKFLOW_MODEL_{stage.team.upper()}") or stage.model
+            for stage in spec.stages
+        }
+        
+        # Completed teams are checkpointed so a rerun resumes with the incomplete ones
+        checkpointer = WorkflowCheckpointer(
+            spec.name, query, history_before_query(conversation_history, query), document_context,
+            ",".join(stage.team for stage in spec.stages), str(use_native_function_calling),
+            getattr(llm, 'model', None), models,
+            enabled=spec.checkpoint
+        )
+        presearch = _LazyPresearch(query, spec.label, conversation_history)
+        
+        results: Dict[str, Optional[str]] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+        pending = list(spec.stages)
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_teams) as executor:
+            running = {}
+            
+            while pending or running:
+                for stage in [s for s in pending if all(dep in results for dep in s.depends_on)]:
+                    pending.remove(stage)
+                    print(f"\n🔧 Starting {self._stage_title(spec, stage)} ({len(results) + len(running) + 1}/{len(spec.stages)})")
+                    
+                    timings[stage.team] = {}
+                    future = executor.submit(
+                        self._run_stage, spec, stage, query, llm, conversation_history,
+                        use_native_function_calling, document_context,
+                        {dep: results[dep] for dep in stage.depends_on}, presearch,
+                        checkpointer, models[stage.team], timings[stage.team]
+                    )
+                    running[future] = stage
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        results[stage.team] = future.result()
+                    except Exception:
+                        # Stop scheduling; teams already running finish and are checkpointed
+                        pending.clear()
+                        raise
+        
+        output = self._combine_results(spec, results)
+        metrics = self._collect_metrics(spec, plan, start_time, timings, presearch, models, checkpointer.resumed_teams)
+        
+        if spec.save_outputs:
+            try:
+                output_manager = TeamOutputManager()
+                team_outputs = {
+                    f"Team {index} - {self._stage_title(spec, stage)}": str(results.get(stage.team) or "")
+                    for index, stage in enumerate(spec.stages, start=1)
+                }
+                output_path = output_manager.save_workflow_outputs(
+                    spec.name,
+                    query,
+                    team_outputs,
+                    {
+                        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "workflow_type": spec.name,
+                        "use_native": use_native_function_calling,
+                        "execution_time": f"{time.time() - start_time:.2f} seconds",
+                        "metrics": metrics
+                    }
+                )
+                print(f"📁 Team outputs saved to: {output_path}")
+            except Exception as output_error:
+                print(f"⚠️ Team output save failed: {output_error}")
+        
+        if spec.save_memory:
+            try:
+                add_to_memory(
+                    query=query,
+                    response=output,
+                    metadata={
+                        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "workflow_type": spec.name,
+                        "use_native": use_native_function_calling,
+                        **spec.memory_metadata
+                    }
+                )
+                print("💾 Conversation saved to local memory")
+            except Exception as mem_error:
+                print(f"⚠️ Memory save failed: {mem_error}")
+        
+        checkpointer.complete()
+        
+        with self._history_lock:
+            self._history.append(metrics)
+        self._print_metrics(spec, metrics)
+        
+        return WorkflowResult(output=output, team_results=results, metrics=metrics)
+    
+    def _print_metrics(self, spec: WorkflowSpec, metrics: Dict[str, Any]):
+        print(f"⏱️ {spec.label.capitalize()} completed in {metrics['total_seconds']:.2f} seconds "
+              f"(pre-search {metrics['presearch_seconds']:.1f}s, {metrics['concurrency_saved_seconds']:.1f}s saved by concurrency)")
+        for team, team_metrics in metrics['teams'].items():
+            if team_metrics['restored']:
+                print(f"   • {team}: restored from checkpoint")
+            else:
+                print(f"   • {team}: {team_metrics['duration_seconds']:.1f}s "
+                      f"(build {team_metrics['build_seconds']:.1f}s, crew {team_metrics['crew_seconds']:.1f}s)")
+    
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        """
+        Get the timing metrics of recent runs
+        
+        Returns:
+            Metrics of the most recent runs, oldest first
+        """
+        with self._history_lock:
+            return list(self._history)
+
+
+# Global engine instance
+workflow_engine = WorkflowEngine()
+
+
+def run_workflow(
+    spec: WorkflowSpec,
+    query: str,
+    llm,
+    conversation_history: Optional[List[Any]] = None,
+    use_native_function_calling: bool = False,
+    document_context: Optional[str] = None,
+    team_models: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Run a workflow spec and return its combined output
+    
+    Args:
+        spec: Workflow to run
+        query: User query
+        llm: Language model (None creates the default workflow LLM)
+        conversation_history: Previous conversation context
+        use_native_function_calling: Whether root teams with native tools search with them instead of pre-search
+        document_context: Document context from uploaded files
+        team_models: Model overrides by team key
+    
+    Returns:
+        Combined workflow output, or an error message if the workflow failed
+    """
+    start_time = time.time()
+    
+    try:
+        return workflow_engine.execute(
+            spec, query, llm, conversation_history, use_native_function_calling, document_context, team_models
+        ).output
+    except Exception as e:
+        elapsed_time = time.time() - start_time
+        print(f"❌ {spec.label.capitalize()} failed after {elapsed_time:.2f} seconds")
+        print(f"❌ Error details: {str(e)}")
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        return f"Error in {spec.label} execution: {str(e)}"
+
+
+def get_workflow_metrics() -> List[Dict[str, Any]]:
+    """Get timing metrics of recent workflow runs"""
+    return workflow_engine.get_metrics()
+
+
+def configured_stages(*teams: str) -> List[StageSpec]:
+    """
+    Build the stages of a workflow of configured agent teams
+    
+    Each stage depends on the teams listed in the team's depends_on in the
+    agent configuration, so fixed workflows and dynamic runs share one
+    dependency graph.
+    
+    Args:
+        *teams: Keys of the agent teams in the workflow
+    
+    Returns:
+        Stages in the given order
+    """
+    dependencies = agent_config.resolve_dependencies([AgentTeam(team) for team in teams])
+    return [
+        StageSpec(team, depends_on=[dependency.value for dependency in dependencies[AgentTeam(team)]])
+        for team in teams
+    ]
+
+
+# Workflow specs. Each team consumes the output of the teams listed in its
+# depends_on, so teams with the same inputs run concurrently. Agent teams
+# take their dependencies from the agent configuration.
+
+CREW_WORKFLOW = WorkflowSpec(
+    name="crew_workflow",
+    label="workflow",
+    stages=[StageSpec("research_analysis")],
+    checkpoint=False
+)
+
+TWO_TEAM_WORKFLOW = WorkflowSpec(
+    name="two_team_workflow",
+    label="two-team workflow",
+    heading="Two-Team Workflow Results",
+    stages=configured_stages("research_analysis", "data_strategy")
+)
+
+THREE_TEAM_WORKFLOW = WorkflowSpec(
+    name="three_team_workflow",
+    label="three-team workflow",
+    heading="Three-Team Workflow Results",
+    stages=configured_stages("research_analysis", "data_strategy", "compliance_risk")
+)
+
+FOUR_TEAM_WORKFLOW = WorkflowSpec(
+    name="four_team_workflow",
+    label="four-team workflow",
+    heading="Four-Team Workflow Results",
+    stages=configured_stages("research_analysis", "data_strategy", "compliance_risk", "information_management")
+)
+
+FIVE_TEAM_WORKFLOW = WorkflowSpec(
+    name="five_team_workflow",
+    label="five-team workflow",
+    heading="Five-Team Workflow Results",
+    stages=configured_stages(
+        "research_analysis", "data_strategy", "compliance_risk", "information_management", "tender_response"
+    ),
+    save_outputs=True
+)
+
+SIX_TEAM_WORKFLOW = WorkflowSpec(
+    name="six_team_workflow",
+    label="six-team workflow",
+    heading="Six-Team Workflow Results",
+    stages=configured_stages(
+        "research_analysis", "data_strategy", "compliance_risk", "information_management", "tender_response",
+        "project_delivery"
+    ),
+    save_outputs=True
+)
+
+SEVEN_TEAM_WORKFLOW = WorkflowSpec(
+    name="seven_team_workflow",
+    label="seven-team workflow",
+    heading="Seven-Team Workflow Results",
+    stages=configured_stages(
+        "research_analysis", "data_strategy", "compliance_risk", "information_management", "tender_response",
+        "project_delivery", "technical_documentation"
+    ),
+    save_outputs=True
+)
+
+ENHANCED_RESEARCH_WORKFLOW = WorkflowSpec(
+    name="enhanced_research_workflow",
+    label="enhanced research workflow",
+    heading="Enhanced Research Workflow Results",
+    stages=[
+        StageSpec("research_analysis"),
+        StageSpec("research_validation", depends_on=["research_analysis"])
+    ],
+    numbered_sections=False,
+    footer="This enhanced workflow ensures all information is verified, properly referenced, and meets the highest standards of academic integrity and factual accuracy.",
+    system_message=DEFAULT_SYSTEM_MESSAGE + " Always use proper Harvard referencing and ensure all sources are validated.",
+    memory_metadata={"validated": True}
+)
+
+GEOSPATIAL_WORKFLOW = WorkflowSpec(
+    name="geospatial_workflow",
+    label="geospatial workflow",
+    heading="Geospatial Workflow Results with ISO 19115 Metadata",
+    stages=[
+        StageSpec("research_analysis"),
+        StageSpec("geospatial_metadata", depends_on=["research_analysis"])
+    ],
+    numbered_sections=False,
+    footer="This geospatial workflow ensures all spatial data is properly documented with ISO 19115 metadata, \nenabling discovery, access, and interoperability of geospatial information in the Digital Twin system.",
+    system_message=DEFAULT_SYSTEM_MESSAGE.replace(
+        "You are an expert business consultant and writer.",
+        "You are an expert geospatial data specialist and business consultant."
+    ) + " Always use proper Harvard referencing and ensure all sources are validated. For geospatial data, always create proper ISO 19115 metadata and ensure spatial data interoperability.",
+    memory_metadata={"iso19115_compliant": True}
+)